@@ -125,6 +125,7 @@ def create_app(config_name="default"):
     from routes.expenses import expenses_bp
     from routes.journal import journal_bp
     from routes.calendar import calendar_bp
+    from routes.export import export_bp
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(tasks_bp, url_prefix="/api/tasks")
@@ -132,6 +133,20 @@ def create_app(config_name="default"):
     app.register_blueprint(expenses_bp, url_prefix="/api/expenses")
     app.register_blueprint(journal_bp, url_prefix="/api/journal")
     app.register_blueprint(calendar_bp, url_prefix="/api/calendar")
+    app.register_blueprint(export_bp, url_prefix="/api/export")
+
+    # Register CLI commands
+    from commands.calendar import calendar_cli
+    from commands.expenses import expenses_cli
+    from commands.habits import habits_cli
+    from commands.indexes import indexes_cli
+    from commands.journal import journal_cli
+
+    app.cli.add_command(calendar_cli)
+    app.cli.add_command(expenses_cli)
+    app.cli.add_command(habits_cli)
+    app.cli.add_command(indexes_cli)
+    app.cli.add_command(journal_cli)
 
     # JWT error handlers
     @jwt.invalid_token_loader
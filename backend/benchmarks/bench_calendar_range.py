@@ -0,0 +1,108 @@
+"""Benchmark calendar overlap queries with and without the duration bound
+
+Seeds users with tens of thousands of events each, then times window
+queries using the plain overlap predicate (start < window end and end >
+window start, which can only bound the index scan from one side) against
+calendar_events.overlapping(), which also bounds start_time from below by
+the user's stored maximum event duration. Runs against DB_URL, or an
+in-memory SQLite database if DB_URL is not set:
+
+    python -m benchmarks.bench_calendar_range [--users 3] [--events 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DB_URL" not in os.environ:
+    os.environ["DB_URL"] = "sqlite://"
+
+from sqlalchemy import insert
+
+from app import create_app
+from models import CalendarEvent, User, db
+from services import calendar_events
+
+WINDOWS = [("day", timedelta(days=1)), ("week", timedelta(days=7)), ("month", timedelta(days=31))]
+
+
+def seed(users, events, years, rng):
+    """Insert users whose events are mostly short with a few multi-day ones"""
+    start = datetime(2020, 1, 1)
+    span = int(timedelta(days=365 * years).total_seconds())
+    user_ids = []
+    for index in range(users):
+        user = User(email=f"bench-range-{index}-{rng.random()}@example.invalid", password_hash="-")
+        db.session.add(user)
+        db.session.flush()
+        user_ids.append(user.id)
+
+        rows = []
+        for _ in range(events):
+            begin = start + timedelta(seconds=rng.randrange(span))
+            if rng.random() < 0.01:
+                length = timedelta(days=rng.randint(1, 14))
+            else:
+                length = timedelta(minutes=rng.choice([15, 30, 60, 90, 120]))
+            rows.append({"user_id": user.id, "title": "event", "start_time": begin, "end_time": begin + length})
+        db.session.execute(insert(CalendarEvent), rows)
+        calendar_events.recompute_max_durations([user.id])
+    db.session.commit()
+    return user_ids, start, span
+
+
+def unbounded(user_id, window_start, window_end):
+    return CalendarEvent.query.filter(
+        CalendarEvent.user_id == user_id,
+        CalendarEvent.start_time < window_end,
+        CalendarEvent.end_time > window_start,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    app = create_app("development")
+    with app.app_context():
+        db.create_all()
+        rng = random.Random(7)
+        user_ids, start, span = seed(args.users, args.events, args.years, rng)
+
+        print(f"{args.users} users x {args.events} events over {args.years} years")
+        print(f"{'window':<7} {'unbounded ms':>13} {'bounded ms':>11} {'speedup':>8}")
+        for name, length in WINDOWS:
+            windows = []
+            for _ in range(args.queries):
+                window_start = start + timedelta(seconds=rng.randrange(span))
+                windows.append((rng.choice(user_ids), window_start, window_start + length))
+
+            for user_id, window_start, window_end in windows[:10]:
+                expected = {event.id for event in unbounded(user_id, window_start, window_end)}
+                actual = {event.id for event in calendar_events.overlapping(user_id, window_start, window_end)}
+                assert expected == actual
+
+            plain = timeit.timeit(
+                lambda: [unbounded(*window).all() for window in windows], number=1
+            )
+            bounded = timeit.timeit(
+                lambda: [calendar_events.overlapping(*window).all() for window in windows], number=1
+            )
+            print(
+                f"{name:<7} {plain / len(windows) * 1000:>13.2f} "
+                f"{bounded / len(windows) * 1000:>11.2f} {plain / bounded:>7.1f}x"
+            )
+
+        db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark the habit schedule engine over multi-year synthetic histories
+
+Compares Schedule.summarize/completion_rate against a per-day walk over the
+calendar, which is what the original streak loop did (with one query per
+day instead of a set lookup). Needs no database:
+
+    python -m benchmarks.bench_schedule [--years 1 3 5 10] [--habits 200]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.schedule import Schedule
+
+FREQUENCIES = [("daily", 7), ("weekdays", 7), ("weekends", 7), ("weekly", 3)]
+
+
+def synthetic_history(years, completion, today, seed):
+    """Ascending completed dates covering `years` years before today"""
+    rng = random.Random(seed)
+    start = today - timedelta(days=365 * years)
+    return [
+        start + timedelta(days=offset)
+        for offset in range((today - start).days + 1)
+        if rng.random() < completion
+    ]
+
+
+def per_day_walk(schedule, completed_dates, today, window_days):
+    """Reference implementation that visits every calendar day"""
+    completed = set(completed_dates)
+    first = completed_dates[0] if completed_dates else today
+    periods = {}
+    day = first
+    while day <= today:
+        if completed_dates and day in completed and schedule.is_expected(day):
+            key = schedule.period_key(day)
+            periods[key] = periods.get(key, 0) + 1
+        day += timedelta(days=1)
+
+    longest = run = 0
+    previous = None
+    day = first
+    while day <= today:
+        key = schedule.period_key(day)
+        if key != previous and schedule.is_expected(day):
+            if periods.get(key, 0) >= schedule.required:
+                run += 1
+                longest = max(longest, run)
+            elif key != schedule.period_key(today):
+                run = 0
+            previous = key
+        day += timedelta(days=1)
+
+    window_start = today - timedelta(days=window_days - 1)
+    expected = len(schedule.expected_dates(window_start, today))
+    done = sum(
+        1 for key, count in periods.items()
+        if count >= schedule.required and key >= schedule.period_key(window_start)
+    )
+    return run, longest, round(done / expected * 100, 1) if expected else 0.0
+
+
+def engine(schedule, completed_dates, today, window_days):
+    summary = schedule.summarize(completed_dates)
+    window_start = today - timedelta(days=window_days - 1)
+    return (
+        schedule.current_streak(summary, today),
+        summary.longest,
+        schedule.completion_rate(completed_dates, window_start, today),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--habits", type=int, default=200)
+    parser.add_argument("--completion", type=float, default=0.9)
+    parser.add_argument("--window", type=int, default=30)
+    args = parser.parse_args()
+
+    today = date.today()
+    print(f"{'frequency':<10} {'years':>5} {'per-day ms':>11} {'engine ms':>10} {'speedup':>8}")
+    for frequency, target_days in FREQUENCIES:
+        schedule = Schedule(frequency, target_days)
+        for years in args.years:
+            histories = [
+                synthetic_history(years, args.completion, today, seed)
+                for seed in range(args.habits)
+            ]
+            for history in histories[:5]:
+                assert per_day_walk(schedule, history, today, args.window)[1] == \
+                    engine(schedule, history, today, args.window)[1]
+
+            walk = timeit.timeit(
+                lambda: [per_day_walk(schedule, h, today, args.window) for h in histories],
+                number=1,
+            )
+            fast = timeit.timeit(
+                lambda: [engine(schedule, h, today, args.window) for h in histories],
+                number=1,
+            )
+            print(
+                f"{frequency:<10} {years:>5} {walk * 1000:>11.1f} "
+                f"{fast * 1000:>10.1f} {walk / fast:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Flask CLI maintenance commands (run with `flask <group> <command>`)"""
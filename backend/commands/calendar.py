@@ -0,0 +1,50 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from models import User, db
+from services import calendar_events, leases
+from services.reminders import LEASE_NAME, ReminderScheduler
+
+calendar_cli = AppGroup("calendar", help="Calendar maintenance commands")
+
+
+@calendar_cli.command("recompute-durations")
+@click.option("--batch-size", default=200, show_default=True, help="Users per transaction")
+def recompute_durations(batch_size):
+    """Reset each user's stored maximum event duration from their events"""
+    users = 0
+    last_id = 0
+
+    while True:
+        user_ids = [
+            uid for (uid,) in db.session.query(User.id)
+            .filter(User.id > last_id)
+            .order_by(User.id)
+            .limit(batch_size)
+        ]
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        calendar_events.recompute_max_durations(user_ids)
+        db.session.commit()
+        users += len(user_ids)
+
+    click.echo(f"Recomputed maximum event durations for {users} users")
+
+
+@calendar_cli.command("reminders")
+@click.option("--once", is_flag=True, help="Run a single tick and exit")
+def run_reminders(once):
+    """Run the reminder scheduler in the foreground (e.g. as its own process)"""
+    scheduler = ReminderScheduler(current_app._get_current_object())
+    if once:
+        fired = scheduler.tick()
+        click.echo(f"Fired {fired} reminders" if scheduler.refilled_at else "Lease is held by another worker")
+        return
+
+    click.echo(f"Reminder scheduler running as {scheduler.holder} (sink: {scheduler.sink_name})")
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        leases.release(LEASE_NAME, scheduler.holder)
@@ -0,0 +1,30 @@
+import click
+from flask.cli import AppGroup
+from models import User, db
+from services import expense_rollups
+
+expenses_cli = AppGroup("expenses", help="Expense maintenance commands")
+
+
+@expenses_cli.command("rebuild-rollups")
+@click.option("--batch-size", default=200, show_default=True, help="Users per transaction")
+@click.option("--user-id", type=int, help="Only rebuild this user")
+def rebuild_rollups(batch_size, user_id):
+    """Recompute the daily and monthly expense rollups from the expenses table"""
+    users = rows = 0
+    last_id = 0
+
+    while True:
+        query = db.session.query(User.id).filter(User.id > last_id)
+        if user_id is not None:
+            query = query.filter(User.id == user_id)
+        user_ids = [uid for (uid,) in query.order_by(User.id).limit(batch_size)]
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        rows += expense_rollups.rebuild(user_ids)
+        db.session.commit()
+        users += len(user_ids)
+
+    click.echo(f"Rebuilt {rows} daily rollup rows for {users} users")
@@ -0,0 +1,56 @@
+import click
+from flask.cli import AppGroup
+from models import Habit, db
+from services.schedule import Schedule
+from services.streaks import load_completed_dates
+
+habits_cli = AppGroup("habits", help="Habit maintenance commands")
+
+
+@habits_cli.command("check-counters")
+@click.option("--batch-size", default=500, show_default=True, help="Habits per batch")
+@click.option("--fix", is_flag=True, help="Overwrite stored counters that differ")
+def check_counters(batch_size, fix):
+    """Compare stored habit streak counters with values recomputed from logs"""
+    checked = mismatched = 0
+    last_id = 0
+
+    while True:
+        habits = (
+            Habit.query.filter(Habit.id > last_id)
+            .order_by(Habit.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not habits:
+            break
+        last_id = habits[-1].id
+
+        dates_by_habit = load_completed_dates([habit.id for habit in habits])
+        for habit in habits:
+            completed_dates = dates_by_habit[habit.id]
+            summary = Schedule.for_habit(habit).summarize(completed_dates)
+            expected = {
+                "current_streak": summary.current,
+                "longest_streak": summary.longest,
+                "last_completed_date": summary.last_date,
+                "total_completions": len(completed_dates),
+            }
+            stored = {field: getattr(habit, field) for field in expected}
+
+            checked += 1
+            if stored != expected:
+                mismatched += 1
+                click.echo(f"Habit {habit.id}: stored {stored}, expected {expected}")
+                if fix:
+                    for field, value in expected.items():
+                        setattr(habit, field, value)
+
+        if fix:
+            db.session.commit()
+        else:
+            db.session.rollback()
+
+    click.echo(f"Checked {checked} habits, {mismatched} mismatched")
+    if mismatched and not fix:
+        raise SystemExit(1)
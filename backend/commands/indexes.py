@@ -0,0 +1,218 @@
+import random
+import uuid
+from datetime import date, datetime, timedelta
+import click
+from flask.cli import AppGroup
+from sqlalchemy import func, insert
+from models import (
+    CalendarEvent, Expense, ExpenseDailyRollup, ExpenseMonthlyRollup, Habit, HabitLog,
+    JournalEntry, JournalTag, Task, User, db,
+)
+from services import calendar_events, expense_rollups
+from services.pagination import keyset_segments
+
+indexes_cli = AppGroup("indexes", help="Index maintenance commands")
+
+
+def hot_queries(user_id, habit_ids):
+    """Representative statements for each per-user list/aggregate endpoint"""
+    today = date.today()
+    month_start = today.replace(day=1)
+    return {
+        "GET /api/tasks?limit=": keyset_segments(
+            Task.query.filter_by(user_id=user_id), Task.due_date, Task.id
+        )[0].limit(51),
+        "GET /api/tasks?limit= (no due date)": keyset_segments(
+            Task.query.filter_by(user_id=user_id), Task.due_date, Task.id
+        )[1].limit(51),
+        "GET /api/tasks?completed=false&limit=": keyset_segments(
+            Task.query.filter_by(user_id=user_id, completed=False), Task.due_date, Task.id
+        )[0].limit(51),
+        "GET /api/tasks/stats": db.session.query(Task.category, Task.priority, func.count(Task.id))
+        .filter(Task.user_id == user_id)
+        .group_by(Task.category, Task.priority),
+        "GET /api/tasks/stats (latest)": Task.query.filter_by(user_id=user_id)
+        .order_by(Task.updated_at.desc())
+        .limit(1),
+        "GET /api/expenses": Expense.query.filter_by(user_id=user_id)
+        .order_by(Expense.date.desc()),
+        "GET /api/expenses?category=": Expense.query.filter_by(user_id=user_id, category="Food")
+        .order_by(Expense.date.desc()),
+        "GET /api/expenses/summary (months)": expense_rollups.monthly_category_totals(
+            user_id, date(today.year, 1, 1), month_start
+        ),
+        "GET /api/expenses/summary (days)": expense_rollups.daily_rows(user_id, month_start, today),
+        "GET /api/expenses/summary?bucket=week": expense_rollups.bucket_totals_query(
+            user_id, ExpenseDailyRollup, "week", month_start, today + timedelta(days=1)
+        ),
+        "GET /api/expenses/summary?bucket=month": expense_rollups.bucket_totals_query(
+            user_id, ExpenseMonthlyRollup, "month", date(today.year, 1, 1), month_start
+        ),
+        "POST /api/expenses/import (dedupe)": db.session.query(Expense.content_hash)
+        .filter(Expense.user_id == user_id, Expense.content_hash.in_(["0" * 64])),
+        "GET /api/journal": JournalEntry.query.filter_by(user_id=user_id)
+        .order_by(JournalEntry.date.desc()),
+        "GET /api/journal/stats": db.session.query(JournalEntry.mood, func.count(JournalEntry.id))
+        .filter(JournalEntry.user_id == user_id)
+        .group_by(JournalEntry.mood),
+        "GET /api/journal/tags": db.session.query(JournalTag.tag, func.count(JournalTag.entry_id))
+        .filter(JournalTag.user_id == user_id)
+        .group_by(JournalTag.tag),
+        "GET /api/calendar/range": calendar_events.overlapping(
+            user_id,
+            datetime.combine(month_start, datetime.min.time()),
+            datetime.combine(month_start + timedelta(days=31), datetime.min.time()),
+        ),
+        "GET /api/calendar/range (series)": CalendarEvent.query.filter(
+            *calendar_events.series_criteria(
+                user_id,
+                datetime.combine(month_start, datetime.min.time()),
+                datetime.combine(month_start + timedelta(days=31), datetime.min.time()),
+                timedelta(hours=1),
+            )
+        ),
+        "reminder scheduler": CalendarEvent.query.filter(
+            CalendarEvent.reminder == True,
+            CalendarEvent.recurrence_frequency.is_(None),
+            CalendarEvent.start_time >= datetime.combine(today, datetime.min.time()),
+            CalendarEvent.start_time < datetime.combine(today, datetime.min.time()) + timedelta(minutes=30),
+        ),
+        "GET /api/calendar/month (tasks)": Task.query.filter(
+            Task.user_id == user_id,
+            Task.due_date >= month_start,
+            Task.due_date <= month_start + timedelta(days=30),
+        ),
+        "GET /api/habits": Habit.query.filter_by(user_id=user_id)
+        .order_by(Habit.created_at.desc()),
+        "GET /api/habits (stats)": db.session.query(HabitLog.habit_id, func.count(HabitLog.id))
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .filter(
+            Habit.user_id == user_id,
+            HabitLog.completed == True,
+            HabitLog.date >= today - timedelta(days=29),
+            HabitLog.date <= today,
+        )
+        .group_by(HabitLog.habit_id),
+        "streak engine": db.session.query(HabitLog.habit_id, HabitLog.date)
+        .filter(HabitLog.habit_id.in_(habit_ids), HabitLog.completed == True)
+        .order_by(HabitLog.habit_id, HabitLog.date),
+        "GET /api/habits/heatmap": db.session.query(HabitLog.date, func.count(HabitLog.id))
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .filter(
+            Habit.user_id == user_id,
+            HabitLog.completed == True,
+            HabitLog.date >= date(today.year, 1, 1),
+            HabitLog.date <= date(today.year, 12, 31),
+        )
+        .group_by(HabitLog.date),
+    }
+
+
+def seed(users, rows):
+    """Insert synthetic users with `rows` rows per table; returns one user id"""
+    rng = random.Random(42)
+    today = date.today()
+    user_ids = []
+
+    for _ in range(users):
+        user = User(email=f"explain-{uuid.uuid4().hex}@example.invalid", password_hash="-")
+        db.session.add(user)
+        db.session.flush()
+        user_ids.append(user.id)
+
+        days = [today - timedelta(days=rng.randint(0, 1000)) for _ in range(rows)]
+        db.session.execute(insert(Task), [
+            {"user_id": user.id, "title": "task", "category": rng.choice(["Work", "Home"]),
+             "priority": "medium", "status": "pending", "completed": rng.random() < 0.5,
+             "due_date": day, "updated_at": datetime.combine(day, datetime.min.time())}
+            for day in days
+        ])
+        db.session.execute(insert(Expense), [
+            {"user_id": user.id, "amount": 10, "category": rng.choice(["Food", "Bills"]), "date": day}
+            for day in days
+        ])
+        db.session.execute(insert(JournalEntry), [
+            {"user_id": user.id, "content": "-", "date": day} for day in days
+        ])
+        db.session.execute(insert(CalendarEvent), [
+            {"user_id": user.id, "title": "event",
+             "start_time": datetime.combine(day, datetime.min.time()),
+             "end_time": datetime.combine(day, datetime.min.time()) + timedelta(hours=1)}
+            for day in days
+        ])
+
+        habit = Habit(user_id=user.id, name="habit")
+        db.session.add(habit)
+        db.session.flush()
+        db.session.execute(insert(HabitLog), [
+            {"habit_id": habit.id, "date": today - timedelta(days=offset), "completed": True}
+            for offset in range(rows)
+        ])
+
+    expense_rollups.rebuild(user_ids)
+    return user_ids[len(user_ids) // 2]
+
+
+def explain(statement):
+    """Return (plan rows, full scan description or None) for a statement"""
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+
+    if dialect == "sqlite":
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params).all()
+        details = [row[-1] for row in plan]
+        scans = [
+            detail for detail in details
+            if detail.startswith("SCAN") and "INDEX" not in detail
+        ]
+    elif dialect == "mysql":
+        plan = connection.exec_driver_sql(f"EXPLAIN {compiled.string}", params).mappings().all()
+        details = [f"{row['table']}: type={row['type']} key={row['key']}" for row in plan]
+        scans = [
+            detail for detail, row in zip(details, plan)
+            if row["type"] in ("ALL", "index")
+        ]
+    elif dialect == "postgresql":
+        plan = connection.exec_driver_sql(f"EXPLAIN {compiled.string}", params).all()
+        details = [row[0] for row in plan]
+        scans = [detail.strip() for detail in details if "Seq Scan" in detail]
+    else:
+        raise click.ClickException(f"EXPLAIN checks are not supported on {dialect}")
+
+    return details, "; ".join(scans) or None
+
+
+@indexes_cli.command("explain")
+@click.option("--seed/--no-seed", "seed_data", default=True, show_default=True,
+              help="Insert synthetic users first (rolled back afterwards)")
+@click.option("--users", default=20, show_default=True, help="Synthetic users to insert")
+@click.option("--rows", default=200, show_default=True, help="Rows per table per user")
+@click.option("--user-id", type=int, help="User to explain against with --no-seed")
+@click.option("--verbose", is_flag=True, help="Print every plan")
+def explain_hot_queries(seed_data, users, rows, user_id, verbose):
+    """EXPLAIN each endpoint's query and fail if any falls back to a full scan"""
+    try:
+        if seed_data:
+            user_id = seed(users, rows)
+        elif user_id is None:
+            raise click.UsageError("--user-id is required with --no-seed")
+
+        habit_ids = [habit_id for (habit_id,) in db.session.query(Habit.id).filter_by(user_id=user_id)] or [0]
+        failures = 0
+        for name, query in hot_queries(user_id, habit_ids).items():
+            details, full_scan = explain(query.statement if hasattr(query, "statement") else query)
+            status = "FULL SCAN" if full_scan else "ok"
+            click.echo(f"{status:<9} {name}" + (f"  ({full_scan})" if full_scan else ""))
+            if verbose:
+                for detail in details:
+                    click.echo(f"          {detail}")
+            failures += bool(full_scan)
+    finally:
+        db.session.rollback()
+
+    if failures:
+        raise click.ClickException(f"{failures} queries regressed to a full scan")
@@ -0,0 +1,128 @@
+import time
+import click
+from cryptography.fernet import InvalidToken
+from flask.cli import AppGroup
+from sqlalchemy import bindparam
+from models import JournalEntry, db
+from models.journal import encrypt_content, make_excerpt
+from services import journal_search
+from services.crypto import get_crypto
+
+journal_cli = AppGroup("journal", help="Journal maintenance commands")
+
+
+@journal_cli.command("reencrypt")
+@click.option("--batch-size", default=500, show_default=True, help="Entries per transaction")
+@click.option("--pause", default=0.1, show_default=True, help="Seconds to sleep between batches")
+def reencrypt(batch_size, pause):
+    """Re-encrypt entries (title, content and excerpt) written under a retired
+    ENCRYPTION_OLD_KEYS key with ENCRYPTION_KEY and rebuild their search tokens
+
+    Without JOURNAL_SEARCH_KEY the search index is keyed on ENCRYPTION_KEY,
+    so a rotation changes every token; each readable entry is re-indexed
+    under the current search key.
+    """
+    crypto = get_crypto()
+    table = JournalEntry.__table__
+    # Only write back rows nobody edited since they were read
+    update = (
+        table.update()
+        .where(
+            table.c.id == bindparam("b_id"),
+            table.c.title.is_not_distinct_from(bindparam("b_title")),
+            table.c.content == bindparam("b_content"),
+            table.c.excerpt.is_not_distinct_from(bindparam("b_excerpt")),
+        )
+        .values(title=bindparam("title"), content=bindparam("content"), excerpt=bindparam("excerpt"))
+    )
+
+    checked = rotated = unreadable = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.session.query(JournalEntry.id, JournalEntry.title, JournalEntry.content, JournalEntry.excerpt)
+            .filter(JournalEntry.id > last_id)
+            .order_by(JournalEntry.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        params = []
+        plain = {}
+        for entry_id, title, content, excerpt in rows:
+            checked += 1
+            try:
+                new_title = crypto.rotate(title) if title else None
+                new_content = crypto.rotate(content) if content else None
+                new_excerpt = crypto.rotate(excerpt) if excerpt else None
+                plain[entry_id] = (
+                    {content, new_content},
+                    crypto.decrypt(title) if title else None,
+                    crypto.decrypt(content) if content else "",
+                )
+            except InvalidToken:
+                # Plain text from before encryption, or a key that is no longer configured
+                unreadable += 1
+                continue
+            if new_title or new_content or new_excerpt:
+                params.append({
+                    "b_id": entry_id,
+                    "b_title": title,
+                    "b_content": content,
+                    "b_excerpt": excerpt,
+                    "title": new_title or title,
+                    "content": new_content or content,
+                    "excerpt": new_excerpt or excerpt,
+                })
+
+        if params:
+            result = db.session.execute(update, params)
+            rotated += result.rowcount if result.rowcount >= 0 else len(params)
+
+        # Entries edited since they were read were re-indexed by that edit
+        if plain:
+            unchanged = [
+                (entry_id, user_id, plain[entry_id][1], plain[entry_id][2])
+                for entry_id, user_id, content in db.session.query(
+                    JournalEntry.id, JournalEntry.user_id, JournalEntry.content
+                ).filter(JournalEntry.id.in_(plain))
+                if content in plain[entry_id][0]
+            ]
+            journal_search.index_entries(unchanged)
+        db.session.commit()
+        if pause:
+            time.sleep(pause)
+
+    click.echo(f"Checked {checked} entries, re-encrypted {rotated}, {unreadable} unreadable")
+
+
+@journal_cli.command("reindex")
+@click.option("--batch-size", default=200, show_default=True, help="Entries per transaction")
+@click.option("--user-id", type=int, help="Only reindex this user's entries")
+def reindex(batch_size, user_id):
+    """Rebuild the search index and excerpts of journal entries from their decrypted text"""
+    entries = tokens = 0
+    last_id = 0
+
+    while True:
+        query = JournalEntry.query.filter(JournalEntry.id > last_id)
+        if user_id is not None:
+            query = query.filter(JournalEntry.user_id == user_id)
+        batch = query.order_by(JournalEntry.id).limit(batch_size).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        plain = []
+        for entry in batch:
+            content = entry.get_content()
+            entry.excerpt = encrypt_content(make_excerpt(content))
+            plain.append((entry.id, entry.user_id, entry.get_title(), content))
+        tokens += journal_search.index_entries(plain)
+        db.session.commit()
+        entries += len(batch)
+
+    click.echo(f"Indexed {entries} entries ({tokens} tokens)")
@@ -35,6 +35,35 @@ class Config:
 
     # Encryption Configuration for sensitive data (journal entries)
     ENCRYPTION_KEY = os.getenv("ENCRYPTION_KEY", "your-32-byte-encryption-key-change-in-production")
+    # Comma-separated retired keys, still accepted for decryption after a rotation
+    ENCRYPTION_OLD_KEYS = os.getenv("ENCRYPTION_OLD_KEYS", "")
+    # Key for the journal search index; defaults to ENCRYPTION_KEY. Changing
+    # the key in effect (including rotating ENCRYPTION_KEY while this is
+    # unset) requires `flask journal reencrypt` or `flask journal reindex`
+    JOURNAL_SEARCH_KEY = os.getenv("JOURNAL_SEARCH_KEY")
+
+    # Seconds a closed month of the habit heatmap stays cached per worker
+    HEATMAP_CACHE_SECONDS = int(os.getenv("HEATMAP_CACHE_SECONDS", 3600))
+
+    # Seconds closed-period expense analytics stay cached per worker
+    EXPENSE_ANALYTICS_CACHE_SECONDS = int(os.getenv("EXPENSE_ANALYTICS_CACHE_SECONDS", 3600))
+
+    # Expanded (recurring event, window) pairs kept per worker
+    CALENDAR_EXPANSION_CACHE_SIZE = int(os.getenv("CALENDAR_EXPANSION_CACHE_SIZE", 1024))
+
+    # Server-side event reminders (services/reminders.py). The scheduler runs
+    # in every worker started through wsgi.py when enabled; a lease row in
+    # the database lets only one of them fire at a time
+    REMINDER_SCHEDULER_ENABLED = os.getenv("REMINDER_SCHEDULER_ENABLED", "false").lower() == "true"
+    # log, webhook, queue, or "package.module:ClassName" for a custom sink
+    REMINDER_SINK = os.getenv("REMINDER_SINK", "log")
+    REMINDER_WEBHOOK_URL = os.getenv("REMINDER_WEBHOOK_URL")
+    REMINDER_LEAD_MINUTES = int(os.getenv("REMINDER_LEAD_MINUTES", 10))
+    REMINDER_LOOKAHEAD_MINUTES = int(os.getenv("REMINDER_LOOKAHEAD_MINUTES", 30))
+    # Reminders missed by up to this long (e.g. during a failover) still fire
+    REMINDER_GRACE_MINUTES = int(os.getenv("REMINDER_GRACE_MINUTES", 5))
+    REMINDER_POLL_SECONDS = int(os.getenv("REMINDER_POLL_SECONDS", 30))
+    REMINDER_LEASE_SECONDS = int(os.getenv("REMINDER_LEASE_SECONDS", 90))
 
     # CORS
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
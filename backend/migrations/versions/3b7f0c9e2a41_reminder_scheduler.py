@@ -0,0 +1,57 @@
+"""reminder scheduler
+
+Revision ID: 3b7f0c9e2a41
+Revises: 8d9ecb0010e5
+Create Date: 2026-10-18 21:07:12.904517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7f0c9e2a41'
+down_revision = '8d9ecb0010e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scheduler_leases',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('holder', sa.String(length=100), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('reminder_deliveries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('occurrence_start', sa.DateTime(), nullable=False),
+    sa.Column('remind_at', sa.DateTime(), nullable=False),
+    sa.Column('sink', sa.String(length=50), nullable=False),
+    sa.Column('fired_at', sa.DateTime(), nullable=True),
+    sa.Column('acknowledged_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['calendar_events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', 'occurrence_start', name='unique_reminder_delivery')
+    )
+    with op.batch_alter_table('reminder_deliveries', schema=None) as batch_op:
+        batch_op.create_index('ix_reminder_deliveries_occurrence_start', ['occurrence_start'], unique=False)
+        batch_op.create_index('ix_reminder_deliveries_user_queue', ['user_id', 'sink', 'acknowledged_at'], unique=False)
+
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_events_reminder_start', ['reminder', 'recurrence_frequency', 'start_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_events_reminder_start')
+
+    with op.batch_alter_table('reminder_deliveries', schema=None) as batch_op:
+        batch_op.drop_index('ix_reminder_deliveries_user_queue')
+        batch_op.drop_index('ix_reminder_deliveries_occurrence_start')
+
+    op.drop_table('reminder_deliveries')
+    op.drop_table('scheduler_leases')
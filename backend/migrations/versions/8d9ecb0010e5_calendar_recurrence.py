@@ -0,0 +1,38 @@
+"""calendar recurrence
+
+Revision ID: 8d9ecb0010e5
+Revises: 97d2cc54695e
+Create Date: 2026-10-18 20:02:37.418276
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d9ecb0010e5'
+down_revision = '97d2cc54695e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recurrence_frequency', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_interval', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_by_day', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_until', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_exceptions', sa.Text(), nullable=True))
+        batch_op.create_index('ix_calendar_events_user_recurrence', ['user_id', 'recurrence_frequency', 'start_time'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_events_user_recurrence')
+        batch_op.drop_column('recurrence_exceptions')
+        batch_op.drop_column('recurrence_count')
+        batch_op.drop_column('recurrence_until')
+        batch_op.drop_column('recurrence_by_day')
+        batch_op.drop_column('recurrence_interval')
+        batch_op.drop_column('recurrence_frequency')
@@ -0,0 +1,83 @@
+"""calendar interval index
+
+Revision ID: 97d2cc54695e
+Revises: f99ec7759f01
+Create Date: 2026-10-18 19:14:26.553901
+
+"""
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '97d2cc54695e'
+down_revision = 'f99ec7759f01'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.Integer),
+    sa.column('max_event_seconds', sa.Integer),
+)
+calendar_events = sa.table(
+    'calendar_events',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('start_time', sa.DateTime),
+    sa.column('end_time', sa.DateTime),
+)
+
+
+def backfill_max_durations(bind):
+    """Longest event per user, scanning events BATCH_SIZE rows at a time"""
+    maxima = {}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                calendar_events.c.id, calendar_events.c.user_id,
+                calendar_events.c.start_time, calendar_events.c.end_time,
+            )
+            .where(calendar_events.c.id > last_id)
+            .order_by(calendar_events.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        for _, user_id, start_time, end_time in rows:
+            seconds = max(math.ceil((end_time - start_time).total_seconds()), 0)
+            maxima[user_id] = max(maxima.get(user_id, 0), seconds)
+
+    bind.execute(users.update().values(max_event_seconds=0))
+    if maxima:
+        bind.execute(
+            users.update().where(users.c.id == sa.bindparam('b_id')),
+            [{'b_id': user_id, 'max_event_seconds': seconds} for user_id, seconds in maxima.items()],
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('max_event_seconds', sa.Integer(), nullable=True))
+
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_events_user_start_end', ['user_id', 'start_time', 'end_time'], unique=False)
+        batch_op.drop_index('ix_calendar_events_user_start_time')
+
+    backfill_max_durations(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_events_user_start_time', ['user_id', 'start_time'], unique=False)
+        batch_op.drop_index('ix_calendar_events_user_start_end')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('max_event_seconds')
@@ -0,0 +1,39 @@
+"""journal search tokens
+
+Revision ID: b2a4aa9d021a
+Revises: c448f348b020
+Create Date: 2026-10-18 16:24:05.118392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2a4aa9d021a'
+down_revision = 'c448f348b020'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate afterwards with `flask journal reindex`
+    op.create_table('journal_search_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token', sa.String(length=32), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entry_id', 'token', name='unique_journal_search_token')
+    )
+    with op.batch_alter_table('journal_search_tokens', schema=None) as batch_op:
+        batch_op.create_index('ix_journal_search_tokens_user_token', ['user_id', 'token', 'entry_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('journal_search_tokens', schema=None) as batch_op:
+        batch_op.drop_index('ix_journal_search_tokens_user_token')
+
+    op.drop_table('journal_search_tokens')
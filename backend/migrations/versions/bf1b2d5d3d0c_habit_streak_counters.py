@@ -0,0 +1,111 @@
+"""habit streak counters
+
+Revision ID: bf1b2d5d3d0c
+Revises: 71061e95930c
+Create Date: 2026-10-18 09:12:41.208314
+
+"""
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bf1b2d5d3d0c'
+down_revision = '71061e95930c'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+habits = sa.table(
+    'habits',
+    sa.column('id', sa.Integer),
+    sa.column('current_streak', sa.Integer),
+    sa.column('longest_streak', sa.Integer),
+    sa.column('last_completed_date', sa.Date),
+    sa.column('total_completions', sa.Integer),
+)
+habit_logs = sa.table(
+    'habit_logs',
+    sa.column('habit_id', sa.Integer),
+    sa.column('date', sa.Date),
+    sa.column('completed', sa.Boolean),
+)
+
+
+def _counters(completed_dates):
+    """Return (current run, longest run) for ascending distinct dates"""
+    current = longest = 0
+    previous = None
+    for log_date in completed_dates:
+        if previous is not None and log_date - previous == timedelta(days=1):
+            current += 1
+        else:
+            current = 1
+        longest = max(longest, current)
+        previous = log_date
+    return current, longest
+
+
+def backfill_counters(bind):
+    """Compute the counters from habit_logs, BATCH_SIZE habits at a time"""
+    last_id = 0
+    while True:
+        habit_ids = [
+            row.id for row in bind.execute(
+                sa.select(habits.c.id)
+                .where(habits.c.id > last_id)
+                .order_by(habits.c.id)
+                .limit(BATCH_SIZE)
+            )
+        ]
+        if not habit_ids:
+            break
+        last_id = habit_ids[-1]
+
+        dates_by_habit = {habit_id: [] for habit_id in habit_ids}
+        rows = bind.execute(
+            sa.select(habit_logs.c.habit_id, habit_logs.c.date)
+            .where(
+                habit_logs.c.habit_id.in_(habit_ids),
+                habit_logs.c.completed == sa.true(),
+            )
+            .order_by(habit_logs.c.habit_id, habit_logs.c.date)
+        )
+        for habit_id, log_date in rows:
+            dates_by_habit[habit_id].append(log_date)
+
+        params = []
+        for habit_id, completed_dates in dates_by_habit.items():
+            current, longest = _counters(completed_dates)
+            params.append({
+                'b_id': habit_id,
+                'current_streak': current,
+                'longest_streak': longest,
+                'last_completed_date': completed_dates[-1] if completed_dates else None,
+                'total_completions': len(completed_dates),
+            })
+        bind.execute(
+            habits.update().where(habits.c.id == sa.bindparam('b_id')),
+            params,
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('habits', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('current_streak', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('longest_streak', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('last_completed_date', sa.Date(), nullable=True))
+        batch_op.add_column(sa.Column('total_completions', sa.Integer(), nullable=True))
+
+    backfill_counters(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('habits', schema=None) as batch_op:
+        batch_op.drop_column('total_completions')
+        batch_op.drop_column('last_completed_date')
+        batch_op.drop_column('longest_streak')
+        batch_op.drop_column('current_streak')
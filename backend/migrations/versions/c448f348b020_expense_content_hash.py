@@ -0,0 +1,81 @@
+"""expense content hash
+
+Revision ID: c448f348b020
+Revises: c97ded06c058
+Create Date: 2026-10-18 15:02:37.441907
+
+"""
+import hashlib
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c448f348b020'
+down_revision = 'c97ded06c058'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+expenses = sa.table(
+    'expenses',
+    sa.column('id', sa.Integer),
+    sa.column('amount', sa.Numeric),
+    sa.column('category', sa.String),
+    sa.column('description', sa.String),
+    sa.column('date', sa.Date),
+    sa.column('payment_method', sa.String),
+    sa.column('content_hash', sa.String),
+)
+
+
+def _content_hash(row):
+    """Same fields and format as Expense.compute_content_hash"""
+    fields = [
+        row.date.isoformat(),
+        str(Decimal(str(row.amount)).quantize(Decimal('0.01'))),
+        row.category.strip(),
+        (row.description or '').strip(),
+        (row.payment_method or '').strip(),
+    ]
+    return hashlib.sha256('\x1f'.join(fields).encode('utf-8')).hexdigest()
+
+
+def backfill_hashes(bind):
+    """Hash existing expenses, BATCH_SIZE rows at a time"""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                expenses.c.id, expenses.c.amount, expenses.c.category,
+                expenses.c.description, expenses.c.date, expenses.c.payment_method,
+            )
+            .where(expenses.c.id > last_id)
+            .order_by(expenses.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        bind.execute(
+            expenses.update().where(expenses.c.id == sa.bindparam('b_id')),
+            [{'b_id': row.id, 'content_hash': _content_hash(row)} for row in rows],
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_expenses_user_content_hash', ['user_id', 'content_hash'], unique=False)
+
+    backfill_hashes(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.drop_index('ix_expenses_user_content_hash')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,47 @@
+"""expense rollups
+
+Revision ID: c97ded06c058
+Revises: fc6bf32ccb2c
+Create Date: 2026-10-18 13:40:12.913775
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c97ded06c058'
+down_revision = 'fc6bf32ccb2c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Populate afterwards with `flask expenses rebuild-rollups`
+    op.create_table('expense_daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'day', 'category', name='unique_expense_daily_rollup')
+    )
+    op.create_table('expense_monthly_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'month', 'category', name='unique_expense_monthly_rollup')
+    )
+
+
+def downgrade():
+    op.drop_table('expense_monthly_rollups')
+    op.drop_table('expense_daily_rollups')
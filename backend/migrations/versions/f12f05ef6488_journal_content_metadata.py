@@ -0,0 +1,111 @@
+"""journal content metadata
+
+Revision ID: f12f05ef6488
+Revises: f9bba59d9cdb
+Create Date: 2026-10-18 17:52:19.730144
+
+"""
+import base64
+import hashlib
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from flask import current_app
+
+
+# revision identifiers, used by Alembic.
+revision = 'f12f05ef6488'
+down_revision = 'f9bba59d9cdb'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+WORDS_PER_MINUTE = 200
+
+_LINK = re.compile(r'https?://|www\.', re.IGNORECASE)
+_ATTACHMENT = re.compile(r'!\[[^\]]*\]\([^)]+\)|data:[\w/+.-]+;base64,', re.IGNORECASE)
+
+journal_entries = sa.table(
+    'journal_entries',
+    sa.column('id', sa.Integer),
+    sa.column('content', sa.Text),
+    sa.column('word_count', sa.Integer),
+    sa.column('char_count', sa.Integer),
+    sa.column('reading_minutes', sa.Integer),
+    sa.column('has_links', sa.Boolean),
+    sa.column('has_attachments', sa.Boolean),
+)
+
+
+def _cipher():
+    """MultiFernet over the configured current and retired keys"""
+    secrets = [current_app.config.get('ENCRYPTION_KEY') or 'your-32-byte-encryption-key-change-in-production']
+    secrets += [key.strip() for key in (current_app.config.get('ENCRYPTION_OLD_KEYS') or '').split(',') if key.strip()]
+    return MultiFernet([
+        Fernet(base64.urlsafe_b64encode(hashlib.sha256(secret.encode()).digest()))
+        for secret in secrets
+    ])
+
+
+def _metadata(content):
+    """Same fields and rules as models.journal.content_metadata"""
+    content = content or ''
+    word_count = len(content.split())
+    return {
+        'word_count': word_count,
+        'char_count': len(content),
+        'reading_minutes': -(-word_count // WORDS_PER_MINUTE),
+        'has_links': bool(_LINK.search(content)),
+        'has_attachments': bool(_ATTACHMENT.search(content)),
+    }
+
+
+def backfill_metadata(bind):
+    """Decrypt each entry once and store its metadata, BATCH_SIZE rows at a time"""
+    cipher = _cipher()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(journal_entries.c.id, journal_entries.c.content)
+            .where(journal_entries.c.id > last_id)
+            .order_by(journal_entries.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        params = []
+        for entry_id, content in rows:
+            try:
+                content = cipher.decrypt(content.encode()).decode()
+            except (InvalidToken, AttributeError):
+                # Unencrypted legacy content is used as-is, as the model does
+                pass
+            params.append({'b_id': entry_id, **_metadata(content)})
+        bind.execute(
+            journal_entries.update().where(journal_entries.c.id == sa.bindparam('b_id')),
+            params,
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('word_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('char_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('reading_minutes', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('has_links', sa.Boolean(), nullable=True))
+        batch_op.add_column(sa.Column('has_attachments', sa.Boolean(), nullable=True))
+
+    backfill_metadata(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.drop_column('has_attachments')
+        batch_op.drop_column('has_links')
+        batch_op.drop_column('reading_minutes')
+        batch_op.drop_column('char_count')
+        batch_op.drop_column('word_count')
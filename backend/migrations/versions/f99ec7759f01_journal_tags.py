@@ -0,0 +1,88 @@
+"""journal tags
+
+Revision ID: f99ec7759f01
+Revises: f12f05ef6488
+Create Date: 2026-10-18 18:31:44.207583
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f99ec7759f01'
+down_revision = 'f12f05ef6488'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+journal_entries = sa.table(
+    'journal_entries',
+    sa.column('id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('tags', sa.String),
+)
+journal_tags = sa.table(
+    'journal_tags',
+    sa.column('entry_id', sa.Integer),
+    sa.column('user_id', sa.Integer),
+    sa.column('tag', sa.String),
+)
+
+
+def _normalize(tags):
+    """Same rules as services.journal_tags.normalize_tags"""
+    seen = []
+    for tag in (tags or '').split(','):
+        tag = tag.strip().lower()[:100]
+        if tag and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+def backfill_tags(bind):
+    """Split the comma-separated tags column, BATCH_SIZE entries at a time"""
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(journal_entries.c.id, journal_entries.c.user_id, journal_entries.c.tags)
+            .where(journal_entries.c.id > last_id)
+            .order_by(journal_entries.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        params = [
+            {'entry_id': entry_id, 'user_id': user_id, 'tag': tag}
+            for entry_id, user_id, tags in rows
+            for tag in _normalize(tags)
+        ]
+        if params:
+            bind.execute(journal_tags.insert(), params)
+
+
+def upgrade():
+    op.create_table('journal_tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['journal_entries.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entry_id', 'tag', name='unique_journal_tag')
+    )
+    with op.batch_alter_table('journal_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_journal_tags_user_tag', ['user_id', 'tag', 'entry_id'], unique=False)
+
+    backfill_tags(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('journal_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_journal_tags_user_tag')
+
+    op.drop_table('journal_tags')
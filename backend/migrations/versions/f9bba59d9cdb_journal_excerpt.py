@@ -0,0 +1,28 @@
+"""journal excerpt
+
+Revision ID: f9bba59d9cdb
+Revises: b2a4aa9d021a
+Create Date: 2026-10-18 17:10:48.602215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f9bba59d9cdb'
+down_revision = 'b2a4aa9d021a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Encrypted with the application key, so filled by `flask journal reindex`;
+    # until then the summary view derives missing excerpts from the content
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('excerpt', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.drop_column('excerpt')
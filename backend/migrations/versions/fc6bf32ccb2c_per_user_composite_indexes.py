@@ -0,0 +1,62 @@
+"""per-user composite indexes
+
+Revision ID: fc6bf32ccb2c
+Revises: bf1b2d5d3d0c
+Create Date: 2026-10-18 11:02:57.640193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fc6bf32ccb2c'
+down_revision = 'bf1b2d5d3d0c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_user_due_date', ['user_id', 'due_date'], unique=False)
+        batch_op.create_index('ix_tasks_user_completed_due_date', ['user_id', 'completed', 'due_date'], unique=False)
+        batch_op.create_index('ix_tasks_user_updated_at', ['user_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.create_index('ix_expenses_user_date', ['user_id', 'date'], unique=False)
+        batch_op.create_index('ix_expenses_user_category_date', ['user_id', 'category', 'date'], unique=False)
+
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.create_index('ix_journal_entries_user_date', ['user_id', 'date'], unique=False)
+
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_events_user_start_time', ['user_id', 'start_time'], unique=False)
+
+    with op.batch_alter_table('habits', schema=None) as batch_op:
+        batch_op.create_index('ix_habits_user_created_at', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('habit_logs', schema=None) as batch_op:
+        batch_op.create_index('ix_habit_logs_habit_completed_date', ['habit_id', 'completed', 'date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('habit_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_habit_logs_habit_completed_date')
+
+    with op.batch_alter_table('habits', schema=None) as batch_op:
+        batch_op.drop_index('ix_habits_user_created_at')
+
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_events_user_start_time')
+
+    with op.batch_alter_table('journal_entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_journal_entries_user_date')
+
+    with op.batch_alter_table('expenses', schema=None) as batch_op:
+        batch_op.drop_index('ix_expenses_user_category_date')
+        batch_op.drop_index('ix_expenses_user_date')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_user_updated_at')
+        batch_op.drop_index('ix_tasks_user_completed_due_date')
+        batch_op.drop_index('ix_tasks_user_due_date')
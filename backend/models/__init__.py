@@ -6,8 +6,9 @@ db = SQLAlchemy()
 from .user import User
 from .task import Task
 from .habit import Habit, HabitLog
-from .expense import Expense
-from .journal import JournalEntry
-from .calendar import CalendarEvent
+from .expense import Expense, ExpenseDailyRollup, ExpenseMonthlyRollup
+from .journal import JournalEntry, JournalSearchToken, JournalTag
+from .calendar import CalendarEvent, ReminderDelivery
+from .scheduler import SchedulerLease
 
-__all__ = ['db', 'User', 'Task', 'Habit', 'HabitLog', 'Expense', 'JournalEntry', 'CalendarEvent']
+__all__ = ['db', 'User', 'Task', 'Habit', 'HabitLog', 'Expense', 'ExpenseDailyRollup', 'ExpenseMonthlyRollup', 'JournalEntry', 'JournalSearchToken', 'JournalTag', 'CalendarEvent', 'ReminderDelivery', 'SchedulerLease']
@@ -1,5 +1,6 @@
 from datetime import datetime
 from models import db
+from services.recurrence import recurrence_dict
 
 
 class CalendarEvent(db.Model):
@@ -17,11 +18,26 @@ class CalendarEvent(db.Model):
     color = db.Column(db.String(20), default="#1a1a1a")  # Event color for display
     reminder = db.Column(db.Boolean, default=False)  # Browser notification reminder
     related_id = db.Column(db.Integer)  # ID of related task/habit if applicable
+
+    # RRULE-style recurrence; start_time/end_time hold the first occurrence
+    recurrence_frequency = db.Column(db.String(10))  # daily, weekly, monthly, yearly
+    recurrence_interval = db.Column(db.Integer)
+    recurrence_by_day = db.Column(db.String(20))  # Comma-separated MO..SU (weekly only)
+    recurrence_until = db.Column(db.DateTime)  # Last possible occurrence start
+    recurrence_count = db.Column(db.Integer)
+    recurrence_exceptions = db.Column(db.Text)  # Comma-separated cancelled occurrence starts
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    __table_args__ = (
+        db.Index("ix_calendar_events_user_start_end", "user_id", "start_time", "end_time"),
+        db.Index("ix_calendar_events_user_recurrence", "user_id", "recurrence_frequency", "start_time"),
+        db.Index("ix_calendar_events_reminder_start", "reminder", "recurrence_frequency", "start_time"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -35,6 +51,40 @@ class CalendarEvent(db.Model):
             "color": self.color,
             "reminder": self.reminder,
             "related_id": self.related_id,
+            "recurrence": recurrence_dict(self),
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class ReminderDelivery(db.Model):
+    """A fired event reminder; the unique occurrence key makes each fire once"""
+
+    __tablename__ = "reminder_deliveries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(
+        db.Integer, db.ForeignKey("calendar_events.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    occurrence_start = db.Column(db.DateTime, nullable=False)
+    remind_at = db.Column(db.DateTime, nullable=False)
+    sink = db.Column(db.String(50), nullable=False)  # log, webhook, queue, ...
+    fired_at = db.Column(db.DateTime)  # Scheduler's local time, like the event times
+    acknowledged_at = db.Column(db.DateTime)  # Set when a queue consumer takes it
+
+    __table_args__ = (
+        db.UniqueConstraint("event_id", "occurrence_start", name="unique_reminder_delivery"),
+        db.Index("ix_reminder_deliveries_user_queue", "user_id", "sink", "acknowledged_at"),
+        db.Index("ix_reminder_deliveries_occurrence_start", "occurrence_start"),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "event_id": self.event_id,
+            "occurrence_start": self.occurrence_start.isoformat(),
+            "remind_at": self.remind_at.isoformat(),
+            "fired_at": self.fired_at.isoformat() if self.fired_at else None,
+            "acknowledged_at": self.acknowledged_at.isoformat() if self.acknowledged_at else None,
+        }
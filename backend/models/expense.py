@@ -1,4 +1,6 @@
+import hashlib
 from datetime import datetime
+from decimal import Decimal
 from models import db
 
 
@@ -16,6 +18,31 @@ class Expense(db.Model):
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # SHA-256 of the user-visible fields, used to skip re-imported rows
+    content_hash = db.Column(db.String(64))
+
+    __table_args__ = (
+        db.Index("ix_expenses_user_date", "user_id", "date"),
+        db.Index("ix_expenses_user_category_date", "user_id", "category", "date"),
+        db.Index("ix_expenses_user_content_hash", "user_id", "content_hash"),
+    )
+
+    @staticmethod
+    def compute_content_hash(date, amount, category, description=None, payment_method=None):
+        """Hash identifying an expense by date, amount, category, description and payment method"""
+        fields = [
+            date.isoformat(),
+            str(Decimal(str(amount)).quantize(Decimal("0.01"))),
+            category.strip(),
+            (description or "").strip(),
+            (payment_method or "").strip(),
+        ]
+        return hashlib.sha256("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+    def update_content_hash(self):
+        self.content_hash = Expense.compute_content_hash(
+            self.date, self.amount, self.category, self.description, self.payment_method
+        )
 
     def to_dict(self):
         return {
@@ -28,3 +55,37 @@ class Expense(db.Model):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class ExpenseDailyRollup(db.Model):
+    """Per-user, per-day, per-category expense totals"""
+
+    __tablename__ = "expense_daily_rollups"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "day", "category", name="unique_expense_daily_rollup"),
+    )
+
+
+class ExpenseMonthlyRollup(db.Model):
+    """Per-user, per-month, per-category expense totals (month is its first day)"""
+
+    __tablename__ = "expense_monthly_rollups"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    month = db.Column(db.Date, nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "month", "category", name="unique_expense_monthly_rollup"),
+    )
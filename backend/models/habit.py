@@ -1,5 +1,6 @@
 from datetime import datetime
 from models import db
+from services.schedule import Schedule
 
 
 class Habit(db.Model):
@@ -14,31 +15,56 @@ class Habit(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
-    frequency = db.Column(db.String(20), default="daily")  # daily, weekly
-    target_days = db.Column(db.Integer, default=7)
+    frequency = db.Column(db.String(20), default="daily")  # daily, weekly, weekdays, weekends
+    target_days = db.Column(db.Integer, default=7)  # check-ins per week for weekly habits
     color = db.Column(db.String(20), default="#3B82F6")
+
+    # Streak counters, maintained when logs are written
+    current_streak = db.Column(db.Integer, default=0)  # run ending at last_completed_date
+    longest_streak = db.Column(db.Integer, default=0)
+    last_completed_date = db.Column(db.Date, nullable=True)  # day that completed the last period
+    total_completions = db.Column(db.Integer, default=0)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    __table_args__ = (
+        db.Index("ix_habits_user_created_at", "user_id", "created_at"),
+    )
+
     # Relationships
     logs = db.relationship(
         "HabitLog", backref="habit", lazy=True, cascade="all, delete-orphan"
     )
 
-    def to_dict(self):
-        return {
+    def get_current_streak(self, today=None):
+        """Current streak as of today from the stored counters"""
+        if Schedule.for_habit(self).is_live(self.last_completed_date, today):
+            return self.current_streak or 0
+        return 0
+
+    def to_dict(self, include_logs=True):
+        data = {
             "id": self.id,
             "name": self.name,
             "description": self.description,
             "frequency": self.frequency,
             "target_days": self.target_days,
             "color": self.color,
-            "logs": [log.to_dict() for log in self.logs] if self.logs else [],
+            "current_streak": self.get_current_streak(),
+            "longest_streak": self.longest_streak or 0,
+            "last_completed_date": (
+                self.last_completed_date.isoformat() if self.last_completed_date else None
+            ),
+            "total_completions": self.total_completions or 0,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+        if include_logs:
+            data["logs"] = [log.to_dict() for log in self.logs]
+        return data
 
 
 class HabitLog(db.Model):
@@ -53,6 +79,7 @@ class HabitLog(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("habit_id", "date", name="unique_habit_date"),
+        db.Index("ix_habit_logs_habit_completed_date", "habit_id", "completed", "date"),
     )
 
     def to_dict(self):
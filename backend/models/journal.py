@@ -1,18 +1,7 @@
+import re
 from datetime import datetime
 from models import db
-from cryptography.fernet import Fernet
-import base64
-import hashlib
-import os
-
-
-def get_encryption_key():
-    """Generate a secure encryption key from the configured key"""
-    from flask import current_app
-    key = current_app.config.get('ENCRYPTION_KEY', 'your-32-byte-encryption-key-change-in-production')
-    # Derive a proper 32-byte key using SHA-256
-    key_bytes = hashlib.sha256(key.encode()).digest()
-    return base64.urlsafe_b64encode(key_bytes)
+from services.crypto import get_crypto
 
 
 def encrypt_content(content):
@@ -20,9 +9,7 @@ def encrypt_content(content):
     if not content:
         return None
     try:
-        fernet = Fernet(get_encryption_key())
-        encrypted = fernet.encrypt(content.encode())
-        return encrypted.decode()
+        return get_crypto().encrypt(content)
     except Exception as e:
         print(f"Encryption error: {e}")
         return content
@@ -33,15 +20,44 @@ def decrypt_content(encrypted_content):
     if not encrypted_content:
         return None
     try:
-        fernet = Fernet(get_encryption_key())
-        decrypted = fernet.decrypt(encrypted_content.encode())
-        return decrypted.decode()
+        return get_crypto().decrypt(encrypted_content)
     except Exception as e:
         print(f"Decryption error: {e}")
         # If decryption fails, return as-is (for backward compatibility with unencrypted data)
         return encrypted_content
 
 
+def make_excerpt(content, length=200):
+    """First `length` characters of content on one line, cut at a word boundary"""
+    if not content:
+        return None
+    text = re.sub(r"\s+", " ", content).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(" ", 1)[0] or text[:length]
+    return cut.rstrip() + "…"
+
+
+# Average adult silent reading speed used for reading_minutes
+WORDS_PER_MINUTE = 200
+
+_LINK = re.compile(r"https?://|www\.", re.IGNORECASE)
+_ATTACHMENT = re.compile(r"!\[[^\]]*\]\([^)]+\)|data:[\w/+.-]+;base64,", re.IGNORECASE)
+
+
+def content_metadata(content):
+    """Plain-text statistics of content, stored alongside the encrypted text"""
+    content = content or ""
+    word_count = len(content.split())
+    return {
+        "word_count": word_count,
+        "char_count": len(content),
+        "reading_minutes": -(-word_count // WORDS_PER_MINUTE),
+        "has_links": bool(_LINK.search(content)),
+        "has_attachments": bool(_ATTACHMENT.search(content)),
+    }
+
+
 class JournalEntry(db.Model):
     __tablename__ = "journal_entries"
 
@@ -49,17 +65,31 @@ class JournalEntry(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     title = db.Column(db.String(500))  # Increased for encrypted title
     content = db.Column(db.Text, nullable=False)
+    excerpt = db.Column(db.Text)  # Encrypted start of content for list views
     mood = db.Column(db.String(20))
     tags = db.Column(db.String(200))
     date = db.Column(db.Date, nullable=False)
+    # Derived from the plain content on write, so stats never need decryption
+    word_count = db.Column(db.Integer, default=0)
+    char_count = db.Column(db.Integer, default=0)
+    reading_minutes = db.Column(db.Integer, default=0)
+    has_links = db.Column(db.Boolean, default=False)
+    has_attachments = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    __table_args__ = (
+        db.Index("ix_journal_entries_user_date", "user_id", "date"),
+    )
+
     def set_content(self, content):
-        """Encrypt and set content"""
+        """Encrypt and set content, its excerpt and its metadata"""
         self.content = encrypt_content(content)
+        self.excerpt = encrypt_content(make_excerpt(content))
+        for field, value in content_metadata(content).items():
+            setattr(self, field, value)
 
     def get_content(self):
         """Decrypt and get content"""
@@ -73,14 +103,73 @@ class JournalEntry(db.Model):
         """Decrypt and get title"""
         return decrypt_content(self.title) if self.title else None
 
+    def get_excerpt(self):
+        """Decrypt and get the excerpt, deriving it from content if not stored yet"""
+        if self.excerpt:
+            return decrypt_content(self.excerpt)
+        return make_excerpt(self.get_content())
+
     def to_dict(self):
         return {
             "id": self.id,
             "title": self.get_title(),
             "content": self.get_content(),
+            "word_count": self.word_count or 0,
+            "reading_minutes": self.reading_minutes or 0,
+            "mood": self.mood,
+            "tags": self.tags.split(",") if self.tags else [],
+            "date": self.date.isoformat() if self.date else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def to_summary_dict(self):
+        """List view fields: the excerpt instead of the full content"""
+        return {
+            "id": self.id,
+            "title": self.get_title(),
+            "excerpt": self.get_excerpt(),
+            "word_count": self.word_count or 0,
+            "reading_minutes": self.reading_minutes or 0,
             "mood": self.mood,
             "tags": self.tags.split(",") if self.tags else [],
             "date": self.date.isoformat() if self.date else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+class JournalSearchToken(db.Model):
+    """Blind-index token (keyed HMAC of a word prefix) of a journal entry"""
+
+    __tablename__ = "journal_search_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(
+        db.Integer, db.ForeignKey("journal_entries.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    token = db.Column(db.String(32), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("entry_id", "token", name="unique_journal_search_token"),
+        db.Index("ix_journal_search_tokens_user_token", "user_id", "token", "entry_id"),
+    )
+
+
+class JournalTag(db.Model):
+    """One (normalised) tag of a journal entry, mirroring JournalEntry.tags"""
+
+    __tablename__ = "journal_tags"
+
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(
+        db.Integer, db.ForeignKey("journal_entries.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    tag = db.Column(db.String(100), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint("entry_id", "tag", name="unique_journal_tag"),
+        db.Index("ix_journal_tags_user_tag", "user_id", "tag", "entry_id"),
+    )
@@ -0,0 +1,11 @@
+from models import db
+
+
+class SchedulerLease(db.Model):
+    """Named lease held by one worker at a time, until it expires unrenewed"""
+
+    __tablename__ = "scheduler_leases"
+
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(100), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
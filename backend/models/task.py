@@ -27,6 +27,12 @@ class Task(db.Model):
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    __table_args__ = (
+        db.Index("ix_tasks_user_due_date", "user_id", "due_date"),
+        db.Index("ix_tasks_user_completed_due_date", "user_id", "completed", "due_date"),
+        db.Index("ix_tasks_user_updated_at", "user_id", "updated_at"),
+    )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -26,6 +26,9 @@ class User(db.Model):
     longest_streak = db.Column(db.Integer, default=0)
     last_login = db.Column(db.Date, nullable=True)
 
+    # Longest calendar event in seconds; bounds overlap queries on start_time
+    max_event_seconds = db.Column(db.Integer, default=0)
+
     # Relationships
     tasks = db.relationship(
         "Task", backref="user", lazy=True, cascade="all, delete-orphan"
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import Task, Habit, HabitLog, CalendarEvent, db
+from models import CalendarEvent, ReminderDelivery, db
 from datetime import datetime, date, timedelta
+from services import calendar_events, freebusy, recurrence, reminders
+from services.calendar_feed import feed, habit_log_rows, priority_color, task_rows
+from services.habit_stats import window_stats
 
 calendar_bp = Blueprint('calendar', __name__)
 
@@ -24,14 +27,129 @@ def get_calendar():
         else:
             end_date = date(year, month + 1, 1) - timedelta(days=1)
         
-        # Get calendar events
-        events = CalendarEvent.query.filter(
-            CalendarEvent.user_id == user_id,
-            CalendarEvent.start_time >= datetime.combine(start_date, datetime.min.time()),
-            CalendarEvent.start_time <= datetime.combine(end_date, datetime.max.time())
-        ).all()
+        # Get calendar events overlapping the month, including ones that started
+        # earlier, with recurring series expanded to their occurrences
+        events = calendar_events.in_window(
+            user_id,
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        )
         
-        return jsonify([event.to_dict() for event in events]), 200
+        return jsonify([
+            calendar_events.occurrence_dict(event, occurrence_start)
+            for occurrence_start, event in events
+        ]), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@calendar_bp.route('/range', methods=['GET'])
+@jwt_required()
+def get_calendar_range():
+    """Get calendar events overlapping [start, end)"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        start, end, error = _window_args()
+        if error:
+            return jsonify({'error': error}), 400
+        
+        events = calendar_events.in_window(user_id, start, end)
+        
+        return jsonify([
+            calendar_events.occurrence_dict(event, occurrence_start)
+            for occurrence_start, event in events
+        ]), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def _window_args():
+    """Parse the start/end query args as a half-open window, returning (start, end, error)"""
+    if not request.args.get('start') or not request.args.get('end'):
+        return None, None, 'start and end are required'
+    try:
+        start = datetime.fromisoformat(request.args['start'])
+        end = datetime.fromisoformat(request.args['end'])
+    except ValueError:
+        return None, None, 'start and end must be ISO dates or datetimes'
+    if end <= start:
+        return None, None, 'end must be after start'
+    return start, end, None
+
+
+@calendar_bp.route('/freebusy', methods=['GET'])
+@jwt_required()
+def get_free_busy():
+    """Get merged busy blocks and free slots in [start, end)"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        start, end, error = _window_args()
+        if error:
+            return jsonify({'error': error}), 400
+        try:
+            min_minutes = int(request.args.get('min_minutes', 0))
+        except ValueError:
+            min_minutes = -1
+        if min_minutes < 0:
+            return jsonify({'error': 'min_minutes must be a non-negative integer'}), 400
+        include_tasks = request.args.get('include_tasks', 'false').lower() == 'true'
+        
+        intervals = freebusy.window_intervals(user_id, start, end, include_tasks)
+        busy = freebusy.busy_blocks(intervals, start, end)
+        free = freebusy.free_slots(busy, start, end, timedelta(minutes=min_minutes))
+        
+        return jsonify({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'busy': [
+                {'start': block_start.isoformat(), 'end': block_end.isoformat()}
+                for block_start, block_end in busy
+            ],
+            'free': [
+                {
+                    'start': slot_start.isoformat(),
+                    'end': slot_end.isoformat(),
+                    'minutes': int((slot_end - slot_start).total_seconds() // 60)
+                }
+                for slot_start, slot_end in free
+            ]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@calendar_bp.route('/conflicts', methods=['GET'])
+@jwt_required()
+def get_conflicts():
+    """Get every pair of overlapping events in [start, end)"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        start, end, error = _window_args()
+        if error:
+            return jsonify({'error': error}), 400
+        include_tasks = request.args.get('include_tasks', 'false').lower() == 'true'
+        
+        intervals = freebusy.window_intervals(user_id, start, end, include_tasks)
+        
+        return jsonify({
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'conflicts': [
+                {
+                    'start': max(overlap_start, start).isoformat(),
+                    'end': min(overlap_end, end).isoformat(),
+                    'items': [first, second]
+                }
+                for overlap_start, overlap_end, first, second in freebusy.conflicts(intervals)
+                if overlap_end > start and overlap_start < end
+            ]
+        }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -61,7 +179,14 @@ def create_calendar_event():
             reminder=data.get('reminder', False)
         )
         
+        if data.get('recurrence') is not None:
+            try:
+                recurrence.apply_recurrence(event, data['recurrence'])
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
         db.session.add(event)
+        calendar_events.note_duration(user_id, event.start_time, event.end_time)
         db.session.commit()
         
         return jsonify({
@@ -91,22 +216,9 @@ def get_calendar_events():
         start_date = datetime.fromisoformat(start_date_str).date()
         end_date = datetime.fromisoformat(end_date_str).date()
         
-        # Get tasks within date range
-        tasks = Task.query.filter(
-            Task.user_id == user_id,
-            Task.due_date >= start_date,
-            Task.due_date <= end_date
-        ).all()
-        
-        # Get habits
-        habits = Habit.query.filter_by(user_id=user_id).all()
-        
-        # Get habit logs within date range
-        habit_logs = HabitLog.query.join(Habit).filter(
-            Habit.user_id == user_id,
-            HabitLog.date >= start_date,
-            HabitLog.date <= end_date
-        ).all()
+        # Get tasks and habit logs (with their habit's columns) within date range
+        tasks = task_rows(user_id, start_date, end_date)
+        habit_logs = habit_log_rows(user_id, start_date, end_date)
         
         # Format events
         events = []
@@ -121,20 +233,19 @@ def get_calendar_events():
                 'date': task.due_date.isoformat() if task.due_date else None,
                 'priority': task.priority,
                 'status': task.status,
-                'color': get_priority_color(task.priority)
+                'color': priority_color(task.priority)
             })
         
         # Add habit logs as events
         for log in habit_logs:
-            habit = log.habit
             events.append({
                 'id': f'habit-{log.id}',
                 'type': 'habit',
-                'title': habit.name,
-                'description': habit.description,
+                'title': log.name,
+                'description': log.description,
                 'date': log.date.isoformat() if log.date else None,
                 'completed': log.completed,
-                'color': habit.color
+                'color': log.color
             })
         
         return jsonify(events), 200
@@ -143,6 +254,36 @@ def get_calendar_events():
         return jsonify({'error': str(e)}), 500
 
 
+@calendar_bp.route('/feed', methods=['GET'])
+@jwt_required()
+def get_calendar_feed():
+    """Get calendar events, due tasks and habit logs for a date range"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        start_date_str = request.args.get('start_date')
+        end_date_str = request.args.get('end_date')
+        
+        if not start_date_str or not end_date_str:
+            return jsonify({'error': 'start_date and end_date are required'}), 400
+        try:
+            start_date = date.fromisoformat(start_date_str)
+            end_date = date.fromisoformat(end_date_str)
+        except ValueError:
+            return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD'}), 400
+        if end_date < start_date:
+            return jsonify({'error': 'end_date must not be before start_date'}), 400
+        
+        return jsonify({
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'items': feed(user_id, start_date, end_date)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @calendar_bp.route('/month', methods=['GET'])
 @jwt_required()
 def get_month_view():
@@ -162,21 +303,13 @@ def get_month_view():
             end_date = date(year, month + 1, 1) - timedelta(days=1)
         
         # Get tasks for the month
-        tasks = Task.query.filter(
-            Task.user_id == user_id,
-            Task.due_date >= start_date,
-            Task.due_date <= end_date
-        ).all()
-        
-        # Get habits for the month
-        habits = Habit.query.filter_by(user_id=user_id).all()
-        
-        # Get habit logs for the month
-        habit_logs = HabitLog.query.join(Habit).filter(
-            Habit.user_id == user_id,
-            HabitLog.date >= start_date,
-            HabitLog.date <= end_date
-        ).all()
+        tasks = task_rows(user_id, start_date, end_date)
+        
+        # Per-habit completion counts for the elapsed part of the month
+        habit_stats = window_stats(user_id, start_date, min(end_date, date.today()))
+        
+        # Get habit logs for the month, with their habit's name and color
+        habit_logs = habit_log_rows(user_id, start_date, end_date)
         
         # Build day-by-day calendar
         calendar_data = {}
@@ -209,15 +342,19 @@ def get_month_view():
             if date_str in calendar_data:
                 calendar_data[date_str]['habits'].append({
                     'id': log.habit_id,
-                    'name': log.habit.name,
+                    'name': log.name,
                     'completed': log.completed,
-                    'color': log.habit.color
+                    'color': log.color
                 })
         
         return jsonify({
             'year': year,
             'month': month,
-            'calendar': list(calendar_data.values())
+            'calendar': list(calendar_data.values()),
+            'habit_stats': [
+                {'habit_id': habit_id, **stats}
+                for habit_id, stats in habit_stats.items()
+            ]
         }), 200
         
     except Exception as e:
@@ -256,8 +393,18 @@ def update_calendar_event(event_id):
             event.color = data['color']
         if 'reminder' in data:
             event.reminder = data['reminder']
+        if 'recurrence' in data:
+            try:
+                recurrence.apply_recurrence(event, data['recurrence'])
+            except ValueError as e:
+                db.session.rollback()
+                return jsonify({'error': str(e)}), 400
+        
+        if 'start_time' in data or 'end_time' in data:
+            calendar_events.note_duration(user_id, event.start_time, event.end_time)
         
         db.session.commit()
+        recurrence.invalidate(event.id)
         
         return jsonify({
             'message': 'Event updated successfully',
@@ -280,8 +427,10 @@ def delete_calendar_event(event_id):
         if not event:
             return jsonify({'error': 'Event not found'}), 404
         
+        reminders.forget_event(event_id)
         db.session.delete(event)
         db.session.commit()
+        recurrence.invalidate(event_id)
         
         return jsonify({'message': 'Event deleted successfully'}), 200
         
@@ -290,11 +439,127 @@ def delete_calendar_event(event_id):
         return jsonify({'error': str(e)}), 500
 
 
-def get_priority_color(priority):
-    """Get color based on task priority"""
-    colors = {
-        'high': '#EF4444',
-        'medium': '#F59E0B',
-        'low': '#10B981'
-    }
-    return colors.get(priority, '#6B7280')
+def _occurrence_start(value):
+    """Parse an occurrence start, returning None when it is missing or invalid"""
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+@calendar_bp.route('/<int:event_id>/exceptions', methods=['POST'])
+@jwt_required()
+def add_calendar_exception(event_id):
+    """Cancel one occurrence of a recurring event"""
+    try:
+        user_id = int(get_jwt_identity())
+        event = CalendarEvent.query.filter_by(id=event_id, user_id=user_id).first()
+        
+        if not event:
+            return jsonify({'error': 'Event not found'}), 404
+        if not event.recurrence_frequency:
+            return jsonify({'error': 'Event does not repeat'}), 400
+        
+        occurrence_start = _occurrence_start((request.get_json() or {}).get('occurrence_start'))
+        if occurrence_start is None:
+            return jsonify({'error': 'occurrence_start must be an ISO datetime'}), 400
+        if not recurrence.is_occurrence(event, occurrence_start):
+            return jsonify({'error': 'No occurrence starts at occurrence_start'}), 404
+        
+        exceptions = recurrence.parse_exceptions(event.recurrence_exceptions) | {occurrence_start}
+        event.recurrence_exceptions = recurrence.format_exceptions(exceptions)
+        db.session.commit()
+        recurrence.invalidate(event.id)
+        
+        return jsonify({
+            'message': 'Occurrence cancelled successfully',
+            'event': event.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@calendar_bp.route('/<int:event_id>/exceptions', methods=['DELETE'])
+@jwt_required()
+def remove_calendar_exception(event_id):
+    """Restore a cancelled occurrence of a recurring event"""
+    try:
+        user_id = int(get_jwt_identity())
+        event = CalendarEvent.query.filter_by(id=event_id, user_id=user_id).first()
+        
+        if not event:
+            return jsonify({'error': 'Event not found'}), 404
+        
+        occurrence_start = _occurrence_start(request.args.get('occurrence_start'))
+        if occurrence_start is None:
+            return jsonify({'error': 'occurrence_start must be an ISO datetime'}), 400
+        
+        exceptions = recurrence.parse_exceptions(event.recurrence_exceptions)
+        if occurrence_start not in exceptions:
+            return jsonify({'error': 'Occurrence is not cancelled'}), 404
+        
+        event.recurrence_exceptions = recurrence.format_exceptions(exceptions - {occurrence_start})
+        db.session.commit()
+        recurrence.invalidate(event.id)
+        
+        return jsonify({
+            'message': 'Occurrence restored successfully',
+            'event': event.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@calendar_bp.route('/reminders', methods=['GET'])
+@jwt_required()
+def get_reminders():
+    """Get reminders queued by the scheduler's queue sink and not yet acknowledged"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        deliveries = ReminderDelivery.query.filter_by(
+            user_id=user_id, sink='queue', acknowledged_at=None
+        ).order_by(ReminderDelivery.remind_at, ReminderDelivery.id).limit(100).all()
+        
+        titles = dict(
+            db.session.query(CalendarEvent.id, CalendarEvent.title).filter(
+                CalendarEvent.id.in_({delivery.event_id for delivery in deliveries})
+            )
+        ) if deliveries else {}
+        
+        return jsonify([
+            {**delivery.to_dict(), 'title': titles.get(delivery.event_id)}
+            for delivery in deliveries
+        ]), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@calendar_bp.route('/reminders/<int:delivery_id>/ack', methods=['POST'])
+@jwt_required()
+def acknowledge_reminder(delivery_id):
+    """Mark a queued reminder as shown"""
+    try:
+        user_id = int(get_jwt_identity())
+        delivery = ReminderDelivery.query.filter_by(id=delivery_id, user_id=user_id).first()
+        
+        if not delivery:
+            return jsonify({'error': 'Reminder not found'}), 404
+        
+        if delivery.acknowledged_at is None:
+            delivery.acknowledged_at = datetime.utcnow()
+            db.session.commit()
+        
+        return jsonify({
+            'message': 'Reminder acknowledged',
+            'reminder': delivery.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
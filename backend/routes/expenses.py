@@ -1,8 +1,8 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import Expense, db
+from models import Expense, User, db
 from datetime import datetime, date, timedelta
-from sqlalchemy import func, extract
+from services import expense_import, expense_rollups
 
 expenses_bp = Blueprint('expenses', __name__)
 
@@ -56,8 +56,11 @@ def create_expense():
             payment_method=data.get('payment_method')
         )
         
+        expense.update_content_hash()
         db.session.add(expense)
+        expense_rollups.add_expense(expense)
         db.session.commit()
+        expense_rollups.invalidate(user_id, [expense.date])
         
         return jsonify({
             'message': 'Expense created successfully',
@@ -69,6 +72,40 @@ def create_expense():
         return jsonify({'error': str(e)}), 500
 
 
+@expenses_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_expenses():
+    """Import expenses from a CSV upload"""
+    try:
+        user_id = int(get_jwt_identity())
+        
+        # Multipart upload as `file`, or the CSV as the raw request body
+        if 'file' in request.files:
+            stream = request.files['file'].stream
+        elif request.mimetype == 'text/csv':
+            stream = request.stream
+        else:
+            return jsonify({'error': 'Upload a CSV as `file` or send it with Content-Type text/csv'}), 400
+        
+        try:
+            result, imported_dates = expense_import.import_csv(user_id, stream)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 400
+        
+        db.session.commit()
+        expense_rollups.invalidate(user_id, imported_dates)
+        
+        return jsonify({
+            'message': f"Imported {result['imported']} expenses",
+            **result
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @expenses_bp.route('/<int:expense_id>', methods=['PUT'])
 @jwt_required()
 def update_expense(expense_id):
@@ -82,6 +119,9 @@ def update_expense(expense_id):
         
         data = request.get_json()
         
+        # Remember what the rollups currently count for this expense
+        previous = (expense.date, expense.category, expense.amount)
+        
         if 'amount' in data:
             expense.amount = data['amount']
         if 'category' in data:
@@ -93,7 +133,14 @@ def update_expense(expense_id):
         if 'payment_method' in data:
             expense.payment_method = data['payment_method']
         
+        expense.update_content_hash()
+        
+        if (expense.date, expense.category, expense.amount) != previous:
+            expense_rollups.remove_expense(user_id, *previous)
+            expense_rollups.add_expense(expense)
+        
         db.session.commit()
+        expense_rollups.invalidate(user_id, [previous[0], expense.date])
         
         return jsonify({
             'message': 'Expense updated successfully',
@@ -116,8 +163,11 @@ def delete_expense(expense_id):
         if not expense:
             return jsonify({'error': 'Expense not found'}), 404
         
+        expense_rollups.remove_expense(user_id, expense.date, expense.category, expense.amount)
+        expense_date = expense.date
         db.session.delete(expense)
         db.session.commit()
+        expense_rollups.invalidate(user_id, [expense_date])
         
         return jsonify({'message': 'Expense deleted successfully'}), 200
         
@@ -133,54 +183,75 @@ def get_expense_summary():
     try:
         user_id = int(get_jwt_identity())
         
-        # Get time period from query params
+        # Either an explicit start/end range or a trailing period
         period = request.args.get('period', 'month')  # month, week, year
+        bucket = request.args.get('bucket', 'day')
         
-        if period == 'week':
-            start_date = date.today() - timedelta(days=7)
-        elif period == 'year':
-            start_date = date.today() - timedelta(days=365)
-        else:  # month
-            start_date = date.today() - timedelta(days=30)
-        
-        # Total expenses
-        total = db.session.query(func.sum(Expense.amount)).filter(
-            Expense.user_id == user_id,
-            Expense.date >= start_date
-        ).scalar() or 0
-        
-        # Category breakdown
-        category_breakdown = db.session.query(
-            Expense.category,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            Expense.user_id == user_id,
-            Expense.date >= start_date
-        ).group_by(Expense.category).all()
-        
-        # Daily expenses (for chart)
-        daily_expenses = db.session.query(
-            Expense.date,
-            func.sum(Expense.amount).label('total')
-        ).filter(
-            Expense.user_id == user_id,
-            Expense.date >= start_date
-        ).group_by(Expense.date).order_by(Expense.date).all()
+        if bucket not in expense_rollups.BUCKETS:
+            return jsonify({'error': f"bucket must be one of {', '.join(expense_rollups.BUCKETS)}"}), 400
         
-        return jsonify({
-            'total': float(total),
+        if request.args.get('start') or request.args.get('end'):
+            if not (request.args.get('start') and request.args.get('end')):
+                return jsonify({'error': 'start and end must be given together'}), 400
+            try:
+                start_date = date.fromisoformat(request.args['start'])
+                end_date = date.fromisoformat(request.args['end'])
+            except ValueError:
+                return jsonify({'error': 'start and end must be ISO dates (YYYY-MM-DD)'}), 400
+            if start_date > end_date:
+                return jsonify({'error': 'start must not be after end'}), 400
+            period = 'custom'
+        else:
+            if period == 'week':
+                start_date = date.today() - timedelta(days=7)
+            elif period == 'year':
+                start_date = date.today() - timedelta(days=365)
+            else:  # month
+                start_date = date.today() - timedelta(days=30)
+            
+            end_date = date.today()
+        
+        # Read from the rollup tables instead of scanning expenses
+        analytics = expense_rollups.analytics(user_id, start_date, end_date, bucket)
+        summary = analytics['summary']
+        
+        # Budget is prorated per day at response time so budget edits apply at once
+        monthly_budget = User.query.get(user_id).budget or 0.0
+        total_budget = expense_rollups.prorated_budget(monthly_budget, start_date, end_date)
+        
+        response = {
+            'total': float(summary['total']),
             'period': period,
+            'bucket': bucket,
             'start_date': start_date.isoformat(),
-            'end_date': date.today().isoformat(),
+            'end_date': end_date.isoformat(),
             'category_breakdown': [
                 {'category': cat, 'total': float(total)}
-                for cat, total in category_breakdown
+                for cat, total in summary['by_category'].items()
+            ],
+            'series': [
+                {
+                    'start': item['start'].isoformat(),
+                    'end': item['end'].isoformat(),
+                    'total': float(item['total']),
+                    'budget': round(expense_rollups.prorated_budget(monthly_budget, item['start'], item['end']), 2)
+                }
+                for item in analytics['series']
             ],
-            'daily_expenses': [
+            'budget': {
+                'monthly': monthly_budget,
+                'total': round(total_budget, 2),
+                'remaining': round(total_budget - float(summary['total']), 2)
+            }
+        }
+        
+        if bucket == 'day':
+            response['daily_expenses'] = [
                 {'date': d.isoformat(), 'total': float(total)}
-                for d, total in daily_expenses
+                for d, total in sorted(summary['by_day'].items())
             ]
-        }), 200
+        
+        return jsonify(response), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
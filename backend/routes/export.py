@@ -0,0 +1,30 @@
+from datetime import date
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services import export
+
+export_bp = Blueprint('export', __name__)
+
+
+@export_bp.route('/<resource>', methods=['GET'])
+@jwt_required()
+def export_resource(resource):
+    """Stream all of a resource's rows for current user as CSV or NDJSON"""
+    try:
+        user_id = int(get_jwt_identity())
+        fmt = request.args.get('format', 'csv')
+        
+        if resource not in export.RESOURCES:
+            return jsonify({'error': f"resource must be one of {', '.join(export.RESOURCES)}"}), 404
+        if fmt not in export.FORMATS:
+            return jsonify({'error': f"format must be one of {', '.join(export.FORMATS)}"}), 400
+        
+        filename = f'{resource}-{date.today().isoformat()}.{fmt}'
+        return Response(
+            stream_with_context(export.stream(resource, user_id, fmt)),
+            mimetype=export.FORMATS[fmt],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -3,9 +3,17 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import Habit, HabitLog, db
 from datetime import datetime, date, timedelta
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload, raiseload
+from services import heatmap
+from services.habit_stats import STATS_WINDOWS, rolling_stats, empty_stats
+from services.streaks import apply_log_change, refresh_counters
+from services.upsert import upsert
 
 habits_bp = Blueprint('habits', __name__)
 
+# Maximum number of records accepted by the bulk check-in endpoint
+MAX_BULK_LOGS = 1000
+
 
 @habits_bp.route('', methods=['GET'])
 @jwt_required()
@@ -13,14 +21,52 @@ def get_habits():
     """Get all habits for current user"""
     try:
         user_id = int(get_jwt_identity())
-        habits = Habit.query.filter_by(user_id=user_id).order_by(Habit.created_at.desc()).all()
         
-        # Include streak information
+        # Completion statistics window in days
+        try:
+            window = int(request.args.get('window', 30))
+        except ValueError:
+            window = None
+        if window not in STATS_WINDOWS:
+            return jsonify({'error': f'window must be one of {STATS_WINDOWS}'}), 400
+        
+        # Log window: logs=none returns metadata only, logs_since/logs_days
+        # bound the logs loaded, and the default keeps the full history
+        include_logs = request.args.get('logs') != 'none'
+        logs_since = None
+        if request.args.get('logs_since'):
+            try:
+                logs_since = datetime.fromisoformat(request.args['logs_since']).date()
+            except ValueError:
+                return jsonify({'error': 'logs_since must be an ISO date'}), 400
+        elif request.args.get('logs_days'):
+            try:
+                logs_days = int(request.args['logs_days'])
+            except ValueError:
+                logs_days = 0
+            if logs_days < 1:
+                return jsonify({'error': 'logs_days must be a positive integer'}), 400
+            logs_since = date.today() - timedelta(days=logs_days - 1)
+        
+        if not include_logs:
+            # Nothing reads the logs without include_logs; raise if that changes
+            logs_option = raiseload(Habit.logs)
+        elif logs_since:
+            logs_option = selectinload(Habit.logs.and_(HabitLog.date >= logs_since))
+        else:
+            logs_option = selectinload(Habit.logs)
+        
+        habits = Habit.query.filter_by(user_id=user_id).options(logs_option).order_by(Habit.created_at.desc()).all()
+        
+        # Streaks are stored on each habit; completion counts come from one query
+        stats = rolling_stats(user_id, window)
+        
+        # Include completion statistics
         habits_data = []
         for habit in habits:
-            habit_dict = habit.to_dict()
-            habit_dict['current_streak'] = calculate_streak(habit.id)
-            habit_dict['completion_rate'] = calculate_completion_rate(habit.id)
+            habit_dict = habit.to_dict(include_logs=include_logs)
+            habit_dict.update(stats.get(habit.id, empty_stats()))
+            habit_dict['stats_window'] = window
             habits_data.append(habit_dict)
         
         return jsonify(habits_data), 200
@@ -29,6 +75,21 @@ def get_habits():
         return jsonify({'error': str(e)}), 500
 
 
+@habits_bp.route('/heatmap', methods=['GET'])
+@jwt_required()
+def get_habit_heatmap():
+    """Get per-day completion counts for a year across all habits"""
+    try:
+        user_id = int(get_jwt_identity())
+        year = int(request.args.get('year', date.today().year))
+        per_habit = request.args.get('habits', 'false').lower() == 'true'
+        
+        return jsonify(heatmap.year_heatmap(user_id, year, per_habit)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @habits_bp.route('', methods=['POST'])
 @jwt_required()
 def create_habit():
@@ -86,6 +147,10 @@ def update_habit(habit_id):
         if 'color' in data:
             habit.color = data['color']
         
+        # A new schedule changes what counts as a streak
+        if 'frequency' in data or 'target_days' in data:
+            refresh_counters([habit])
+        
         db.session.commit()
         
         return jsonify({
@@ -111,6 +176,7 @@ def delete_habit(habit_id):
         
         db.session.delete(habit)
         db.session.commit()
+        heatmap.invalidate(user_id)
         
         return jsonify({'message': 'Habit deleted successfully'}), 200
         
@@ -136,23 +202,105 @@ def log_habit(habit_id):
         # Check if log already exists
         existing_log = HabitLog.query.filter_by(habit_id=habit_id, date=log_date).first()
         
+        completed = bool(data.get('completed', True))
+        was_completed = bool(existing_log and existing_log.completed)
+        
         if existing_log:
-            existing_log.completed = data.get('completed', True)
+            existing_log.completed = completed
             existing_log.notes = data.get('notes')
         else:
             log = HabitLog(
                 habit_id=habit_id,
                 date=log_date,
-                completed=data.get('completed', True),
+                completed=completed,
                 notes=data.get('notes')
             )
             db.session.add(log)
         
+        # Keep the stored streak counters in the same transaction
+        apply_log_change(habit, log_date, was_completed, completed)
+        
         db.session.commit()
+        heatmap.invalidate(user_id, [log_date])
         
         return jsonify({
             'message': 'Habit logged successfully',
-            'current_streak': calculate_streak(habit_id)
+            'current_streak': habit.get_current_streak(),
+            'longest_streak': habit.longest_streak
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+@habits_bp.route('/logs/bulk', methods=['POST'])
+@jwt_required()
+def bulk_log_habits():
+    """Log many habit check-ins in a single transaction"""
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json()
+        records = data.get('logs') if isinstance(data, dict) else data
+        
+        if not isinstance(records, list) or not records:
+            return jsonify({'error': 'A non-empty list of logs is required'}), 400
+        if len(records) > MAX_BULK_LOGS:
+            return jsonify({'error': f'At most {MAX_BULK_LOGS} logs per request'}), 400
+        
+        # Validate records; later records for the same habit and date win
+        rows = {}
+        errors = []
+        now = datetime.utcnow()
+        for index, record in enumerate(records):
+            try:
+                habit_id = int(record['habit_id'])
+                log_date = datetime.fromisoformat(record['date']).date() if record.get('date') else date.today()
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append({'index': index, 'error': f'Invalid record: {e}'})
+                continue
+            rows[(habit_id, log_date)] = {
+                'habit_id': habit_id,
+                'date': log_date,
+                'completed': bool(record.get('completed', True)),
+                'notes': record.get('notes'),
+                'created_at': now
+            }
+        
+        if errors:
+            return jsonify({'error': 'Invalid logs', 'details': errors}), 400
+        
+        # Verify ownership of every referenced habit with one query
+        habit_ids = {habit_id for habit_id, _ in rows}
+        habits = Habit.query.filter(
+            Habit.user_id == user_id,
+            Habit.id.in_(habit_ids)
+        ).order_by(Habit.id).all()
+        missing_ids = sorted(habit_ids - {habit.id for habit in habits})
+        if missing_ids:
+            return jsonify({'error': 'Habit not found', 'habit_ids': missing_ids}), 404
+        
+        upsert(
+            HabitLog,
+            list(rows.values()),
+            conflict_columns=['habit_id', 'date'],
+            update_columns=['completed', 'notes']
+        )
+        refresh_counters(habits)
+        db.session.commit()
+        heatmap.invalidate(user_id, {log_date for _, log_date in rows})
+        
+        return jsonify({
+            'message': 'Habits logged successfully',
+            'logged': len(rows),
+            'streaks': [
+                {
+                    'habit_id': habit.id,
+                    'current_streak': habit.get_current_streak(),
+                    'longest_streak': habit.longest_streak
+                }
+                for habit in habits
+            ]
         }), 201
         
     except Exception as e:
@@ -187,44 +335,3 @@ def get_habit_logs(habit_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-
-def calculate_streak(habit_id):
-    """Calculate current streak for a habit"""
-    today = date.today()
-    streak = 0
-    current_date = today
-    
-    while True:
-        log = HabitLog.query.filter_by(
-            habit_id=habit_id,
-            date=current_date,
-            completed=True
-        ).first()
-        
-        if log:
-            streak += 1
-            current_date -= timedelta(days=1)
-        else:
-            break
-        
-        # Prevent infinite loop
-        if streak > 365:
-            break
-    
-    return streak
-
-
-def calculate_completion_rate(habit_id):
-    """Calculate completion rate for last 30 days"""
-    end_date = date.today()
-    start_date = end_date - timedelta(days=30)
-    
-    total_days = 30
-    completed_days = HabitLog.query.filter(
-        HabitLog.habit_id == habit_id,
-        HabitLog.date >= start_date,
-        HabitLog.date <= end_date,
-        HabitLog.completed == True
-    ).count()
-    
-    return round((completed_days / total_days) * 100, 1)
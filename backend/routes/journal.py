@@ -1,7 +1,11 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import case, extract, func
+from sqlalchemy.orm import defer
 from models import JournalEntry, db
 from datetime import datetime, date
+from services import journal_search, journal_tags
+from services.pagination import keyset_paginate, page_size
 
 journal_bp = Blueprint("journal", __name__)
 
@@ -9,13 +13,23 @@ journal_bp = Blueprint("journal", __name__)
 @journal_bp.route("", methods=["GET"])
 @jwt_required()
 def get_journal_entries():
-    """Get all journal entries for current user"""
+    """Get journal entries for current user
+
+    With view=summary, one page of entries is returned as
+    {"entries": [...], "next_cursor": ...}, newest first and keyed on
+    (date, id). Only titles and the stored excerpts are decrypted; the
+    full content comes from GET /api/journal/<id>. A search in this view
+    matches on the blind index alone, so one without indexable words (e.g.
+    only punctuation) returns no entries. Search words shorter than three
+    characters are rejected with a 400 in either view.
+    """
     try:
         user_id = int(get_jwt_identity())
 
         # Optional filters
         search = request.args.get("search")
         mood = request.args.get("mood")
+        tag = request.args.get("tag")
         start_date = request.args.get("start_date")
         end_date = request.args.get("end_date")
 
@@ -24,6 +38,10 @@ def get_journal_entries():
         # Apply non-search filters
         if mood:
             query = query.filter_by(mood=mood)
+        if tag:
+            query = query.filter(
+                JournalEntry.id.in_(journal_tags.entry_ids_with_tag(user_id, tag))
+            )
         if start_date:
             query = query.filter(
                 JournalEntry.date >= datetime.fromisoformat(start_date).date()
@@ -33,18 +51,172 @@ def get_journal_entries():
                 JournalEntry.date <= datetime.fromisoformat(end_date).date()
             )
 
+        # Narrow the search to entries whose blind index has every query word
+        try:
+            entry_ids = journal_search.matching_entry_ids(user_id, search) if search else None
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if entry_ids is not None:
+            query = query.filter(JournalEntry.id.in_(entry_ids))
+
+        if request.args.get("view") == "summary":
+            # Without indexable words there is nothing the index could match
+            if search and entry_ids is None:
+                return jsonify({"entries": [], "next_cursor": None}), 200
+            try:
+                entries, next_cursor = keyset_paginate(
+                    query.options(defer(JournalEntry.content)),
+                    JournalEntry.date,
+                    JournalEntry.id,
+                    cursor=request.args.get("cursor"),
+                    limit=page_size(request.args.get("limit")),
+                    descending=True,
+                )
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            return (
+                jsonify(
+                    {
+                        "entries": [entry.to_summary_dict() for entry in entries],
+                        "next_cursor": next_cursor,
+                    }
+                ),
+                200,
+            )
+
         entries = query.order_by(JournalEntry.date.desc()).all()
-        
-        # Apply search filter client-side (after decryption)
+
+        # Decrypt each candidate once, then confirm the match on the plain text
+        results = [entry.to_dict() for entry in entries]
         if search:
             search_lower = search.lower()
-            entries = [
-                entry for entry in entries
-                if (entry.get_title() and search_lower in entry.get_title().lower()) or
-                   (entry.get_content() and search_lower in entry.get_content().lower())
+            results = [
+                result for result in results
+                if (result["title"] and search_lower in result["title"].lower()) or
+                   (result["content"] and search_lower in result["content"].lower())
             ]
 
-        return jsonify([entry.to_dict() for entry in entries]), 200
+        return jsonify(results), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@journal_bp.route("/stats", methods=["GET"])
+@jwt_required()
+def get_journal_stats():
+    """Get writing statistics from the stored entry metadata, without decrypting"""
+    try:
+        user_id = int(get_jwt_identity())
+
+        start_date = request.args.get("start_date")
+        end_date = request.args.get("end_date")
+
+        filters = [JournalEntry.user_id == user_id]
+        if start_date:
+            filters.append(JournalEntry.date >= datetime.fromisoformat(start_date).date())
+        if end_date:
+            filters.append(JournalEntry.date <= datetime.fromisoformat(end_date).date())
+
+        year = extract("year", JournalEntry.date)
+        month = extract("month", JournalEntry.date)
+
+        # One grouped pass per month; totals are summed below
+        rows = (
+            db.session.query(
+                year,
+                month,
+                func.count(JournalEntry.id),
+                func.sum(JournalEntry.word_count),
+                func.sum(JournalEntry.char_count),
+                func.sum(JournalEntry.reading_minutes),
+                func.sum(case((JournalEntry.has_links == True, 1), else_=0)),
+                func.sum(case((JournalEntry.has_attachments == True, 1), else_=0)),
+            )
+            .filter(*filters)
+            .group_by(year, month)
+            .order_by(year, month)
+            .all()
+        )
+
+        totals = {
+            "entries": 0,
+            "words": 0,
+            "characters": 0,
+            "reading_minutes": 0,
+            "entries_with_links": 0,
+            "entries_with_attachments": 0,
+        }
+        by_month = []
+        for row_year, row_month, *values in rows:
+            counts = dict(zip(totals, (int(value or 0) for value in values)))
+            for key, value in counts.items():
+                totals[key] += value
+            by_month.append(
+                {
+                    "month": f"{int(row_year):04d}-{int(row_month):02d}",
+                    "entries": counts["entries"],
+                    "words": counts["words"],
+                }
+            )
+
+        by_mood = dict(
+            db.session.query(JournalEntry.mood, func.count(JournalEntry.id))
+            .filter(*filters)
+            .group_by(JournalEntry.mood)
+            .all()
+        )
+
+        longest = (
+            db.session.query(JournalEntry.id, JournalEntry.date, JournalEntry.word_count)
+            .filter(*filters)
+            .order_by(JournalEntry.word_count.desc(), JournalEntry.id.desc())
+            .first()
+        )
+
+        return (
+            jsonify(
+                {
+                    **totals,
+                    "average_words": (
+                        round(totals["words"] / totals["entries"], 1) if totals["entries"] else 0
+                    ),
+                    "by_month": by_month,
+                    "by_mood": {mood or "none": count for mood, count in by_mood.items()},
+                    "longest_entry": (
+                        {
+                            "id": longest.id,
+                            "date": longest.date.isoformat(),
+                            "word_count": longest.word_count or 0,
+                        }
+                        if longest
+                        else None
+                    ),
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@journal_bp.route("/tags", methods=["GET"])
+@jwt_required()
+def get_journal_tags():
+    """Get the current user's tags with the number of entries using each"""
+    try:
+        user_id = int(get_jwt_identity())
+
+        return (
+            jsonify(
+                [
+                    {"tag": tag, "count": count}
+                    for tag, count in journal_tags.tag_counts(user_id)
+                ]
+            ),
+            200,
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -80,6 +252,8 @@ def create_journal_entry():
         entry.set_content(data["content"])
 
         db.session.add(entry)
+        journal_search.index_entry(entry, data.get("title"), data["content"])
+        journal_tags.sync_entry(entry)
         db.session.commit()
 
         return (
@@ -127,6 +301,12 @@ def update_journal_entry(entry_id):
 
         data = request.get_json()
 
+        if "title" in data or "content" in data:
+            journal_search.index_entry(
+                entry,
+                data["title"] if "title" in data else entry.get_title(),
+                data["content"] if "content" in data else entry.get_content(),
+            )
         if "title" in data:
             entry.set_title(data["title"])
         if "content" in data:
@@ -137,6 +317,8 @@ def update_journal_entry(entry_id):
             entry.tags = ",".join(data["tags"]) if data["tags"] else ""
         if "date" in data:
             entry.date = datetime.fromisoformat(data["date"]).date()
+        if "tags" in data:
+            journal_tags.sync_entry(entry)
 
         db.session.commit()
 
@@ -166,6 +348,8 @@ def delete_journal_entry(entry_id):
         if not entry:
             return jsonify({"error": "Journal entry not found"}), 404
 
+        journal_search.remove_entry(entry.id)
+        journal_tags.remove_entry(entry.id)
         db.session.delete(entry)
         db.session.commit()
 
@@ -1,21 +1,46 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import Task, db
-from datetime import datetime
+from datetime import datetime, date
+from sqlalchemy import func, case
+from services.pagination import keyset_paginate, page_size
 
 tasks_bp = Blueprint("tasks", __name__)
 
+# Operations and filters accepted by the bulk endpoint
+BULK_OPERATIONS = ["delete", "set_status", "set_priority", "set_due_date"]
+BULK_FILTERS = ["status", "priority", "category", "completed"]
+
+# Columns GET /api/tasks can sort and paginate on
+TASK_SORT_COLUMNS = ["due_date", "created_at", "updated_at"]
+
 
 @tasks_bp.route("", methods=["GET"])
 @jwt_required()
 def get_tasks():
-    """Get all tasks for current user"""
+    """Get tasks for current user
+
+    Without limit or cursor the full list is returned as before. With either,
+    one page is returned as {"tasks": [...], "next_cursor": ...}, keyed on
+    (sort column, id); pass next_cursor back to get the following page.
+    """
     try:
         user_id = int(get_jwt_identity())
 
         # Optional filters
         status = request.args.get("status")
         priority = request.args.get("priority")
+        category = request.args.get("category")
+        completed = request.args.get("completed")
+        due_before = request.args.get("due_before")
+        due_after = request.args.get("due_after")
+
+        sort = request.args.get("sort", "due_date")
+        if sort.lstrip("-") not in TASK_SORT_COLUMNS:
+            return (
+                jsonify({"error": f"sort must be one of {TASK_SORT_COLUMNS}, optionally prefixed with -"}),
+                400,
+            )
 
         query = Task.query.filter_by(user_id=user_id)
 
@@ -23,10 +48,120 @@ def get_tasks():
             query = query.filter_by(status=status)
         if priority:
             query = query.filter_by(priority=priority)
+        if category:
+            query = query.filter_by(category=category)
+        if completed:
+            query = query.filter_by(completed=completed.lower() == "true")
+        try:
+            if due_before:
+                query = query.filter(Task.due_date < datetime.fromisoformat(due_before).date())
+            if due_after:
+                query = query.filter(Task.due_date > datetime.fromisoformat(due_after).date())
+        except ValueError:
+            return jsonify({"error": "due_before and due_after must be ISO dates"}), 400
+
+        sort_column = getattr(Task, sort.lstrip("-"))
+        descending = sort.startswith("-")
+
+        if "limit" not in request.args and "cursor" not in request.args:
+            direction = sort_column.desc() if descending else sort_column.asc()
+            tasks = query.order_by(direction, Task.id.asc()).all()
+            return jsonify([task.to_dict() for task in tasks]), 200
+
+        try:
+            tasks, next_cursor = keyset_paginate(
+                query,
+                sort_column,
+                Task.id,
+                cursor=request.args.get("cursor"),
+                limit=page_size(request.args.get("limit")),
+                descending=descending,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        tasks = query.order_by(Task.due_date.asc()).all()
+        return (
+            jsonify({"tasks": [task.to_dict() for task in tasks], "next_cursor": next_cursor}),
+            200,
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@tasks_bp.route("/stats", methods=["GET"])
+@jwt_required()
+def get_task_stats():
+    """Get task counts with category and priority breakdowns"""
+    try:
+        user_id = int(get_jwt_identity())
+
+        # Overdue is judged against the client's local date
+        today_str = request.args.get("today")
+        today = datetime.fromisoformat(today_str).date() if today_str else date.today()
+
+        is_completed = Task.completed == True
+        is_overdue = (func.coalesce(Task.completed, False) == False) & (Task.due_date < today)
+
+        # One grouped pass with conditional aggregates; totals are summed below
+        rows = (
+            db.session.query(
+                Task.category,
+                Task.priority,
+                func.count(Task.id),
+                func.sum(case((is_completed, 1), else_=0)),
+                func.sum(case((is_overdue, 1), else_=0)),
+            )
+            .filter(Task.user_id == user_id)
+            .group_by(Task.category, Task.priority)
+            .all()
+        )
+
+        totals = {"total": 0, "completed": 0, "pending": 0, "overdue": 0}
+        by_category = {}
+        by_priority = {}
+        for category, priority, total, completed, overdue in rows:
+            counts = {
+                "total": total,
+                "completed": int(completed or 0),
+                "pending": total - int(completed or 0),
+                "overdue": int(overdue or 0),
+            }
+            for bucket in (
+                totals,
+                by_category.setdefault(category or "Uncategorized", dict.fromkeys(totals, 0)),
+                by_priority.setdefault(priority or "medium", dict.fromkeys(totals, 0)),
+            ):
+                for key, value in counts.items():
+                    bucket[key] += value
+
+        latest_task = (
+            Task.query.filter_by(user_id=user_id)
+            .order_by(Task.updated_at.desc(), Task.id.desc())
+            .first()
+        )
 
-        return jsonify([task.to_dict() for task in tasks]), 200
+        return (
+            jsonify(
+                {
+                    **totals,
+                    "by_category": by_category,
+                    "by_priority": by_priority,
+                    "latest_task": (
+                        {
+                            "id": latest_task.id,
+                            "title": latest_task.title,
+                            "completed": latest_task.completed,
+                            "created_at": latest_task.created_at.isoformat() if latest_task.created_at else None,
+                            "updated_at": latest_task.updated_at.isoformat() if latest_task.updated_at else None,
+                        }
+                        if latest_task
+                        else None
+                    ),
+                }
+            ),
+            200,
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -161,3 +296,99 @@ def delete_task(task_id):
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
+
+
+@tasks_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def bulk_update_tasks():
+    """Delete or update many tasks with a single set-based statement"""
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+
+        operation = data.get("operation")
+        if operation not in BULK_OPERATIONS:
+            return (
+                jsonify({"error": f"operation must be one of {BULK_OPERATIONS}"}),
+                400,
+            )
+
+        ids = data.get("ids")
+        filters = data.get("filter")
+        if not ids and not filters:
+            return jsonify({"error": "Either ids or filter is required"}), 400
+
+        query = Task.query.filter(Task.user_id == user_id)
+
+        # Target either an explicit id list or a filter such as {"completed": true}
+        if ids:
+            try:
+                if not isinstance(ids, list) or any(isinstance(task_id, bool) for task_id in ids):
+                    raise ValueError
+                task_ids = [int(task_id) for task_id in ids]
+            except (TypeError, ValueError):
+                return jsonify({"error": "ids must be a list of integers"}), 400
+            query = query.filter(Task.id.in_(task_ids))
+        else:
+            if not isinstance(filters, dict):
+                return jsonify({"error": "filter must be an object"}), 400
+            unknown = set(filters) - set(BULK_FILTERS)
+            if unknown:
+                return (
+                    jsonify({"error": f"filter keys must be among {BULK_FILTERS}"}),
+                    400,
+                )
+            if not all(isinstance(value, (str, bool)) or value is None for value in filters.values()):
+                return jsonify({"error": "filter values must be strings, booleans or null"}), 400
+            query = query.filter_by(**filters)
+
+        if operation == "delete":
+            affected = query.delete(synchronize_session=False)
+        else:
+            value = data.get("value")
+            now = datetime.utcnow()
+            values = {"updated_at": now}
+
+            if operation == "set_status":
+                if value not in Task.STATUS_OPTIONS:
+                    return (
+                        jsonify({"error": f"value must be one of {Task.STATUS_OPTIONS}"}),
+                        400,
+                    )
+                values["status"] = value
+                # Mirror update_task: completing stamps completed_at once,
+                # reopening clears it
+                if value == "completed":
+                    values["completed"] = True
+                    values["completed_at"] = func.coalesce(Task.completed_at, now)
+                elif value == "pending":
+                    values["completed"] = False
+                    values["completed_at"] = None
+            elif operation == "set_priority":
+                if value not in Task.PRIORITY_LEVELS:
+                    return (
+                        jsonify({"error": f"value must be one of {Task.PRIORITY_LEVELS}"}),
+                        400,
+                    )
+                values["priority"] = value
+            else:
+                try:
+                    values["due_date"] = datetime.fromisoformat(value).date() if value else None
+                except (TypeError, ValueError):
+                    return jsonify({"error": "value must be an ISO date or null"}), 400
+
+            affected = query.update(values, synchronize_session=False)
+
+        db.session.commit()
+
+        action = "deleted" if operation == "delete" else "updated"
+        return (
+            jsonify({"message": f"Tasks {action} successfully", "affected": affected}),
+            200,
+        )
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
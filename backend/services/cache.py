@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+
+
+class UserCache:
+    """Per-process cache of per-user entries with a configurable TTL
+
+    Keys are tuples whose first element is the user id. Writers invalidate
+    the entries they affect in their own process; entries also expire after
+    the number of seconds in the `ttl_config` setting, which bounds how long
+    other workers can serve stale data.
+    """
+
+    def __init__(self, ttl_config, default_ttl=3600):
+        self.ttl_config = ttl_config
+        self.default_ttl = default_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        ttl = current_app.config.get(self.ttl_config, self.default_ttl)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, user_id, predicate=None):
+        """Drop a user's entries, or only those whose key matches predicate"""
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == user_id and (predicate is None or predicate(key)):
+                    del self._entries[key]
+
+
+class LRUCache:
+    """Per-process least-recently-used cache of per-owner entries
+
+    Keys are tuples whose first element is the owning record's id. Holds at
+    most the number of entries in the `size_config` setting, evicting the
+    least recently read or written entry first. Writers invalidate the
+    entries of the records they change.
+    """
+
+    def __init__(self, size_config, default_size=1024):
+        self.size_config = size_config
+        self.default_size = default_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        size = current_app.config.get(self.size_config, self.default_size)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, owner_id):
+        """Drop every entry owned by a record"""
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == owner_id:
+                    del self._entries[key]
@@ -0,0 +1,136 @@
+import math
+from datetime import timedelta
+from sqlalchemy import Integer, and_, case, cast, extract, func, literal_column, or_, select
+from models import CalendarEvent, User, db
+from services import recurrence
+
+
+def duration_seconds(start_time, end_time):
+    """Whole seconds an event lasts, rounded up (0 for inverted events)"""
+    return max(math.ceil((end_time - start_time).total_seconds()), 0)
+
+
+def note_duration(user_id, start_time, end_time):
+    """Raise the user's stored maximum event duration to cover this event
+
+    A single conditional UPDATE, so concurrent writers cannot lower it.
+    Deleting or shortening events leaves the bound loose but still safe;
+    `flask calendar recompute-durations` tightens it again.
+    """
+    seconds = duration_seconds(start_time, end_time)
+    current = func.coalesce(User.max_event_seconds, 0)
+    User.query.filter(User.id == user_id).update(
+        {User.max_event_seconds: case((current < seconds, seconds), else_=current)},
+        synchronize_session=False,
+    )
+
+
+def max_duration(user_id):
+    seconds = db.session.query(User.max_event_seconds).filter(User.id == user_id).scalar()
+    return timedelta(seconds=seconds or 0)
+
+
+def overlap_criteria(user_id, start, end, longest=None):
+    """Filter criteria for the user's single (non-recurring) events overlapping
+    the half-open window [start, end)
+
+    An event [start_time, end_time) overlaps when start_time < end and
+    end_time > start; zero-length events count when they fall inside the
+    window. No event lasts longer than the stored maximum duration, so
+    start_time >= start - max_duration also holds, which bounds the scan on
+    the (user_id, start_time, end_time) index from both sides. Pass `longest`
+    when the caller already looked up max_duration().
+    """
+    if longest is None:
+        longest = max_duration(user_id)
+    earliest_start = start - longest
+    return (
+        CalendarEvent.user_id == user_id,
+        CalendarEvent.recurrence_frequency.is_(None),
+        CalendarEvent.start_time >= earliest_start,
+        CalendarEvent.start_time < end,
+        or_(
+            CalendarEvent.end_time > start,
+            and_(CalendarEvent.end_time == CalendarEvent.start_time, CalendarEvent.start_time >= start),
+        ),
+    )
+
+
+def overlapping(user_id, start, end):
+    """Query for the user's single events overlapping [start, end), see overlap_criteria()"""
+    return CalendarEvent.query.filter(*overlap_criteria(user_id, start, end))
+
+
+def series_criteria(user_id, start, end, longest):
+    """Filter criteria for recurring series that may have an occurrence in [start, end)
+
+    Every occurrence lasts as long as the series' first one, so a series
+    whose last possible start is before start - longest cannot reach the
+    window. Count-limited series are only excluded once expanded.
+    """
+    return (
+        CalendarEvent.user_id == user_id,
+        # An IN list rather than IS NOT NULL, so the (user_id,
+        # recurrence_frequency, start_time) index is probed per frequency
+        CalendarEvent.recurrence_frequency.in_(recurrence.FREQUENCIES),
+        CalendarEvent.start_time < end,
+        or_(CalendarEvent.recurrence_until.is_(None), CalendarEvent.recurrence_until >= start - longest),
+    )
+
+
+def in_window(user_id, start, end):
+    """(occurrence start, event) pairs for single events and expanded recurring
+    series overlapping [start, end), ordered by occurrence start
+    """
+    longest = max_duration(user_id)
+    pairs = [
+        (event.start_time, event)
+        for event in CalendarEvent.query.filter(*overlap_criteria(user_id, start, end, longest))
+    ]
+    for series in CalendarEvent.query.filter(*series_criteria(user_id, start, end, longest)):
+        pairs.extend((occurrence, series) for occurrence in recurrence.occurrences(series, start, end))
+    pairs.sort(key=lambda pair: (pair[0], pair[1].id))
+    return pairs
+
+
+def occurrence_dict(event, occurrence_start):
+    """event.to_dict() with a recurring event's times moved to one occurrence"""
+    data = event.to_dict()
+    if event.recurrence_frequency:
+        data["start_time"] = occurrence_start.isoformat()
+        data["end_time"] = (occurrence_start + (event.end_time - event.start_time)).isoformat()
+        data["occurrence_start"] = occurrence_start.isoformat()
+    return data
+
+
+def _duration_seconds_sql():
+    """SQL expression for duration_seconds() of an event row, rounded up"""
+    start, end = CalendarEvent.start_time, CalendarEvent.end_time
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        return func.ceil(func.timestampdiff(literal_column("MICROSECOND"), start, end) / 1000000)
+    if dialect == "postgresql":
+        return func.ceil(extract("epoch", end - start))
+    # SQLite: whole seconds from strftime('%s'), plus one when the end's
+    # fixed-width ".ffffff" suffix (as SQLAlchemy stores it) is past the start's
+    whole = cast(func.strftime("%s", end), Integer) - cast(func.strftime("%s", start), Integer)
+    return whole + case((func.substr(end, 20) > func.substr(start, 20), 1), else_=0)
+
+
+def recompute_max_durations(user_ids):
+    """Reset the stored maximum duration of users from their events
+
+    One UPDATE computing the maximum in a correlated subquery, so an event
+    added by a concurrent writer (and its note_duration() raise) is either
+    seen by the subquery or applied after it, never overwritten with a
+    smaller value read earlier. Returns the number of users updated.
+    """
+    longest = (
+        select(func.max(_duration_seconds_sql()))
+        .where(CalendarEvent.user_id == User.id)
+        .scalar_subquery()
+    )
+    return User.query.filter(User.id.in_(user_ids)).update(
+        {User.max_event_seconds: case((longest > 0, longest), else_=0)},
+        synchronize_session=False,
+    )
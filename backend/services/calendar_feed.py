@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta
+from models import CalendarEvent, Habit, HabitLog, Task, db
+from services import calendar_events, recurrence
+
+PRIORITY_COLORS = {"high": "#EF4444", "medium": "#F59E0B", "low": "#10B981"}
+DEFAULT_PRIORITY_COLOR = "#6B7280"
+
+# Order of items that share a day and have no time of their own
+TYPE_ORDER = {"event": 0, "task": 1, "habit": 2}
+
+
+def priority_color(priority):
+    """Get color based on task priority"""
+    return PRIORITY_COLORS.get(priority, DEFAULT_PRIORITY_COLOR)
+
+
+def event_item_id(event_id, start, recurring):
+    """Feed id of an event, with the occurrence start for recurring series"""
+    return f"event-{event_id}-{start:%Y%m%dT%H%M%S}" if recurring else f"event-{event_id}"
+
+
+def task_rows(user_id, start_date, end_date):
+    """Tasks due between start_date and end_date (inclusive), as plain rows"""
+    return (
+        db.session.query(
+            Task.id, Task.title, Task.description, Task.due_date,
+            Task.priority, Task.status, Task.completed,
+        )
+        .filter(
+            Task.user_id == user_id,
+            Task.due_date >= start_date,
+            Task.due_date <= end_date,
+        )
+        .order_by(Task.due_date, Task.id)
+        .all()
+    )
+
+
+def habit_log_rows(user_id, start_date, end_date):
+    """Habit logs between start_date and end_date (inclusive) with their habit's
+    name, description and color joined in, so no Habit is loaded per log
+    """
+    return (
+        db.session.query(
+            HabitLog.id, HabitLog.habit_id, HabitLog.date, HabitLog.completed,
+            Habit.name, Habit.description, Habit.color,
+        )
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .filter(
+            Habit.user_id == user_id,
+            HabitLog.date >= start_date,
+            HabitLog.date <= end_date,
+        )
+        .order_by(HabitLog.date, HabitLog.id)
+        .all()
+    )
+
+
+EVENT_COLUMNS = (
+    CalendarEvent.id, CalendarEvent.title, CalendarEvent.description,
+    CalendarEvent.start_time, CalendarEvent.end_time, CalendarEvent.event_type,
+    CalendarEvent.location, CalendarEvent.priority, CalendarEvent.color,
+    CalendarEvent.reminder,
+)
+SERIES_COLUMNS = EVENT_COLUMNS + (
+    CalendarEvent.recurrence_frequency, CalendarEvent.recurrence_interval,
+    CalendarEvent.recurrence_by_day, CalendarEvent.recurrence_until,
+    CalendarEvent.recurrence_count, CalendarEvent.recurrence_exceptions,
+)
+
+
+def event_rows(user_id, start, end):
+    """(start, row, recurring) for single events and the occurrences of
+    recurring series overlapping [start, end), ordered by start
+    """
+    longest = calendar_events.max_duration(user_id)
+    rows = [
+        (row.start_time, row, False)
+        for row in db.session.query(*EVENT_COLUMNS)
+        .filter(*calendar_events.overlap_criteria(user_id, start, end, longest))
+    ]
+    series_rows = db.session.query(*SERIES_COLUMNS).filter(
+        *calendar_events.series_criteria(user_id, start, end, longest)
+    )
+    for row in series_rows:
+        rows.extend((occurrence, row, True) for occurrence in recurrence.occurrences(row, start, end))
+    rows.sort(key=lambda item: (item[0], item[1].id))
+    return rows
+
+
+def feed(user_id, start_date, end_date):
+    """Calendar events, due tasks and habit logs between two dates (inclusive)
+
+    Runs five queries whatever the window holds: the user's maximum event
+    duration, then one column-only select each for single events, recurring
+    series, tasks and habit logs. Series are expanded to their occurrences
+    in the window. Items are sorted by date, then by start time for events.
+    """
+    window_start = datetime.combine(start_date, datetime.min.time())
+    window_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+
+    items = []
+    for start, event, recurring in event_rows(user_id, window_start, window_end):
+        end = start + (event.end_time - event.start_time)
+        items.append({
+            "id": event_item_id(event.id, start, recurring),
+            "type": "event",
+            "source_id": event.id,
+            "title": event.title,
+            "description": event.description,
+            "date": max(start, window_start).date().isoformat(),
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "event_type": event.event_type,
+            "location": event.location,
+            "priority": event.priority,
+            "reminder": event.reminder,
+            "color": event.color,
+            "occurrence_start": start.isoformat() if recurring else None,
+        })
+
+    for task in task_rows(user_id, start_date, end_date):
+        items.append({
+            "id": f"task-{task.id}",
+            "type": "task",
+            "source_id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "date": task.due_date.isoformat(),
+            "priority": task.priority,
+            "status": task.status,
+            "completed": task.completed,
+            "color": priority_color(task.priority),
+        })
+
+    for log in habit_log_rows(user_id, start_date, end_date):
+        items.append({
+            "id": f"habit-{log.id}",
+            "type": "habit",
+            "source_id": log.habit_id,
+            "title": log.name,
+            "description": log.description,
+            "date": log.date.isoformat(),
+            "completed": log.completed,
+            "color": log.color,
+        })
+
+    items.sort(key=lambda item: (item["date"], TYPE_ORDER[item["type"]], item.get("start_time", "")))
+    return items
@@ -0,0 +1,75 @@
+import base64
+import hashlib
+import hmac
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from flask import current_app
+
+DEFAULT_ENCRYPTION_KEY = "your-32-byte-encryption-key-change-in-production"
+
+
+def derive_key(secret):
+    """Fernet key derived from a configured secret with SHA-256"""
+    return base64.urlsafe_b64encode(hashlib.sha256(secret.encode()).digest())
+
+
+class CryptoContext:
+    """Ciphers derived once from the current key and any retired keys
+
+    New data is always encrypted with the current key. Decryption tries the
+    current key first and then each retired key, so entries written before
+    a rotation stay readable until they are re-encrypted. Blind-index
+    tokens use JOURNAL_SEARCH_KEY, or the current key when it is unset, in
+    which case a rotation changes every token until `flask journal
+    reencrypt` rebuilds them.
+    """
+
+    def __init__(self, current_key, old_keys=(), search_key=None):
+        self.primary = Fernet(derive_key(current_key))
+        self.multi = MultiFernet(
+            [self.primary] + [Fernet(derive_key(key)) for key in old_keys]
+        )
+        self.search_key = hmac.new(
+            (search_key or current_key).encode(), b"journal-search-index", hashlib.sha256
+        ).digest()
+
+    @classmethod
+    def from_config(cls, config):
+        old_keys = [
+            key.strip() for key in (config.get("ENCRYPTION_OLD_KEYS") or "").split(",")
+            if key.strip()
+        ]
+        return cls(
+            config.get("ENCRYPTION_KEY") or DEFAULT_ENCRYPTION_KEY,
+            old_keys,
+            config.get("JOURNAL_SEARCH_KEY"),
+        )
+
+    def encrypt(self, text):
+        return self.primary.encrypt(text.encode()).decode()
+
+    def decrypt(self, token):
+        """Plain text of a token made with the current or a retired key"""
+        return self.multi.decrypt(token.encode()).decode()
+
+    def rotate(self, token):
+        """Token re-encrypted under the current key, or None if it already is
+
+        Raises InvalidToken if no configured key can decrypt it.
+        """
+        try:
+            self.primary.decrypt(token.encode())
+            return None
+        except InvalidToken:
+            return self.multi.rotate(token.encode()).decode()
+
+    def blind_index(self, value):
+        """Keyed HMAC of a normalised search term, safe to store in plain text"""
+        return hmac.new(self.search_key, value.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def get_crypto():
+    """The application's CryptoContext, built on first use"""
+    crypto = current_app.extensions.get("crypto")
+    if crypto is None:
+        crypto = current_app.extensions["crypto"] = CryptoContext.from_config(current_app.config)
+    return crypto
@@ -0,0 +1,136 @@
+import csv
+import io
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import func, insert
+from models import Expense, db
+from services import expense_rollups
+
+REQUIRED_COLUMNS = ["date", "amount", "category"]
+OPTIONAL_COLUMNS = ["description", "payment_method"]
+
+# Rows validated, deduplicated and inserted per executemany
+CHUNK_SIZE = 1000
+
+# Per-row errors listed in the result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Largest absolute amount that fits Expense.amount (Numeric(10, 2))
+MAX_AMOUNT = Decimal("99999999.99")
+
+
+def _text(row, column, max_length, required=False):
+    value = (row.get(column) or "").strip()
+    if required and not value:
+        raise ValueError(f"{column} is required")
+    if len(value) > max_length:
+        raise ValueError(f"{column} is longer than {max_length} characters")
+    return value or None
+
+
+def parse_row(row):
+    """Validate one CSV row (dict) and return the expense column values"""
+    try:
+        expense_date = date.fromisoformat((row.get("date") or "").strip())
+    except ValueError:
+        raise ValueError("date must be an ISO date (YYYY-MM-DD)")
+
+    try:
+        amount = Decimal((row.get("amount") or "").strip().replace(",", "")).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise ValueError("amount must be a number")
+    if not amount.is_finite():
+        raise ValueError("amount must be a number")
+    if not amount or abs(amount) > MAX_AMOUNT:
+        raise ValueError("amount must be non-zero and at most 99999999.99")
+
+    return {
+        "date": expense_date,
+        "amount": amount,
+        "category": _text(row, "category", 50, required=True),
+        "description": _text(row, "description", 200),
+        "payment_method": _text(row, "payment_method", 50),
+    }
+
+
+def _insert_chunk(user_id, chunk, result, imported_dates, counts):
+    """Drop rows already stored for the user, insert the rest and roll them up
+
+    counts maps each content hash seen so far to [rows stored before the
+    import, occurrences in the file so far]. The n-th identical row in the
+    file is only a duplicate when at least n such rows were already stored,
+    so two identical coffees on the same day are both imported, and
+    re-importing the file imports neither.
+    """
+    new_hashes = {row["content_hash"] for row in chunk} - counts.keys()
+    if new_hashes:
+        stored = dict(
+            db.session.query(Expense.content_hash, func.count(Expense.id))
+            .filter(Expense.user_id == user_id, Expense.content_hash.in_(new_hashes))
+            .group_by(Expense.content_hash)
+        )
+        for content_hash in new_hashes:
+            counts[content_hash] = [stored.get(content_hash, 0), 0]
+
+    rows = []
+    for row in chunk:
+        count = counts[row["content_hash"]]
+        count[1] += 1
+        if count[1] <= count[0]:
+            result["duplicates"] += 1
+            continue
+        rows.append(row)
+
+    if rows:
+        db.session.execute(insert(Expense), rows)
+        expense_rollups.add_many(user_id, rows)
+        imported_dates.update(row["date"] for row in rows)
+        result["imported"] += len(rows)
+
+
+def import_csv(user_id, stream, chunk_size=CHUNK_SIZE):
+    """Import expenses from a binary CSV stream
+
+    The stream is read row by row and inserted CHUNK_SIZE rows at a time,
+    so memory use only grows by a counter per distinct row. Rows already
+    stored for the user are skipped, counting identical rows one for one,
+    which makes re-importing the same export a no-op. Invalid rows are
+    reported and skipped.
+
+    Returns (result, imported dates). The caller commits the transaction
+    and then invalidates cached analytics for the imported dates.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    if reader.fieldnames is None:
+        raise ValueError("CSV file is empty")
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    missing = [column for column in REQUIRED_COLUMNS if column not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+
+    result = {"imported": 0, "duplicates": 0, "error_count": 0, "errors": []}
+    imported_dates = set()
+    counts = {}
+    chunk = []
+    for row in reader:
+        try:
+            values = parse_row(row)
+        except ValueError as e:
+            result["error_count"] += 1
+            if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                result["errors"].append({"line": reader.line_num, "error": str(e)})
+            continue
+
+        values["user_id"] = user_id
+        values["content_hash"] = Expense.compute_content_hash(**{
+            column: values[column] for column in ["date", "amount", "category", *OPTIONAL_COLUMNS]
+        })
+        chunk.append(values)
+        if len(chunk) >= chunk_size:
+            _insert_chunk(user_id, chunk, result, imported_dates, counts)
+            chunk = []
+
+    if chunk:
+        _insert_chunk(user_id, chunk, result, imported_dates, counts)
+
+    return result, imported_dates
@@ -0,0 +1,337 @@
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import Integer, cast, extract, func
+from models import Expense, ExpenseDailyRollup, ExpenseMonthlyRollup, db
+from services.cache import UserCache
+from services.upsert import upsert
+
+# Bucket sizes accepted by the expense analytics
+BUCKETS = ["day", "week", "month", "year"]
+
+# Analytics for closed periods keyed by (user_id, start, end, bucket)
+_cache = UserCache("EXPENSE_ANALYTICS_CACHE_SECONDS")
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def apply_delta(user_id, day, category, amount, count):
+    """Add amount/count to the daily and monthly rollup rows of one expense"""
+    amount = Decimal(str(amount))
+    for model, period_column, period in (
+        (ExpenseDailyRollup, "day", day),
+        (ExpenseMonthlyRollup, "month", _month_start(day)),
+    ):
+        upsert(
+            model,
+            [{
+                "user_id": user_id,
+                period_column: period,
+                "category": category,
+                "total": amount,
+                "count": count,
+            }],
+            conflict_columns=["user_id", period_column, "category"],
+            increment_columns=["total", "count"],
+        )
+        if count < 0:
+            model.query.filter(
+                model.user_id == user_id,
+                getattr(model, period_column) == period,
+                model.category == category,
+                model.count <= 0,
+            ).delete(synchronize_session=False)
+
+
+def add_expense(expense):
+    """Count a new expense in the rollups"""
+    apply_delta(expense.user_id, expense.date, expense.category, expense.amount, 1)
+
+
+def add_many(user_id, rows):
+    """Count a batch of new expense rows (dicts) with one upsert per rollup table"""
+    daily = defaultdict(lambda: [Decimal(0), 0])
+    monthly = defaultdict(lambda: [Decimal(0), 0])
+    for row in rows:
+        amount = Decimal(str(row["amount"]))
+        for totals in (daily[(row["date"], row["category"])], monthly[(_month_start(row["date"]), row["category"])]):
+            totals[0] += amount
+            totals[1] += 1
+
+    for model, period_column, groups in (
+        (ExpenseDailyRollup, "day", daily),
+        (ExpenseMonthlyRollup, "month", monthly),
+    ):
+        upsert(
+            model,
+            [
+                {"user_id": user_id, period_column: period, "category": category,
+                 "total": total, "count": count}
+                for (period, category), (total, count) in groups.items()
+            ],
+            conflict_columns=["user_id", period_column, "category"],
+            increment_columns=["total", "count"],
+        )
+
+
+def remove_expense(user_id, day, category, amount):
+    """Take a deleted (or pre-update) expense out of the rollups"""
+    apply_delta(user_id, day, category, -Decimal(str(amount)), -1)
+
+
+def _full_month_range(start_date, end_date):
+    """(first full month, exclusive end of the last full month) inside a period"""
+    first_full_month = start_date if start_date.day == 1 else _next_month(start_date)
+    return first_full_month, _month_start(end_date + timedelta(days=1))
+
+
+def monthly_category_totals(user_id, first_month, end_month_exclusive):
+    """Query of (category, total) from the monthly rollups of whole months"""
+    return (
+        db.session.query(ExpenseMonthlyRollup.category, func.sum(ExpenseMonthlyRollup.total))
+        .filter(
+            ExpenseMonthlyRollup.user_id == user_id,
+            ExpenseMonthlyRollup.month >= first_month,
+            ExpenseMonthlyRollup.month < end_month_exclusive,
+        )
+        .group_by(ExpenseMonthlyRollup.category)
+    )
+
+
+def daily_rows(user_id, start_date, end_date):
+    """Query of (day, category, total) daily rollup rows, by day"""
+    return (
+        db.session.query(ExpenseDailyRollup.day, ExpenseDailyRollup.category, ExpenseDailyRollup.total)
+        .filter(
+            ExpenseDailyRollup.user_id == user_id,
+            ExpenseDailyRollup.day >= start_date,
+            ExpenseDailyRollup.day <= end_date,
+        )
+        .order_by(ExpenseDailyRollup.day)
+    )
+
+
+def summary(user_id, start_date, end_date):
+    """Total, category breakdown and daily series for a period from the rollups
+
+    Whole months inside the period are read from the monthly rollups and the
+    partial months at either end from the daily rollups, so the work depends
+    on the length of the period rather than the number of expenses.
+    """
+    first_full_month, last_full_month_end = _full_month_range(start_date, end_date)
+    end_exclusive = end_date + timedelta(days=1)
+
+    by_category = defaultdict(Decimal)
+    if first_full_month < last_full_month_end:
+        for category, total in monthly_category_totals(user_id, first_full_month, last_full_month_end):
+            by_category[category] += Decimal(total or 0)
+        partial_ranges = [(start_date, first_full_month), (last_full_month_end, end_exclusive)]
+    else:
+        partial_ranges = [(start_date, end_exclusive)]
+
+    by_day = defaultdict(Decimal)
+    for day, category, total in daily_rows(user_id, start_date, end_date):
+        total = Decimal(total or 0)
+        by_day[day] += total
+        if any(range_start <= day < range_end for range_start, range_end in partial_ranges):
+            by_category[category] += total
+
+    return {
+        "total": sum(by_category.values(), Decimal(0)),
+        "by_category": dict(by_category),
+        "by_day": dict(by_day),
+    }
+
+
+def _week_start(column):
+    """SQL expression for the Monday of the week containing a date column"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        return func.subdate(column, func.weekday(column))
+    if dialect == "postgresql":
+        return cast(func.date_trunc("week", column), db.Date)
+    # SQLite: %w is 0 for Sunday, so (%w + 6) % 7 days back is Monday
+    offset = (cast(func.strftime("%w", column), Integer) + 6) % 7
+    return func.date(column, func.printf("-%d days", offset))
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _bucket_start(day, bucket):
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    if bucket == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _bucket_end(bucket_start, bucket):
+    """Last day of the bucket starting on bucket_start"""
+    if bucket == "week":
+        return bucket_start + timedelta(days=6)
+    if bucket == "month":
+        return _next_month(bucket_start) - timedelta(days=1)
+    if bucket == "year":
+        return bucket_start.replace(month=12, day=31)
+    return bucket_start
+
+
+def bucket_totals_query(user_id, model, bucket, range_start, range_end_exclusive):
+    """Query of (*bucket key, total) over one rollup table's periods in a range"""
+    period_column = model.day if model is ExpenseDailyRollup else model.month
+    if bucket == "day":
+        keys = [period_column]
+    elif bucket == "week":
+        keys = [_week_start(period_column)]
+    elif bucket == "month":
+        keys = [extract("year", period_column), extract("month", period_column)]
+    else:
+        keys = [extract("year", period_column)]
+    return (
+        db.session.query(*keys, func.sum(model.total))
+        .filter(
+            model.user_id == user_id,
+            period_column >= range_start,
+            period_column < range_end_exclusive,
+        )
+        .group_by(*keys)
+    )
+
+
+def bucketed_totals(user_id, start_date, end_date, bucket):
+    """Return {bucket_start: total} for a period, grouped by bucket in SQL
+
+    Day and week buckets group the daily rollups. Month and year buckets
+    group the monthly rollups for whole months plus the daily rollups for
+    the partial months at either end.
+    """
+    totals = defaultdict(Decimal)
+
+    def grouped(model, range_start, range_end_exclusive):
+        rows = bucket_totals_query(user_id, model, bucket, range_start, range_end_exclusive)
+        for *key, total in rows:
+            if bucket in ("day", "week"):
+                bucket_start = _as_date(key[0])
+            else:
+                bucket_start = date(int(key[0]), int(key[1]) if bucket == "month" else 1, 1)
+            totals[bucket_start] += Decimal(total or 0)
+
+    end_exclusive = end_date + timedelta(days=1)
+    if bucket in ("day", "week"):
+        grouped(ExpenseDailyRollup, start_date, end_exclusive)
+    else:
+        first_full_month, last_full_month_end = _full_month_range(start_date, end_date)
+        if first_full_month < last_full_month_end:
+            grouped(ExpenseMonthlyRollup, first_full_month, last_full_month_end)
+            grouped(ExpenseDailyRollup, start_date, first_full_month)
+            grouped(ExpenseDailyRollup, last_full_month_end, end_exclusive)
+        else:
+            grouped(ExpenseDailyRollup, start_date, end_exclusive)
+
+    return dict(totals)
+
+
+def prorated_budget(monthly_budget, start_date, end_date):
+    """Share of a monthly budget covering start_date..end_date, day by month"""
+    budget = 0.0
+    segment_start = start_date
+    while segment_start <= end_date:
+        month_end = _next_month(segment_start) - timedelta(days=1)
+        segment_end = min(month_end, end_date)
+        days_in_month = calendar.monthrange(segment_start.year, segment_start.month)[1]
+        budget += monthly_budget * ((segment_end - segment_start).days + 1) / days_in_month
+        segment_start = segment_end + timedelta(days=1)
+    return budget
+
+
+def analytics(user_id, start_date, end_date, bucket, today=None):
+    """Summary plus a zero-filled bucketed series for a period
+
+    Periods that ended before the current month are served from the cache
+    until an expense inside them changes.
+    """
+    today = today or date.today()
+    closed = end_date < today.replace(day=1)
+    key = (user_id, start_date, end_date, bucket)
+
+    result = _cache.get(key) if closed else None
+    if result is None:
+        totals = bucketed_totals(user_id, start_date, end_date, bucket)
+        series = []
+        bucket_start = _bucket_start(start_date, bucket)
+        while bucket_start <= end_date:
+            series.append({
+                "start": max(bucket_start, start_date),
+                "end": min(_bucket_end(bucket_start, bucket), end_date),
+                "total": totals.get(bucket_start, Decimal(0)),
+            })
+            bucket_start = _bucket_end(bucket_start, bucket) + timedelta(days=1)
+        result = {"summary": summary(user_id, start_date, end_date), "series": series}
+        if closed:
+            _cache.set(key, result)
+
+    return result
+
+
+def invalidate(user_id, dates):
+    """Drop cached analytics whose period contains any of dates"""
+    dates = list(dates)
+    _cache.invalidate(
+        user_id, lambda key: any(key[1] <= day <= key[2] for day in dates)
+    )
+
+
+def rebuild(user_ids):
+    """Recompute the rollups of the given users from their expenses"""
+    ExpenseDailyRollup.query.filter(ExpenseDailyRollup.user_id.in_(user_ids)).delete(
+        synchronize_session=False
+    )
+    ExpenseMonthlyRollup.query.filter(ExpenseMonthlyRollup.user_id.in_(user_ids)).delete(
+        synchronize_session=False
+    )
+
+    rows = (
+        db.session.query(
+            Expense.user_id,
+            Expense.date,
+            Expense.category,
+            func.sum(Expense.amount),
+            func.count(Expense.id),
+        )
+        .filter(Expense.user_id.in_(user_ids))
+        .group_by(Expense.user_id, Expense.date, Expense.category)
+        .all()
+    )
+
+    daily_rows = []
+    monthly = defaultdict(lambda: [Decimal(0), 0])
+    for user_id, day, category, total, count in rows:
+        total = Decimal(total or 0)
+        daily_rows.append({
+            "user_id": user_id, "day": day, "category": category,
+            "total": total, "count": count,
+        })
+        bucket = monthly[(user_id, _month_start(day), category)]
+        bucket[0] += total
+        bucket[1] += count
+
+    if daily_rows:
+        db.session.execute(ExpenseDailyRollup.__table__.insert(), daily_rows)
+        db.session.execute(ExpenseMonthlyRollup.__table__.insert(), [
+            {"user_id": user_id, "month": month, "category": category,
+             "total": total, "count": count}
+            for (user_id, month, category), (total, count) in monthly.items()
+        ])
+
+    return len(daily_rows)
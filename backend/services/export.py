@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import select
+from models import CalendarEvent, Expense, Habit, HabitLog, Task, db
+
+# Rows fetched from the server-side cursor and written per chunk
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _habit_log_columns():
+    return [
+        HabitLog.id, HabitLog.habit_id, Habit.name.label("habit_name"),
+        HabitLog.date, HabitLog.completed, HabitLog.notes, HabitLog.created_at,
+    ]
+
+
+# Exportable resource -> (columns, owning-user column, extra joins)
+RESOURCES = {
+    "expenses": (
+        lambda: [
+            Expense.id, Expense.date, Expense.amount, Expense.category,
+            Expense.description, Expense.payment_method, Expense.created_at,
+        ],
+        lambda: Expense.user_id,
+        (),
+    ),
+    "tasks": (
+        lambda: [
+            Task.id, Task.title, Task.description, Task.category, Task.priority,
+            Task.status, Task.completed, Task.due_date, Task.completed_at,
+            Task.created_at, Task.updated_at,
+        ],
+        lambda: Task.user_id,
+        (),
+    ),
+    "habit-logs": (
+        _habit_log_columns,
+        lambda: Habit.user_id,
+        ((Habit, HabitLog.habit_id == Habit.id),),
+    ),
+    "calendar-events": (
+        lambda: [
+            CalendarEvent.id, CalendarEvent.title, CalendarEvent.description,
+            CalendarEvent.start_time, CalendarEvent.end_time, CalendarEvent.event_type,
+            CalendarEvent.location, CalendarEvent.priority, CalendarEvent.color,
+            CalendarEvent.reminder, CalendarEvent.related_id,
+            CalendarEvent.recurrence_frequency, CalendarEvent.recurrence_interval,
+            CalendarEvent.recurrence_by_day, CalendarEvent.recurrence_until,
+            CalendarEvent.recurrence_count, CalendarEvent.recurrence_exceptions,
+            CalendarEvent.created_at, CalendarEvent.updated_at,
+        ],
+        lambda: CalendarEvent.user_id,
+        (),
+    ),
+}
+
+
+def _value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _statement(resource, user_id):
+    columns, user_column, joins = RESOURCES[resource]
+    columns = columns()
+    stmt = select(*columns)
+    for target, onclause in joins:
+        stmt = stmt.join(target, onclause)
+    return (
+        stmt.where(user_column() == user_id)
+        .order_by(columns[0])
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def stream(resource, user_id, fmt):
+    """Yield an export of one resource as CSV or NDJSON text chunks
+
+    Rows come from a server-side cursor EXPORT_BATCH_SIZE at a time (where
+    the driver supports one) and each batch is serialised and yielded
+    before the next is fetched, so memory stays flat whatever the row count.
+    """
+    result = db.session.execute(_statement(resource, user_id))
+    fields = list(result.keys())
+
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(fields)
+
+        for rows in result.partitions():
+            for row in rows:
+                if writer:
+                    writer.writerow([_value(value) for value in row])
+                else:
+                    buffer.write(json.dumps(dict(zip(fields, map(_value, row)))))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Header-only CSVs still need to be sent
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        result.close()
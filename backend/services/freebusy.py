@@ -0,0 +1,96 @@
+import heapq
+from collections import namedtuple
+from datetime import datetime, timedelta
+from services.calendar_feed import event_item_id, event_rows, task_rows
+
+# A busy interval [start, end) and the feed-style item that occupies it
+Interval = namedtuple("Interval", ["start", "end", "item"])
+
+
+def window_intervals(user_id, start, end, include_tasks=False):
+    """Busy intervals touching [start, end)
+
+    Single events and the occurrences of recurring series count as busy;
+    zero-length events take no time and are left out. With include_tasks,
+    each open task due in the window blocks its whole due day.
+    """
+    intervals = []
+    for occurrence_start, event, recurring in event_rows(user_id, start, end):
+        occurrence_end = occurrence_start + (event.end_time - event.start_time)
+        if occurrence_end <= occurrence_start:
+            continue
+        intervals.append(Interval(occurrence_start, occurrence_end, {
+            "id": event_item_id(event.id, occurrence_start, recurring),
+            "type": "event",
+            "source_id": event.id,
+            "title": event.title,
+            "start_time": occurrence_start.isoformat(),
+            "end_time": occurrence_end.isoformat(),
+        }))
+
+    if include_tasks:
+        last_day = (end - timedelta(microseconds=1)).date()
+        for task in task_rows(user_id, start.date(), last_day):
+            if task.completed:
+                continue
+            day_start = datetime.combine(task.due_date, datetime.min.time())
+            day_end = day_start + timedelta(days=1)
+            intervals.append(Interval(day_start, day_end, {
+                "id": f"task-{task.id}",
+                "type": "task",
+                "source_id": task.id,
+                "title": task.title,
+                "start_time": day_start.isoformat(),
+                "end_time": day_end.isoformat(),
+            }))
+
+    return intervals
+
+
+def busy_blocks(intervals, start, end):
+    """Merge intervals into disjoint (start, end) blocks clipped to [start, end)
+
+    One pass over the intervals sorted by start: each either extends the
+    current block (overlapping or touching it) or opens a new one.
+    """
+    blocks = []
+    for interval in sorted(intervals, key=lambda interval: interval.start):
+        block_start, block_end = max(interval.start, start), min(interval.end, end)
+        if block_end <= block_start:
+            continue
+        if blocks and block_start <= blocks[-1][1]:
+            blocks[-1][1] = max(blocks[-1][1], block_end)
+        else:
+            blocks.append([block_start, block_end])
+    return [tuple(block) for block in blocks]
+
+
+def free_slots(blocks, start, end, min_duration=timedelta(0)):
+    """Gaps of at least min_duration between disjoint sorted busy blocks in [start, end)"""
+    slots = []
+    cursor = start
+    for block_start, block_end in [*blocks, (end, end)]:
+        if block_start > cursor and block_start - cursor >= min_duration:
+            slots.append((cursor, block_start))
+        cursor = max(cursor, block_end)
+    return slots
+
+
+def conflicts(intervals):
+    """(overlap start, overlap end, earlier item, later item) for every overlapping pair
+
+    Sweeps the intervals in start order keeping the ones still running in a
+    heap keyed by end time; each new interval is paired with whatever is
+    still running when it starts. O(n log n) plus the number of pairs,
+    instead of comparing every pair. Intervals only touching do not conflict.
+    """
+    pairs = []
+    active = []
+    ordered = sorted(intervals, key=lambda interval: (interval.start, interval.end))
+    for sequence, interval in enumerate(ordered):
+        while active and active[0][0] <= interval.start:
+            heapq.heappop(active)
+        for other_end, _, other in sorted(active):
+            pairs.append((interval.start, min(other_end, interval.end), other.item, interval.item))
+        heapq.heappush(active, (interval.end, sequence, interval))
+    return pairs
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from sqlalchemy import func
+from models import Habit, HabitLog, db
+from services.schedule import Schedule
+from services.streaks import load_completed_dates
+
+# Windows (in days) accepted by the habit statistics endpoints
+STATS_WINDOWS = [7, 30, 90, 365]
+
+
+def completion_counts(user_id, start_date, end_date):
+    """Return {habit_id: completed_days} for all of a user's habits in one grouped query"""
+    rows = (
+        db.session.query(HabitLog.habit_id, func.count(HabitLog.id))
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .filter(
+            Habit.user_id == user_id,
+            HabitLog.completed == True,
+            HabitLog.date >= start_date,
+            HabitLog.date <= end_date,
+        )
+        .group_by(HabitLog.habit_id)
+        .all()
+    )
+    return dict(rows)
+
+
+def window_stats(user_id, start_date, end_date):
+    """Return {habit_id: {'completed_days', 'completion_rate'}} for a date window
+
+    Daily habits are rated straight from the grouped counts. Habits on another
+    schedule are rated against their expected periods from one extra range
+    query over the window. Habits without a completed log in the window are
+    omitted; callers should fall back to empty_stats().
+    """
+    total_days = (end_date - start_date).days + 1
+    if total_days <= 0:
+        return {}
+
+    stats = {
+        habit_id: {
+            "completed_days": count,
+            "completion_rate": round((count / total_days) * 100, 1),
+        }
+        for habit_id, count in completion_counts(user_id, start_date, end_date).items()
+    }
+    if not stats:
+        return stats
+
+    scheduled_habits = Habit.query.filter(
+        Habit.user_id == user_id,
+        Habit.id.in_(stats.keys()),
+        Habit.frequency != "daily",
+    ).all()
+    if scheduled_habits:
+        dates_by_habit = load_completed_dates(
+            [habit.id for habit in scheduled_habits], start_date, end_date
+        )
+        for habit in scheduled_habits:
+            stats[habit.id]["completion_rate"] = Schedule.for_habit(habit).completion_rate(
+                dates_by_habit[habit.id], start_date, end_date
+            )
+
+    return stats
+
+
+def rolling_stats(user_id, days=30, today=None):
+    """Return window_stats() for the last `days` days, today included"""
+    end_date = today or date.today()
+    start_date = end_date - timedelta(days=days - 1)
+    return window_stats(user_id, start_date, end_date)
+
+
+def empty_stats():
+    """Statistics for a habit with no completions in the window"""
+    return {"completed_days": 0, "completion_rate": 0.0}
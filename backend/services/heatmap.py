@@ -0,0 +1,139 @@
+from datetime import date, timedelta
+from sqlalchemy import func
+from models import Habit, HabitLog, db
+from services.cache import UserCache
+
+# Closed-month heatmap data keyed by (user_id, year, month)
+_cache = UserCache("HEATMAP_CACHE_SECONDS")
+
+
+def _month_bounds(year, month):
+    start_date = date(year, month, 1)
+    if month == 12:
+        end_date = date(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end_date = date(year, month + 1, 1) - timedelta(days=1)
+    return start_date, end_date
+
+
+def _is_closed(year, month, today):
+    return (year, month) < (today.year, today.month)
+
+
+def _cached(user_id, year, month, per_habit):
+    entry = _cache.get((user_id, year, month))
+    if not entry or (per_habit and entry["bits"] is None):
+        return None
+    return entry
+
+
+def invalidate(user_id, dates=None):
+    """Drop cached months containing any of dates, or every month if dates is None"""
+    if dates is None:
+        _cache.invalidate(user_id)
+    else:
+        months = {(day.year, day.month) for day in dates}
+        _cache.invalidate(user_id, lambda key: key[1:] in months)
+
+
+def _load(user_id, start_date, end_date, per_habit):
+    """Query per-day counts (and per-habit days) for a date range"""
+    filters = [
+        Habit.user_id == user_id,
+        HabitLog.completed == True,
+        HabitLog.date >= start_date,
+        HabitLog.date <= end_date,
+    ]
+    counts = dict(
+        db.session.query(HabitLog.date, func.count(HabitLog.id))
+        .join(Habit, Habit.id == HabitLog.habit_id)
+        .filter(*filters)
+        .group_by(HabitLog.date)
+        .all()
+    )
+
+    bits = None
+    if per_habit:
+        bits = {}
+        rows = (
+            db.session.query(HabitLog.habit_id, HabitLog.date)
+            .join(Habit, Habit.id == HabitLog.habit_id)
+            .filter(*filters)
+        )
+        for habit_id, log_date in rows:
+            bits.setdefault(habit_id, set()).add(log_date)
+
+    return counts, bits
+
+
+def year_heatmap(user_id, year, per_habit=False, today=None):
+    """Per-day completion counts for a year, optionally with per-habit bitstrings
+
+    Closed months are served from the cache; the remaining months are loaded
+    with one aggregate query spanning them.
+    """
+    today = today or date.today()
+    months = {}
+    missing = []
+
+    for month in range(1, 13):
+        entry = _cached(user_id, year, month, per_habit) if _is_closed(year, month, today) else None
+        if entry:
+            months[month] = entry
+        else:
+            missing.append(month)
+
+    if missing:
+        start_date = _month_bounds(year, missing[0])[0]
+        end_date = _month_bounds(year, missing[-1])[1]
+        counts, bits = _load(user_id, start_date, end_date, per_habit)
+
+        for month in missing:
+            month_start, month_end = _month_bounds(year, month)
+            month_counts = {d: n for d, n in counts.items() if month_start <= d <= month_end}
+            month_bits = None
+            if bits is not None:
+                month_bits = {
+                    habit_id: {d for d in days if month_start <= d <= month_end}
+                    for habit_id, days in bits.items()
+                }
+            months[month] = {"counts": month_counts, "bits": month_bits}
+            if _is_closed(year, month, today):
+                _cache.set((user_id, year, month), months[month])
+
+    year_start = date(year, 1, 1)
+    total_days = (date(year + 1, 1, 1) - year_start).days
+    day_counts = [0] * total_days
+    for entry in months.values():
+        for log_date, count in entry["counts"].items():
+            day_counts[(log_date - year_start).days] = count
+
+    result = {
+        "year": year,
+        "start_date": year_start.isoformat(),
+        "counts": day_counts,
+        "max_count": max(day_counts),
+        "total": sum(day_counts),
+    }
+
+    if per_habit:
+        habits = (
+            db.session.query(Habit.id, Habit.name, Habit.color)
+            .filter(Habit.user_id == user_id)
+            .order_by(Habit.created_at.desc())
+            .all()
+        )
+        result["habits"] = []
+        for habit_id, name, color in habits:
+            flags = ["0"] * total_days
+            for entry in months.values():
+                for log_date in entry["bits"].get(habit_id, ()):
+                    flags[(log_date - year_start).days] = "1"
+            result["habits"].append({
+                "habit_id": habit_id,
+                "name": name,
+                "color": color,
+                "bits": "".join(flags),
+            })
+
+    return result
@@ -0,0 +1,96 @@
+import re
+import unicodedata
+from sqlalchemy import func, insert
+from models import JournalSearchToken, db
+from services.crypto import get_crypto
+
+# Shortest and longest word prefixes indexed; shorter query words are
+# rejected and longer ones are matched on their longest indexed prefix
+MIN_PREFIX_LENGTH = 3
+MAX_PREFIX_LENGTH = 20
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize_words(text):
+    """Distinct lowercase NFKC words of text"""
+    if not text:
+        return set()
+    return set(_WORD.findall(unicodedata.normalize("NFKC", text).casefold()))
+
+
+def entry_tokens(title, content):
+    """Blind-index tokens for every prefix of at least MIN_PREFIX_LENGTH
+    characters of every word in title and content
+
+    Indexing prefixes lets a query word match the start of longer words
+    ("run" finds "running"), as the old substring search did. Shorter
+    prefixes would add rows for every word while telling little apart.
+    """
+    crypto = get_crypto()
+    prefixes = set()
+    for word in normalize_words(title) | normalize_words(content):
+        word = word[:MAX_PREFIX_LENGTH]
+        prefixes.update(word[:length] for length in range(MIN_PREFIX_LENGTH, len(word) + 1))
+    return {crypto.blind_index(prefix) for prefix in prefixes}
+
+
+def query_tokens(search):
+    """Tokens that an entry must all have to match a search string
+
+    Raises ValueError for a word shorter than MIN_PREFIX_LENGTH.
+    """
+    crypto = get_crypto()
+    words = normalize_words(search)
+    if any(len(word) < MIN_PREFIX_LENGTH for word in words):
+        raise ValueError(f"search words must be at least {MIN_PREFIX_LENGTH} characters long")
+    return {crypto.blind_index(word[:MAX_PREFIX_LENGTH]) for word in words}
+
+
+def index_entries(entries):
+    """Replace the tokens of (entry_id, user_id, title, content) tuples"""
+    entries = list(entries)
+    if not entries:
+        return 0
+    JournalSearchToken.query.filter(
+        JournalSearchToken.entry_id.in_([entry_id for entry_id, _, _, _ in entries])
+    ).delete(synchronize_session=False)
+
+    rows = [
+        {"entry_id": entry_id, "user_id": user_id, "token": token}
+        for entry_id, user_id, title, content in entries
+        for token in entry_tokens(title, content)
+    ]
+    if rows:
+        db.session.execute(insert(JournalSearchToken), rows)
+    return len(rows)
+
+
+def index_entry(entry, title, content):
+    """Re-index one entry from its plain-text title and content"""
+    db.session.flush()
+    index_entries([(entry.id, entry.user_id, title, content)])
+
+
+def remove_entry(entry_id):
+    JournalSearchToken.query.filter_by(entry_id=entry_id).delete(synchronize_session=False)
+
+
+def matching_entry_ids(user_id, search):
+    """Subquery of the user's entry ids having every token of search, or None
+
+    None means the search has no indexable words and cannot be narrowed.
+    Raises ValueError for a word shorter than MIN_PREFIX_LENGTH.
+    """
+    tokens = query_tokens(search)
+    if not tokens:
+        return None
+    return (
+        db.session.query(JournalSearchToken.entry_id)
+        .filter(
+            JournalSearchToken.user_id == user_id,
+            JournalSearchToken.token.in_(tokens),
+        )
+        .group_by(JournalSearchToken.entry_id)
+        .having(func.count(JournalSearchToken.token) == len(tokens))
+    )
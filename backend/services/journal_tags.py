@@ -0,0 +1,65 @@
+from sqlalchemy import func, insert
+from models import JournalTag, db
+
+
+def normalize_tags(tags):
+    """Distinct lowercase tags from a comma-separated string or a list"""
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    seen = []
+    for tag in tags:
+        tag = tag.strip().lower()[:100]
+        if tag and tag not in seen:
+            seen.append(tag)
+    return seen
+
+
+def sync_entries(entries):
+    """Replace the journal_tags rows of (entry_id, user_id, tags) tuples"""
+    entries = list(entries)
+    if not entries:
+        return 0
+    JournalTag.query.filter(
+        JournalTag.entry_id.in_([entry_id for entry_id, _, _ in entries])
+    ).delete(synchronize_session=False)
+
+    rows = [
+        {"entry_id": entry_id, "user_id": user_id, "tag": tag}
+        for entry_id, user_id, tags in entries
+        for tag in normalize_tags(tags)
+    ]
+    if rows:
+        db.session.execute(insert(JournalTag), rows)
+    return len(rows)
+
+
+def sync_entry(entry):
+    """Re-sync one entry's tags from its comma-separated tags column"""
+    db.session.flush()
+    sync_entries([(entry.id, entry.user_id, entry.tags)])
+
+
+def remove_entry(entry_id):
+    JournalTag.query.filter_by(entry_id=entry_id).delete(synchronize_session=False)
+
+
+def entry_ids_with_tag(user_id, tag):
+    """Subquery of the user's entry ids carrying tag"""
+    return db.session.query(JournalTag.entry_id).filter(
+        JournalTag.user_id == user_id,
+        JournalTag.tag == tag.strip().lower(),
+    )
+
+
+def tag_counts(user_id):
+    """[(tag, entries)] for a user, most used first"""
+    count = func.count(JournalTag.entry_id)
+    return (
+        db.session.query(JournalTag.tag, count)
+        .filter(JournalTag.user_id == user_id)
+        .group_by(JournalTag.tag)
+        .order_by(count.desc(), JournalTag.tag)
+        .all()
+    )
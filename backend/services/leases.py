@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from models import SchedulerLease, db
+
+
+def acquire(name, holder, seconds):
+    """Take or renew the named lease for `holder`; True if it now holds it
+
+    A single conditional UPDATE moves the lease to the caller only when the
+    caller already holds it or the previous holder let it expire, so two
+    workers can never both succeed. The row is created on first use.
+    Commits the session.
+    """
+    now = datetime.utcnow()
+    updated = SchedulerLease.query.filter(
+        SchedulerLease.name == name,
+        or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now),
+    ).update(
+        {SchedulerLease.holder: holder, SchedulerLease.expires_at: now + timedelta(seconds=seconds)},
+        synchronize_session=False,
+    )
+    if updated:
+        db.session.commit()
+        return True
+
+    if db.session.get(SchedulerLease, name) is not None:
+        db.session.rollback()
+        return False
+    try:
+        db.session.add(SchedulerLease(name=name, holder=holder, expires_at=now + timedelta(seconds=seconds)))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+
+def release(name, holder):
+    """Give up the named lease if `holder` still holds it. Commits the session."""
+    SchedulerLease.query.filter_by(name=name, holder=holder).delete(synchronize_session=False)
+    db.session.commit()
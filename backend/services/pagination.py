@@ -0,0 +1,91 @@
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value, row_id):
+    """Opaque cursor for the row after which the next page starts"""
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps({"v": sort_value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor, sort_column):
+    """Return (sort_value, row_id) from a cursor made by encode_cursor
+
+    Raises ValueError for a cursor that was not made by encode_cursor for
+    this sort column.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        sort_value = payload["v"]
+        if sort_value is not None:
+            python_type = sort_column.type.python_type
+            if python_type is date:
+                sort_value = date.fromisoformat(sort_value)
+            elif python_type is datetime:
+                sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(payload["id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("cursor is invalid") from None
+
+
+def page_size(value):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE; ValueError if it is not an integer"""
+    try:
+        size = int(value or DEFAULT_PAGE_SIZE)
+    except ValueError:
+        raise ValueError("limit must be an integer") from None
+    return min(max(size, 1), MAX_PAGE_SIZE)
+
+
+def keyset_segments(query, sort_column, id_column, cursor=None, descending=False):
+    """(non-NULL segment or None, NULL segment) queries for the rows after cursor
+
+    Rows with a NULL sort value come last in either direction, ordered by
+    id. Each segment has a plain ORDER BY an index on (..., sort_column, id)
+    can serve, rather than one sorted on "sort_column IS NULL". The first
+    segment is None once the cursor is inside the NULL rows. Raises
+    ValueError for an invalid cursor.
+    """
+    id_order = id_column.desc() if descending else id_column.asc()
+    null_segment = query.filter(sort_column.is_(None))
+    if not cursor:
+        sort_value = None
+    else:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        after_id = id_column < row_id if descending else id_column > row_id
+        if sort_value is None:
+            return None, null_segment.filter(after_id).order_by(id_order)
+
+    segment = query.filter(sort_column.is_not(None))
+    if cursor:
+        after_value = sort_column < sort_value if descending else sort_column > sort_value
+        segment = segment.filter(or_(after_value, and_(sort_column == sort_value, after_id)))
+    sort_order = sort_column.desc() if descending else sort_column.asc()
+    return segment.order_by(sort_order, id_order), null_segment.order_by(id_order)
+
+
+def keyset_paginate(query, sort_column, id_column, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=False):
+    """Return (rows, next_cursor) for one page ordered by (sort_column, id_column)
+
+    Reads the keyset_segments() in turn; the NULL segment is only queried
+    once the non-NULL one runs out. Raises ValueError for an invalid cursor.
+    """
+    segment, null_segment = keyset_segments(query, sort_column, id_column, cursor, descending)
+    rows = segment.limit(limit + 1).all() if segment is not None else []
+    if len(rows) <= limit:
+        rows += null_segment.limit(limit + 1 - len(rows)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
@@ -0,0 +1,253 @@
+import calendar
+from collections import namedtuple
+from datetime import datetime, timedelta
+from services.cache import LRUCache
+
+FREQUENCIES = ["daily", "weekly", "monthly", "yearly"]
+WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+# Upper bound on the occurrences one series expands to in a single window
+MAX_OCCURRENCES = 5000
+
+# An RRULE-style series: the first occurrence [start, end), repeated every
+# `interval` periods of `frequency` until `until` (inclusive) or for `count`
+# occurrences. by_day holds weekday numbers (Monday=0) for weekly rules;
+# exceptions holds the start times of cancelled occurrences, which still
+# count towards `count` as EXDATEs do.
+Rule = namedtuple("Rule", ["start", "end", "frequency", "interval", "by_day", "until", "count", "exceptions"])
+
+_cache = LRUCache("CALENDAR_EXPANSION_CACHE_SIZE")
+
+
+def parse_by_day(value):
+    """Weekday numbers from a stored "MO,WE" string"""
+    return tuple(sorted({WEEKDAYS.index(code) for code in (value or "").split(",") if code in WEEKDAYS}))
+
+
+def parse_exceptions(value):
+    """Occurrence start times from the stored comma-separated ISO datetimes"""
+    return frozenset(datetime.fromisoformat(item) for item in (value or "").split(",") if item)
+
+
+def format_exceptions(exceptions):
+    return ",".join(sorted(item.isoformat() for item in exceptions)) or None
+
+
+def rule_for(event):
+    """Rule of a recurring event (model instance or row), or None if it does not repeat"""
+    if not event.recurrence_frequency:
+        return None
+    return Rule(
+        start=event.start_time,
+        end=event.end_time,
+        frequency=event.recurrence_frequency,
+        interval=max(event.recurrence_interval or 1, 1),
+        by_day=parse_by_day(event.recurrence_by_day),
+        until=event.recurrence_until,
+        count=event.recurrence_count,
+        exceptions=parse_exceptions(event.recurrence_exceptions),
+    )
+
+
+def recurrence_dict(event):
+    """JSON form of an event's recurrence, the inverse of apply_recurrence()"""
+    rule = rule_for(event)
+    if rule is None:
+        return None
+    return {
+        "frequency": rule.frequency,
+        "interval": rule.interval,
+        "by_day": [WEEKDAYS[day] for day in rule.by_day],
+        "until": rule.until.isoformat() if rule.until else None,
+        "count": rule.count,
+        "exceptions": sorted(item.isoformat() for item in rule.exceptions),
+    }
+
+
+def _positive_int(data, name, default=None):
+    value = data.get(name, default)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"recurrence.{name} must be a positive integer")
+    return value
+
+
+def _list(data, name):
+    value = data.get(name) or []
+    if not isinstance(value, list):
+        raise ValueError(f"recurrence.{name} must be a list")
+    return value
+
+
+def _datetime(value, name):
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    raise ValueError(f"recurrence.{name} must be an ISO datetime string")
+
+
+def apply_recurrence(event, data):
+    """Set an event's recurrence columns from request JSON, or clear them for None
+
+    Expects start_time to be set already. Raises ValueError for an invalid rule.
+    """
+    if data is None:
+        event.recurrence_frequency = None
+        event.recurrence_interval = None
+        event.recurrence_by_day = None
+        event.recurrence_until = None
+        event.recurrence_count = None
+        event.recurrence_exceptions = None
+        return
+    if not isinstance(data, dict):
+        raise ValueError("recurrence must be an object or null")
+
+    frequency = data.get("frequency")
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"recurrence.frequency must be one of {FREQUENCIES}")
+    interval = _positive_int(data, "interval", 1)
+    count = _positive_int(data, "count")
+
+    by_day = [str(code).upper() for code in _list(data, "by_day")]
+    if any(code not in WEEKDAYS for code in by_day):
+        raise ValueError(f"recurrence.by_day entries must be among {WEEKDAYS}")
+    if by_day and frequency != "weekly":
+        raise ValueError("recurrence.by_day is only supported for weekly rules")
+
+    until = _datetime(data["until"], "until") if data.get("until") else None
+    if until is not None and count is not None:
+        raise ValueError("recurrence accepts until or count, not both")
+    if until is not None and until < event.start_time:
+        raise ValueError("recurrence.until must not be before start_time")
+
+    exceptions = {_datetime(item, "exceptions entries") for item in _list(data, "exceptions")}
+
+    event.recurrence_frequency = frequency
+    event.recurrence_interval = interval
+    event.recurrence_by_day = ",".join(code for code in WEEKDAYS if code in by_day) or None
+    event.recurrence_until = until
+    event.recurrence_count = count
+    event.recurrence_exceptions = format_exceptions(exceptions)
+
+
+def _add_months(value, months):
+    """value moved by whole months, or None when the day does not exist there"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > calendar.monthrange(year, month)[1]:
+        return None
+    return value.replace(year=year, month=month)
+
+
+def _candidates(rule, earliest, latest):
+    """(index, start) of occurrences in order, from the period holding `earliest`
+    up to the first start at or after `latest`
+
+    Skips straight to that period instead of walking the series from its
+    start. index is the occurrence's position in the whole series, needed
+    for count-limited rules; monthly and yearly rules without a count skip
+    ahead without tracking it and yield None.
+    """
+    start = rule.start
+    if rule.frequency == "daily":
+        step = timedelta(days=rule.interval)
+        index = max((earliest - start) // step, 0)
+        while True:
+            occurrence = start + index * step
+            yield index, occurrence
+            if occurrence >= latest:
+                return
+            index += 1
+
+    elif rule.frequency == "weekly":
+        by_day = rule.by_day or (start.weekday(),)
+        first_week = sum(1 for day in by_day if day >= start.weekday())
+        week_start = start - timedelta(days=start.weekday())
+        step = timedelta(weeks=rule.interval)
+        period = max((earliest - week_start) // step, 0)
+        while True:
+            index = 0 if period == 0 else first_week + (period - 1) * len(by_day)
+            for day in by_day:
+                if period == 0 and day < start.weekday():
+                    continue
+                occurrence = week_start + period * step + timedelta(days=day)
+                yield index, occurrence
+                if occurrence >= latest:
+                    return
+                index += 1
+            period += 1
+
+    else:
+        step = rule.interval * (12 if rule.frequency == "yearly" else 1)
+        period = 0
+        if rule.count is None:
+            months = (earliest.year - start.year) * 12 + earliest.month - start.month
+            period = max(months // step, 0)
+        index = 0 if period == 0 else None
+        while True:
+            if _add_months(start.replace(day=1), period * step) >= latest:
+                return
+            # Months without the start's day (the 31st, February 29th) are skipped
+            occurrence = _add_months(start, period * step)
+            if occurrence is not None:
+                yield index, occurrence
+                if index is not None:
+                    index += 1
+            period += 1
+
+
+def expand(rule, window_start, window_end):
+    """Start times of the rule's occurrences overlapping [window_start, window_end)
+
+    Uses the same overlap test as single events, so occurrences that began
+    before the window and are still running are included.
+    """
+    duration = max(rule.end - rule.start, timedelta(0))
+    starts = []
+    for index, occurrence in _candidates(rule, window_start - duration, window_end):
+        if occurrence >= window_end:
+            break
+        if rule.until is not None and occurrence > rule.until:
+            break
+        if rule.count is not None and index >= rule.count:
+            break
+        if occurrence in rule.exceptions:
+            continue
+        if occurrence + duration > window_start or (not duration and occurrence >= window_start):
+            starts.append(occurrence)
+            if len(starts) >= MAX_OCCURRENCES:
+                break
+    return starts
+
+
+def occurrences(event, window_start, window_end):
+    """Memoized expand() for a recurring event (model instance or row)
+
+    Entries are keyed by the event id, the full rule and the window, so a
+    changed series can never be served from a stale entry even in another
+    worker; invalidate() frees a series' entries once it changes.
+    """
+    rule = rule_for(event)
+    key = (event.id, rule, window_start, window_end)
+    starts = _cache.get(key)
+    if starts is None:
+        starts = tuple(expand(rule, window_start, window_end))
+        _cache.set(key, starts)
+    return starts
+
+
+def is_occurrence(event, start):
+    """Whether a series has an occurrence starting at `start`, ignoring its exceptions"""
+    rule = rule_for(event)
+    if rule is None:
+        return False
+    rule = rule._replace(exceptions=frozenset())
+    return start in expand(rule, start, start + timedelta(microseconds=1))
+
+
+def invalidate(event_id):
+    """Drop the memoized expansions of a series after it or its exceptions change"""
+    _cache.invalidate(event_id)
@@ -0,0 +1,292 @@
+import heapq
+import importlib
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+import requests
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from models import CalendarEvent, ReminderDelivery, db
+from services import leases, recurrence
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "reminders"
+
+# One occurrence's reminder; ordered by remind_at so the scheduler's heap
+# always has the next one due on top
+Reminder = namedtuple("Reminder", ["remind_at", "event_id", "occurrence_start", "user_id", "title"])
+
+RULE_COLUMNS = (
+    CalendarEvent.id, CalendarEvent.user_id, CalendarEvent.title, CalendarEvent.reminder,
+    CalendarEvent.start_time, CalendarEvent.end_time,
+    CalendarEvent.recurrence_frequency, CalendarEvent.recurrence_interval,
+    CalendarEvent.recurrence_by_day, CalendarEvent.recurrence_until,
+    CalendarEvent.recurrence_count, CalendarEvent.recurrence_exceptions,
+)
+
+
+def reminder_payload(reminder):
+    return {
+        "event_id": reminder.event_id,
+        "user_id": reminder.user_id,
+        "title": reminder.title,
+        "occurrence_start": reminder.occurrence_start.isoformat(),
+        "remind_at": reminder.remind_at.isoformat(),
+    }
+
+
+class LogSink:
+    """Write reminders to the application log"""
+
+    name = "log"
+
+    def deliver(self, reminder):
+        logger.info("Reminder: %s", reminder_payload(reminder))
+
+
+class WebhookSink:
+    """POST reminders as JSON to REMINDER_WEBHOOK_URL; only logs them while it is unset"""
+
+    name = "webhook"
+
+    def __init__(self, url=None, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def deliver(self, reminder):
+        if not self.url:
+            logger.info("REMINDER_WEBHOOK_URL is not set, skipping POST of %s", reminder_payload(reminder))
+            return
+        requests.post(self.url, json=reminder_payload(reminder), timeout=self.timeout).raise_for_status()
+
+
+class QueueSink:
+    """Leave reminders queued for clients polling GET /api/calendar/reminders
+
+    The reminder_deliveries row the scheduler writes is the queue entry, so
+    there is nothing else to do.
+    """
+
+    name = "queue"
+
+    def deliver(self, reminder):
+        pass
+
+
+SINKS = {"log": LogSink, "webhook": WebhookSink, "queue": QueueSink}
+
+
+def get_sink(config):
+    """Sink named by REMINDER_SINK: a key of SINKS or "package.module:ClassName" """
+    name = config.get("REMINDER_SINK") or "log"
+    if name == "webhook":
+        return WebhookSink(config.get("REMINDER_WEBHOOK_URL"))
+    if name in SINKS:
+        return SINKS[name]()
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"REMINDER_SINK must be one of {list(SINKS)} or 'package.module:ClassName'")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def _starts_at(row, first, last):
+    """Occurrence starts of an event row in [first, last)"""
+    rule = recurrence.rule_for(row)
+    if rule is None:
+        return [row.start_time] if first <= row.start_time < last else []
+    # With zero duration, expand() returns exactly the starts inside the window
+    return recurrence.expand(rule._replace(end=rule.start), first, last)
+
+
+def upcoming(start, end, lead, now):
+    """Unclaimed reminders due in [start, end) for events starting `lead` later
+
+    Occurrences starting from `now` on are included even when their reminder
+    time has already passed, so an event created or moved to start within
+    the lead time is reminded at once. Single events come from the
+    (reminder, recurrence_frequency, start_time) index as a range on
+    start_time; recurring series with a reminder are expanded for the
+    window. Reminders already in reminder_deliveries are left out.
+    """
+    first, last = min(start + lead, now), end + lead
+    rows = db.session.query(*RULE_COLUMNS).filter(
+        CalendarEvent.reminder == True,
+        CalendarEvent.recurrence_frequency.is_(None),
+        CalendarEvent.start_time >= first,
+        CalendarEvent.start_time < last,
+    ).all()
+    rows += db.session.query(*RULE_COLUMNS).filter(
+        CalendarEvent.reminder == True,
+        CalendarEvent.recurrence_frequency.in_(recurrence.FREQUENCIES),
+        CalendarEvent.start_time < last,
+        or_(CalendarEvent.recurrence_until.is_(None), CalendarEvent.recurrence_until >= first),
+    ).all()
+
+    claimed = set(
+        db.session.query(ReminderDelivery.event_id, ReminderDelivery.occurrence_start).filter(
+            ReminderDelivery.occurrence_start >= first,
+            ReminderDelivery.occurrence_start < last,
+        )
+    )
+    return [
+        Reminder(occurrence - lead, row.id, occurrence, row.user_id, row.title)
+        for row in rows
+        for occurrence in _starts_at(row, first, last)
+        if (row.id, occurrence) not in claimed
+    ]
+
+
+def still_due(reminders):
+    """The reminders whose event still exists, still wants a reminder and
+    still has the occurrence (it may have been moved, cancelled or deleted
+    since the heap was filled)
+    """
+    rows = {
+        row.id: row
+        for row in db.session.query(*RULE_COLUMNS).filter(
+            CalendarEvent.id.in_({reminder.event_id for reminder in reminders})
+        )
+    }
+    due = []
+    for reminder in reminders:
+        row = rows.get(reminder.event_id)
+        if row is None or not row.reminder:
+            continue
+        start = reminder.occurrence_start
+        if _starts_at(row, start, start + timedelta(microseconds=1)):
+            due.append(reminder)
+    return due
+
+
+class ReminderScheduler:
+    """Fires event reminders from a min-heap of upcoming reminder times
+
+    Every worker may run one, but only the holder of the "reminders" lease
+    fills the heap and fires. The heap holds the reminders due within the
+    look-ahead window and is rebuilt every poll interval, which picks up
+    events created, moved or deleted since. A reminder is claimed by
+    inserting its unique reminder_deliveries row in the same transaction
+    in which the sink delivers it. Even two workers that briefly both think
+    they hold the lease therefore fire it once, and a failed delivery is
+    retried at the next rebuild until the grace period runs out or, if
+    later, the occurrence starts.
+
+    Event times are naive wall-clock times, so they are compared with the
+    server's local time.
+    """
+
+    def __init__(self, app, holder=None):
+        self.app = app
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.sink = get_sink(app.config)
+        self.sink_name = getattr(self.sink, "name", app.config.get("REMINDER_SINK"))[:50]
+        self.heap = []
+        self.refilled_at = None
+        self._stop = threading.Event()
+
+    def _minutes(self, name):
+        return timedelta(minutes=self.app.config[name])
+
+    def refill(self, now):
+        """Rebuild the heap with the unclaimed reminders due from the grace
+        period before now to the end of the look-ahead window, and those of
+        occurrences that have not started yet
+        """
+        self.heap = upcoming(
+            now - self._minutes("REMINDER_GRACE_MINUTES"),
+            now + self._minutes("REMINDER_LOOKAHEAD_MINUTES"),
+            self._minutes("REMINDER_LEAD_MINUTES"),
+            now,
+        )
+        heapq.heapify(self.heap)
+        self.refilled_at = now
+
+    def fire_due(self, now):
+        """Deliver every reminder at the top of the heap that is due; returns the number fired"""
+        due = []
+        while self.heap and self.heap[0].remind_at <= now:
+            due.append(heapq.heappop(self.heap))
+        if not due:
+            return 0
+
+        fired = 0
+        for reminder in still_due(due):
+            try:
+                db.session.add(ReminderDelivery(
+                    event_id=reminder.event_id,
+                    user_id=reminder.user_id,
+                    occurrence_start=reminder.occurrence_start,
+                    remind_at=reminder.remind_at,
+                    sink=self.sink_name,
+                    fired_at=now,
+                ))
+                db.session.flush()
+                self.sink.deliver(reminder)
+                db.session.commit()
+                fired += 1
+            except IntegrityError:
+                # Another worker fired it first
+                db.session.rollback()
+            except Exception:
+                db.session.rollback()
+                logger.exception("Delivering reminder for event %s failed", reminder.event_id)
+        return fired
+
+    def tick(self, now=None):
+        """Renew the lease, refill the heap when due and fire what is due; returns the number fired"""
+        now = now or datetime.now()
+        if not leases.acquire(LEASE_NAME, self.holder, self.app.config["REMINDER_LEASE_SECONDS"]):
+            self.heap = []
+            self.refilled_at = None
+            return 0
+
+        poll = timedelta(seconds=self.app.config["REMINDER_POLL_SECONDS"])
+        if self.refilled_at is None or now - self.refilled_at >= poll:
+            self.refill(now)
+        return self.fire_due(now)
+
+    def seconds_until_next(self, now):
+        """Sleep before the next tick: until the next reminder, at most one poll interval"""
+        poll = self.app.config["REMINDER_POLL_SECONDS"]
+        if not self.heap:
+            return poll
+        return min(max((self.heap[0].remind_at - now).total_seconds(), 0), poll)
+
+    def run(self):
+        """Tick until stop() is called, then hand the lease back"""
+        while not self._stop.is_set():
+            wait = self.app.config["REMINDER_POLL_SECONDS"]
+            with self.app.app_context():
+                try:
+                    self.tick()
+                    wait = self.seconds_until_next(datetime.now())
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("Reminder scheduler tick failed")
+                finally:
+                    db.session.remove()
+            self._stop.wait(wait)
+
+        with self.app.app_context():
+            leases.release(LEASE_NAME, self.holder)
+
+    def stop(self):
+        self._stop.set()
+
+
+def start_scheduler(app):
+    """Run a ReminderScheduler for this worker in a daemon thread"""
+    scheduler = ReminderScheduler(app)
+    threading.Thread(target=scheduler.run, name="reminder-scheduler", daemon=True).start()
+    app.extensions["reminder_scheduler"] = scheduler
+    return scheduler
+
+
+def forget_event(event_id):
+    """Delete an event's delivery rows (SQLite does not cascade the foreign key)"""
+    ReminderDelivery.query.filter_by(event_id=event_id).delete(synchronize_session=False)
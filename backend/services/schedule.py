@@ -0,0 +1,140 @@
+from collections import namedtuple
+from datetime import date
+
+# Weekdays (Monday=0) on which a day-based habit is expected
+SCHEDULE_WEEKDAYS = {
+    "daily": frozenset(range(7)),
+    "weekdays": frozenset(range(5)),
+    "weekends": frozenset({5, 6}),
+}
+
+# Streak run ending at the last completed period, and the date that completed it
+StreakSummary = namedtuple("StreakSummary", ["current", "longest", "last_date"])
+
+
+class Schedule:
+    """Expected check-ins for a habit frequency
+
+    Day-based frequencies (daily, weekdays, weekends) expect one check-in on
+    each scheduled weekday. Weekly habits expect target_days check-ins per
+    ISO week when it is 1-6, and one otherwise: 7 is the model and form
+    default, so it (like a missing value) means once a week. Periods are identified by a key: the ordinal
+    of the day, or the ordinal of the week's Monday. All counts are computed
+    arithmetically, so nothing iterates over individual calendar days.
+    """
+
+    def __init__(self, frequency="daily", target_days=7):
+        self.weekly = frequency == "weekly"
+        self.weekdays = SCHEDULE_WEEKDAYS.get(frequency, SCHEDULE_WEEKDAYS["daily"])
+        self.required = target_days if self.weekly and target_days in range(1, 7) else 1
+
+    @classmethod
+    def for_habit(cls, habit):
+        return cls(habit.frequency, habit.target_days)
+
+    def is_expected(self, day):
+        """Whether a check-in on this day counts towards the schedule"""
+        return self.weekly or day.weekday() in self.weekdays
+
+    def period_key(self, day):
+        """Key of the period containing day"""
+        ordinal = day.toordinal()
+        return ordinal - day.weekday() if self.weekly else ordinal
+
+    def count_periods(self, first_key, last_key):
+        """Number of expected periods with first_key <= key <= last_key"""
+        if last_key < first_key:
+            return 0
+        if self.weekly:
+            # Week keys are Monday ordinals, i.e. ordinals congruent to 1 mod 7
+            return (last_key - 1) // 7 - (first_key - 2) // 7
+
+        total_days = last_key - first_key + 1
+        full_weeks, remainder = divmod(total_days, 7)
+        count = full_weeks * len(self.weekdays)
+        first_weekday = date.fromordinal(first_key).weekday()
+        for offset in range(remainder):
+            if (first_weekday + offset) % 7 in self.weekdays:
+                count += 1
+        return count
+
+    def expected_dates(self, start_date, end_date):
+        """Start date of every expected period overlapping [start_date, end_date]"""
+        step = 7 if self.weekly else 1
+        key = self.period_key(start_date)
+        dates = []
+        while key <= end_date.toordinal():
+            day = date.fromordinal(key)
+            if self.is_expected(day):
+                dates.append(day)
+            key += step
+        return dates
+
+    def completed_periods(self, completed_dates):
+        """Ascending [(period_key, completing_date)] from ascending completed dates
+
+        A single pass: each date is mapped to its period and counted, and a
+        period is emitted once its count reaches the requirement.
+        """
+        periods = []
+        current_key = None
+        count = 0
+        for day in completed_dates:
+            if not self.is_expected(day):
+                continue
+            key = self.period_key(day)
+            if key != current_key:
+                current_key = key
+                count = 0
+            count += 1
+            if count == self.required:
+                periods.append((key, day))
+        return periods
+
+    def summarize(self, completed_dates):
+        """StreakSummary for ascending completed dates, independent of today"""
+        current = longest = 0
+        previous_key = None
+        last_date = None
+        for key, day in self.completed_periods(completed_dates):
+            if previous_key is not None and self.count_periods(previous_key + 1, key - 1) == 0:
+                current += 1
+            else:
+                current = 1
+            longest = max(longest, current)
+            previous_key = key
+            last_date = day
+        return StreakSummary(current, longest, last_date)
+
+    def is_live(self, last_date, today=None):
+        """Whether a run ending on last_date still counts as of today
+
+        The period containing today is still in progress, so the run only
+        breaks once an earlier expected period has been missed.
+        """
+        if last_date is None:
+            return False
+        today = today or date.today()
+        last_key = self.period_key(last_date)
+        today_key = self.period_key(today)
+        if last_key > today_key:
+            return False
+        return self.count_periods(last_key + 1, today_key - 1) == 0
+
+    def current_streak(self, summary, today=None):
+        """Current streak as of today for a StreakSummary"""
+        return summary.current if self.is_live(summary.last_date, today) else 0
+
+    def completion_rate(self, completed_dates, start_date, end_date):
+        """Percentage of expected periods in the window that were completed"""
+        first_key = self.period_key(start_date)
+        last_key = self.period_key(end_date)
+        expected = self.count_periods(first_key, last_key)
+        if expected == 0:
+            return 0.0
+        completed = sum(
+            1 for key, _ in self.completed_periods(completed_dates)
+            if first_key <= key <= last_key
+        )
+        return round((completed / expected) * 100, 1)
+
@@ -0,0 +1,78 @@
+from models import HabitLog, db
+from services.schedule import Schedule
+
+
+def load_completed_dates(habit_ids, start_date=None, end_date=None):
+    """Load completed log dates for many habits with a single range query"""
+    dates_by_habit = {habit_id: [] for habit_id in habit_ids}
+    if not habit_ids:
+        return dates_by_habit
+
+    query = db.session.query(HabitLog.habit_id, HabitLog.date).filter(
+        HabitLog.habit_id.in_(habit_ids),
+        HabitLog.completed == True,
+    )
+    if start_date:
+        query = query.filter(HabitLog.date >= start_date)
+    if end_date:
+        query = query.filter(HabitLog.date <= end_date)
+
+    for habit_id, log_date in query.order_by(HabitLog.habit_id, HabitLog.date):
+        dates_by_habit[habit_id].append(log_date)
+
+    return dates_by_habit
+
+
+def compute_streaks(completed_dates, today=None, schedule=None):
+    """Compute (current, longest) streak from ascending completed dates
+
+    Streaks are counted in the habit's scheduled periods (see Schedule) with
+    no upper cap; the period containing today does not break the run.
+    """
+    schedule = schedule or Schedule()
+    summary = schedule.summarize(completed_dates)
+    return schedule.current_streak(summary, today), summary.longest
+
+
+def refresh_counters(habits):
+    """Recompute the stored streak counters of habits from their logs"""
+    dates_by_habit = load_completed_dates([habit.id for habit in habits])
+
+    for habit in habits:
+        completed_dates = dates_by_habit[habit.id]
+        summary = Schedule.for_habit(habit).summarize(completed_dates)
+        habit.current_streak = summary.current
+        habit.longest_streak = summary.longest
+        habit.last_completed_date = summary.last_date
+        habit.total_completions = len(completed_dates)
+
+
+def apply_log_change(habit, log_date, was_completed, completed):
+    """Update a habit's stored counters after one of its logs changed
+
+    For day-based schedules, checking a scheduled day after the last
+    completion extends or restarts the run in place, and checking an
+    unscheduled day only bumps the total. Weekly habits, backfills and
+    un-checks can split or join runs anywhere, so those fall back to a
+    recomputation from the logs.
+    """
+    if was_completed == completed:
+        return
+
+    schedule = Schedule.for_habit(habit)
+    last_date = habit.last_completed_date
+    if completed and not schedule.weekly and (last_date is None or log_date > last_date):
+        habit.total_completions = (habit.total_completions or 0) + 1
+        if not schedule.is_expected(log_date):
+            return
+        if last_date is not None and schedule.count_periods(
+            schedule.period_key(last_date) + 1, schedule.period_key(log_date) - 1
+        ) == 0:
+            habit.current_streak = (habit.current_streak or 0) + 1
+        else:
+            habit.current_streak = 1
+        habit.longest_streak = max(habit.longest_streak or 0, habit.current_streak)
+        habit.last_completed_date = log_date
+    else:
+        db.session.flush()
+        refresh_counters([habit])
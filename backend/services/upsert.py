@@ -0,0 +1,48 @@
+from models import db
+
+
+def upsert(model, rows, conflict_columns, update_columns=(), increment_columns=()):
+    """Insert rows, updating existing rows where conflict_columns already exist
+
+    On conflict, update_columns are overwritten with the new values and
+    increment_columns have the new values added to them. Uses the database's
+    native upsert (ON DUPLICATE KEY UPDATE on MySQL, ON CONFLICT DO UPDATE on
+    PostgreSQL and SQLite). The rows are sent as parameter sets of one
+    statement (executemany), so the compiled SQL is cached and reused
+    whatever the batch size, all within the caller's transaction.
+    """
+    if not rows:
+        return None
+
+    table = model.__table__
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_duplicate_key_update(
+            _conflict_values(table, stmt.inserted, update_columns, increment_columns)
+        )
+    elif dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_=_conflict_values(table, stmt.excluded, update_columns, increment_columns),
+        )
+    else:
+        raise NotImplementedError(f"Upsert is not supported on {dialect}")
+
+    return db.session.execute(stmt, rows)
+
+
+def _conflict_values(table, new_values, update_columns, increment_columns):
+    values = {column: new_values[column] for column in update_columns}
+    for column in increment_columns:
+        values[column] = table.c[column] + new_values[column]
+    return values
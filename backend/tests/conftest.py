@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DB_URL", "sqlite://")
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from models import User, db
+
+
+@pytest.fixture
+def app():
+    app = create_app("development")
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def user(app):
+    user = User(email="test@example.com")
+    user.set_password("password")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def headers(user):
+    return {"Authorization": f"Bearer {create_access_token(identity=str(user.id))}"}
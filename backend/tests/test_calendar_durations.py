@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from models import CalendarEvent, User, db
+from services import calendar_events
+
+START = datetime(2026, 3, 2, 9, 0)
+
+
+def add_event(user, length):
+    db.session.add(CalendarEvent(user_id=user.id, title="event", start_time=START, end_time=START + length))
+    db.session.flush()
+
+
+def stored_maximum(user):
+    db.session.expire_all()
+    return db.session.get(User, user.id).max_event_seconds
+
+
+def test_recompute_lowers_to_the_longest_event(app, user):
+    add_event(user, timedelta(hours=1))
+    add_event(user, timedelta(minutes=30, microseconds=1))
+    user.max_event_seconds = 86400
+    db.session.commit()
+
+    calendar_events.recompute_max_durations([user.id])
+
+    assert stored_maximum(user) == 3600
+
+
+def test_recompute_rounds_up_and_ignores_inverted_events(app, user):
+    add_event(user, timedelta(seconds=90, microseconds=500))
+    add_event(user, timedelta(hours=-2))
+
+    calendar_events.recompute_max_durations([user.id])
+
+    assert stored_maximum(user) == 91
+
+
+def test_recompute_without_events_is_zero(app, user):
+    user.max_event_seconds = 600
+    db.session.commit()
+
+    calendar_events.recompute_max_durations([user.id])
+
+    assert stored_maximum(user) == 0
+
+
+def test_recompute_counts_events_added_in_the_same_transaction(app, user):
+    add_event(user, timedelta(hours=1))
+    calendar_events.recompute_max_durations([user.id])
+    add_event(user, timedelta(hours=5))
+    calendar_events.note_duration(user.id, START, START + timedelta(hours=5))
+
+    calendar_events.recompute_max_durations([user.id])
+
+    assert stored_maximum(user) == 5 * 3600
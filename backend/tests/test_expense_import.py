@@ -0,0 +1,48 @@
+from models import Expense
+
+CSV = (
+    "date,amount,category,description\n"
+    "2025-01-03,4.50,Food,Coffee\n"
+    "2025-01-03,4.50,Food,Coffee\n"
+    "2025-01-04,12.00,Food,Lunch\n"
+)
+
+
+def upload(client, headers, body):
+    return client.post(
+        "/api/expenses/import",
+        headers={**headers, "Content-Type": "text/csv"},
+        data=body.encode(),
+    )
+
+
+def test_identical_rows_in_one_file_are_all_imported(client, headers):
+    response = upload(client, headers, CSV)
+    assert response.status_code == 200
+    assert response.get_json()["imported"] == 3
+    assert response.get_json()["duplicates"] == 0
+    assert Expense.query.filter_by(description="Coffee").count() == 2
+
+
+def test_reimport_is_a_no_op(client, headers):
+    upload(client, headers, CSV)
+    response = upload(client, headers, CSV + "2025-01-03,4.50,Food,Coffee\n")
+    assert response.get_json()["imported"] == 1
+    assert response.get_json()["duplicates"] == 3
+    assert Expense.query.count() == 4
+
+
+def test_non_finite_amounts_are_row_errors(client, headers):
+    body = (
+        "date,amount,category\n"
+        "2025-01-03,NaN,Food\n"
+        "2025-01-03,sNaN,Food\n"
+        "2025-01-03,Infinity,Food\n"
+        "2025-01-03,2.00,Food\n"
+    )
+    response = upload(client, headers, body)
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result["imported"] == 1
+    assert result["error_count"] == 3
+    assert {error["line"] for error in result["errors"]} == {2, 3, 4}
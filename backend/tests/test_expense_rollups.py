@@ -0,0 +1,65 @@
+from datetime import date
+from decimal import Decimal
+
+from models import ExpenseDailyRollup, ExpenseMonthlyRollup
+from services import expense_rollups
+
+
+def create_expense(client, headers, amount, category, day):
+    response = client.post(
+        "/api/expenses", headers=headers, json={"amount": amount, "category": category, "date": day}
+    )
+    assert response.status_code == 201
+    return response.get_json()["expense"]["id"]
+
+
+def rollups():
+    daily = {
+        (row.user_id, row.day, row.category): (Decimal(row.total), row.count)
+        for row in ExpenseDailyRollup.query
+    }
+    monthly = {
+        (row.user_id, row.month, row.category): (Decimal(row.total), row.count)
+        for row in ExpenseMonthlyRollup.query
+    }
+    return daily, monthly
+
+
+def assert_matches_rebuild(user):
+    maintained = rollups()
+    expense_rollups.rebuild([user.id])
+    assert maintained == rollups()
+
+
+def test_create_update_and_delete_keep_rollups_in_step(client, headers, user):
+    coffee = create_expense(client, headers, 4.5, "Food", "2026-01-30")
+    rent = create_expense(client, headers, 900, "Bills", "2026-01-31")
+    create_expense(client, headers, 12, "Food", "2026-02-01")
+    assert_matches_rebuild(user)
+
+    # Across a month boundary and into another category
+    client.put(f"/api/expenses/{coffee}", headers=headers, json={"date": "2026-02-03", "category": "Fun"})
+    assert_matches_rebuild(user)
+
+    client.put(f"/api/expenses/{rent}", headers=headers, json={"amount": 950})
+    assert_matches_rebuild(user)
+
+    client.delete(f"/api/expenses/{rent}", headers=headers)
+    daily, monthly = rollups()
+    assert (user.id, date(2026, 1, 31), "Bills") not in daily
+    assert (user.id, date(2026, 1, 1), "Bills") not in monthly
+    assert_matches_rebuild(user)
+
+
+def test_summary_combines_whole_and_partial_months(client, headers, user):
+    create_expense(client, headers, 10, "Food", "2026-01-20")
+    create_expense(client, headers, 20, "Food", "2026-02-10")
+    create_expense(client, headers, 40, "Bills", "2026-03-05")
+    create_expense(client, headers, 80, "Bills", "2026-03-20")
+
+    summary = expense_rollups.summary(user.id, date(2026, 1, 15), date(2026, 3, 10))
+
+    assert summary["total"] == Decimal(70)
+    assert summary["by_category"] == {"Food": Decimal(30), "Bills": Decimal(40)}
+    totals = expense_rollups.bucketed_totals(user.id, date(2026, 1, 15), date(2026, 3, 10), "month")
+    assert totals == {date(2026, 1, 1): Decimal(10), date(2026, 2, 1): Decimal(20), date(2026, 3, 1): Decimal(40)}
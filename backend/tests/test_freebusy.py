@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+from services.freebusy import Interval, busy_blocks, conflicts, free_slots
+
+DAY = datetime(2026, 3, 2)
+
+
+def at(hour, minute=0):
+    return DAY + timedelta(hours=hour, minutes=minute)
+
+
+def interval(start, end, name):
+    return Interval(start, end, {"id": name})
+
+
+def test_touching_intervals_merge_but_do_not_conflict():
+    intervals = [interval(at(9), at(10), "a"), interval(at(10), at(11), "b")]
+
+    assert busy_blocks(intervals, at(0), at(24)) == [(at(9), at(11))]
+    assert conflicts(intervals) == []
+
+
+def test_nested_interval_is_absorbed_and_conflicts_with_its_container():
+    intervals = [interval(at(9), at(12), "outer"), interval(at(10), at(11), "inner")]
+
+    assert busy_blocks(intervals, at(0), at(24)) == [(at(9), at(12))]
+    assert [(start, end, a["id"], b["id"]) for start, end, a, b in conflicts(intervals)] == [
+        (at(10), at(11), "outer", "inner")
+    ]
+
+
+def test_blocks_are_clipped_to_the_window():
+    intervals = [
+        interval(at(7), at(9), "early"),
+        interval(at(16), at(19), "late"),
+        interval(at(5), at(6), "before"),
+    ]
+
+    assert busy_blocks(intervals, at(8), at(18)) == [(at(8), at(9)), (at(16), at(18))]
+
+
+def test_conflicts_pair_every_overlap_once():
+    intervals = [
+        interval(at(9), at(11), "a"),
+        interval(at(10), at(12), "b"),
+        interval(at(10, 30), at(10, 45), "c"),
+    ]
+
+    pairs = {(a["id"], b["id"]): (start, end) for start, end, a, b in conflicts(intervals)}
+
+    assert pairs == {
+        ("a", "b"): (at(10), at(11)),
+        ("a", "c"): (at(10, 30), at(10, 45)),
+        ("b", "c"): (at(10, 30), at(10, 45)),
+    }
+
+
+def test_free_slots_between_blocks_respect_min_duration():
+    blocks = [(at(9), at(10)), (at(10, 15), at(12))]
+
+    assert free_slots(blocks, at(8), at(13)) == [
+        (at(8), at(9)), (at(10), at(10, 15)), (at(12), at(13)),
+    ]
+    assert free_slots(blocks, at(8), at(13), timedelta(minutes=30)) == [(at(8), at(9)), (at(12), at(13))]
+    assert free_slots([(at(8), at(13))], at(8), at(13)) == []
+
+
+def test_freebusy_endpoint_clips_events_and_skips_zero_length_ones(client, headers):
+    for start, end in [(at(7), at(9)), (at(12), at(12)), (at(17), at(20))]:
+        client.post(
+            "/api/calendar",
+            headers=headers,
+            json={"title": "event", "start_time": start.isoformat(), "end_time": end.isoformat()},
+        )
+
+    response = client.get(
+        f"/api/calendar/freebusy?start={at(8).isoformat()}&end={at(18).isoformat()}", headers=headers
+    ).get_json()
+
+    assert response["busy"] == [
+        {"start": at(8).isoformat(), "end": at(9).isoformat()},
+        {"start": at(17).isoformat(), "end": at(18).isoformat()},
+    ]
+    assert response["free"] == [{"start": at(9).isoformat(), "end": at(17).isoformat(), "minutes": 480}]
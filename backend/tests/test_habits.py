@@ -0,0 +1,19 @@
+import warnings
+
+import pytest
+
+
+def test_habits_without_logs(client, headers):
+    client.post("/api/habits", headers=headers, json={"name": "Read"})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        response = client.get("/api/habits?logs=none", headers=headers)
+
+    assert response.status_code == 200
+    assert "logs" not in response.get_json()[0]
+
+
+@pytest.mark.parametrize("query", ["window=abc", "window=7.5", "logs_since=yesterday", "logs_days=abc"])
+def test_malformed_habit_list_args_are_rejected(client, headers, query):
+    assert client.get(f"/api/habits?{query}", headers=headers).status_code == 400
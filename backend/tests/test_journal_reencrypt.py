@@ -0,0 +1,39 @@
+from models import JournalEntry, db
+
+
+def use_keys(app, key, old_keys=""):
+    app.config["ENCRYPTION_KEY"] = key
+    app.config["ENCRYPTION_OLD_KEYS"] = old_keys
+    app.extensions.pop("crypto", None)
+
+
+def test_reencrypt_rotates_excerpt(app, client, headers):
+    use_keys(app, "old-key")
+    response = client.post("/api/journal", headers=headers, json={"title": "Day", "content": "Rotated excerpt text"})
+    assert response.status_code == 201
+
+    use_keys(app, "new-key", "old-key")
+    result = app.test_cli_runner().invoke(args=["journal", "reencrypt", "--pause", "0"])
+    assert "re-encrypted 1" in result.output
+
+    use_keys(app, "new-key")
+    db.session.expire_all()
+    entry = JournalEntry.query.one()
+    assert entry.get_title() == "Day"
+    assert entry.get_content() == "Rotated excerpt text"
+    assert entry.get_excerpt() == "Rotated excerpt text"
+
+
+def test_reencrypt_rebuilds_search_tokens(app, client, headers):
+    use_keys(app, "old-key")
+    client.post("/api/journal", headers=headers, json={"title": "Walk", "content": "Lunch in the park"})
+
+    use_keys(app, "new-key", "old-key")
+    assert client.get("/api/journal?search=park", headers=headers).get_json() == []
+
+    app.test_cli_runner().invoke(args=["journal", "reencrypt", "--pause", "0"])
+
+    full = client.get("/api/journal?search=park", headers=headers).get_json()
+    summary = client.get("/api/journal?view=summary&search=park", headers=headers).get_json()
+    assert [entry["title"] for entry in full] == ["Walk"]
+    assert [entry["title"] for entry in summary["entries"]] == ["Walk"]
@@ -0,0 +1,25 @@
+def test_summary_search_without_indexable_words_is_empty(client, headers):
+    client.post("/api/journal", headers=headers, json={"title": "Walk", "content": "A long walk"})
+
+    summary = client.get("/api/journal?view=summary&search=!!!", headers=headers).get_json()
+    full = client.get("/api/journal?search=!!!", headers=headers).get_json()
+
+    assert summary == {"entries": [], "next_cursor": None}
+    assert full == []
+
+
+def test_summary_search_matches_indexed_words(client, headers):
+    client.post("/api/journal", headers=headers, json={"title": "Walk", "content": "A long walk"})
+    client.post("/api/journal", headers=headers, json={"title": "Read", "content": "A good book"})
+
+    summary = client.get("/api/journal?view=summary&search=walk", headers=headers).get_json()
+
+    assert [entry["title"] for entry in summary["entries"]] == ["Walk"]
+
+
+def test_short_prefixes_are_not_indexed(client, headers):
+    client.post("/api/journal", headers=headers, json={"title": "Walk", "content": "A long walk"})
+
+    assert client.get("/api/journal?search=wa", headers=headers).status_code == 400
+    summary = client.get("/api/journal?view=summary&search=wal", headers=headers).get_json()
+    assert [entry["title"] for entry in summary["entries"]] == ["Walk"]
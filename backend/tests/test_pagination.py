@@ -0,0 +1,69 @@
+import base64
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "cursor=not-base64!",
+        "cursor=" + base64.urlsafe_b64encode(b"not json").decode(),
+        "cursor=" + base64.urlsafe_b64encode(b'{"v":null}').decode(),
+        "cursor=" + base64.urlsafe_b64encode(b"[1]").decode(),
+        "cursor=" + base64.urlsafe_b64encode(b'{"v":"soon","id":1}').decode(),
+        "limit=abc",
+    ],
+)
+def test_malformed_page_args_are_rejected(client, headers, query):
+    tasks = client.get(f"/api/tasks?{query}", headers=headers)
+    journal = client.get(f"/api/journal?view=summary&{query}", headers=headers)
+
+    assert tasks.status_code == 400
+    assert journal.status_code == 400
+
+
+def test_tasks_pages_follow_next_cursor(client, headers):
+    for day in ("2026-01-03", "2026-01-01", None, "2026-01-02"):
+        client.post("/api/tasks", headers=headers, json={"title": f"Task {day}", "due_date": day})
+
+    titles, cursor = [], ""
+    while cursor is not None:
+        page = client.get(f"/api/tasks?limit=2&cursor={cursor}", headers=headers).get_json()
+        titles += [task["title"] for task in page["tasks"]]
+        cursor = page["next_cursor"]
+
+    assert titles == ["Task 2026-01-01", "Task 2026-01-02", "Task 2026-01-03", "Task None"]
+
+
+def test_pages_cross_from_dated_to_undated_tasks(client, headers):
+    for day in (None, "2026-01-02", None, "2026-01-01", None):
+        client.post("/api/tasks", headers=headers, json={"title": f"Task {day}", "due_date": day})
+
+    pages, cursor = [], ""
+    while cursor is not None:
+        page = client.get(f"/api/tasks?sort=-due_date&limit=2&cursor={cursor}", headers=headers).get_json()
+        pages.append([(task["due_date"], task["id"]) for task in page["tasks"]])
+        cursor = page["next_cursor"]
+
+    assert pages == [
+        [("2026-01-02", 2), ("2026-01-01", 4)],
+        [(None, 5), (None, 3)],
+        [(None, 1)],
+    ]
+
+
+def test_open_tasks_page_filters_by_completed_and_category(client, headers):
+    client.post("/api/tasks", headers=headers, json={"title": "Open work", "category": "Work"})
+    client.post("/api/tasks", headers=headers, json={"title": "Open home", "category": "Personal"})
+    done = client.post("/api/tasks", headers=headers, json={"title": "Done work", "category": "Work"}).get_json()["task"]
+    client.put(f"/api/tasks/{done['id']}", headers=headers, json={"completed": True})
+
+    page = client.get("/api/tasks?completed=false&category=Work&limit=50", headers=headers).get_json()
+
+    assert [task["title"] for task in page["tasks"]] == ["Open work"]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.parametrize("query", ["due_before=soon", "due_after=2026-13-01"])
+def test_malformed_due_date_filters_are_rejected(client, headers, query):
+    assert client.get(f"/api/tasks?{query}", headers=headers).status_code == 400
@@ -0,0 +1,32 @@
+import pytest
+
+EVENT = {
+    "title": "Gym",
+    "start_time": "2026-03-02T07:00:00",
+    "end_time": "2026-03-02T08:00:00",
+}
+
+
+@pytest.mark.parametrize(
+    "recurrence",
+    [
+        {"frequency": "daily", "until": 5},
+        {"frequency": "daily", "until": "next week"},
+        {"frequency": "daily", "exceptions": [5]},
+        {"frequency": "daily", "exceptions": "2026-03-03T07:00:00"},
+        {"frequency": "weekly", "by_day": 1},
+    ],
+)
+def test_malformed_recurrence_is_rejected(client, headers, recurrence):
+    response = client.post("/api/calendar", headers=headers, json={**EVENT, "recurrence": recurrence})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("recurrence.")
+
+
+def test_recurrence_with_exceptions_is_stored(client, headers):
+    recurrence = {"frequency": "daily", "until": "2026-03-05T07:00:00", "exceptions": ["2026-03-03T07:00:00"]}
+
+    response = client.post("/api/calendar", headers=headers, json={**EVENT, "recurrence": recurrence})
+
+    assert response.status_code == 201
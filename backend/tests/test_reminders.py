@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from models import ReminderDelivery
+from services.reminders import ReminderScheduler
+
+NOW = datetime(2026, 3, 2, 9, 0)
+
+
+def create_event(client, headers, start):
+    return client.post(
+        "/api/calendar",
+        headers=headers,
+        json={
+            "title": "Standup",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(minutes=15)).isoformat(),
+            "reminder": True,
+        },
+    )
+
+
+def test_event_starting_within_lead_time_is_reminded_at_once(app, client, headers):
+    create_event(client, headers, NOW + timedelta(minutes=3))
+    scheduler = ReminderScheduler(app)
+
+    assert scheduler.tick(NOW) == 1
+    delivery = ReminderDelivery.query.one()
+    assert delivery.fired_at == NOW
+    assert scheduler.tick(NOW + timedelta(minutes=1)) == 0
+
+
+def test_event_is_reminded_lead_minutes_before_it_starts(app, client, headers):
+    create_event(client, headers, NOW + timedelta(minutes=20))
+    scheduler = ReminderScheduler(app)
+
+    assert scheduler.tick(NOW) == 0
+    assert scheduler.tick(NOW + timedelta(minutes=10)) == 1
+    assert ReminderDelivery.query.one().fired_at == NOW + timedelta(minutes=10)
+
+
+def test_started_event_is_not_reminded(app, client, headers):
+    create_event(client, headers, NOW - timedelta(minutes=1))
+
+    assert ReminderScheduler(app).tick(NOW) == 0
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from models import Habit, db
+from services.streaks import refresh_counters
+
+
+def log(client, headers, habit_id, day):
+    response = client.post(f"/api/habits/{habit_id}/log", headers=headers, json={"date": day.isoformat()})
+    assert response.status_code == 201
+    return response
+
+
+def create_habit(client, headers, **fields):
+    response = client.post("/api/habits", headers=headers, json={"name": "habit", **fields})
+    return response.get_json()["habit"]["id"]
+
+
+def stored_counters(habit_id):
+    habit = db.session.get(Habit, habit_id)
+    db.session.refresh(habit)
+    return habit.current_streak, habit.longest_streak, habit.total_completions
+
+
+def recomputed_counters(habit_id):
+    habit = db.session.get(Habit, habit_id)
+    refresh_counters([habit])
+    counters = habit.current_streak, habit.longest_streak, habit.total_completions
+    db.session.rollback()
+    return counters
+
+
+def test_weekly_same_week_check_ins_count_once(client, headers):
+    habit_id = create_habit(client, headers, frequency="weekly", target_days=1)
+    monday = date.today() - timedelta(days=date.today().weekday() + 7)
+
+    for offset in range(3):
+        log(client, headers, habit_id, monday + timedelta(days=offset))
+
+    assert stored_counters(habit_id) == (1, 1, 3)
+    assert stored_counters(habit_id) == recomputed_counters(habit_id)
+
+
+def test_weekly_consecutive_weeks_extend_streak(client, headers):
+    habit_id = create_habit(client, headers, frequency="weekly", target_days=1)
+    monday = date.today() - timedelta(days=date.today().weekday() + 14)
+
+    for day in [monday, monday + timedelta(days=1), monday + timedelta(days=7)]:
+        log(client, headers, habit_id, day)
+
+    assert stored_counters(habit_id) == (2, 2, 3)
+    assert stored_counters(habit_id) == recomputed_counters(habit_id)
+
+
+def test_daily_fast_path_matches_recomputation(client, headers):
+    habit_id = create_habit(client, headers)
+    start = date.today() - timedelta(days=10)
+
+    for offset in [0, 1, 2, 5, 6]:
+        log(client, headers, habit_id, start + timedelta(days=offset))
+
+    assert stored_counters(habit_id) == (2, 3, 5)
+    assert stored_counters(habit_id) == recomputed_counters(habit_id)
+
+
+def test_default_weekly_habit_expects_one_check_in_per_week(client, headers):
+    habit_id = create_habit(client, headers, frequency="weekly")
+    this_monday = date.today() - timedelta(days=date.today().weekday())
+
+    for weeks_ago in (3, 2, 1):
+        log(client, headers, habit_id, this_monday - timedelta(weeks=weeks_ago) + timedelta(days=2))
+
+    assert stored_counters(habit_id) == (3, 3, 3)
+    assert stored_counters(habit_id) == recomputed_counters(habit_id)
+    habit = client.get("/api/habits", headers=headers).get_json()[0]
+    assert habit["current_streak"] == 3
+    assert habit["completion_rate"] > 0
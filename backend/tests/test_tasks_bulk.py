@@ -0,0 +1,40 @@
+import pytest
+
+
+def create_task(client, headers, **fields):
+    response = client.post("/api/tasks", headers=headers, json={"title": "Task", **fields})
+    return response.get_json()["task"]["id"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"operation": "delete", "ids": ["x"]},
+        {"operation": "delete", "ids": [None]},
+        {"operation": "delete", "ids": 5},
+        {"operation": "delete", "filter": ["completed"]},
+        {"operation": "delete", "filter": {"status": ["pending"]}},
+        {"operation": "set_due_date", "ids": [1], "value": "bad"},
+        {"operation": "set_due_date", "ids": [1], "value": 5},
+    ],
+)
+def test_malformed_bulk_requests_are_rejected(client, headers, body):
+    create_task(client, headers)
+
+    response = client.post("/api/tasks/bulk", headers=headers, json=body)
+
+    assert response.status_code == 400
+
+
+def test_bulk_set_due_date(client, headers):
+    task_ids = [create_task(client, headers), create_task(client, headers)]
+
+    response = client.post(
+        "/api/tasks/bulk",
+        headers=headers,
+        json={"operation": "set_due_date", "ids": [str(task_ids[0]), task_ids[1]], "value": "2026-05-01"},
+    )
+
+    assert response.get_json()["affected"] == 2
+    tasks = client.get("/api/tasks", headers=headers).get_json()
+    assert {task["due_date"] for task in tasks} == {"2026-05-01"}
@@ -8,5 +8,10 @@ from app import create_app
 env = os.getenv("FLASK_ENV", "production")
 app = create_app(env)
 
+if app.config["REMINDER_SCHEDULER_ENABLED"]:
+    from services.reminders import start_scheduler
+
+    start_scheduler(app)
+
 if "__name__" == "__main__":
     app.run()
\ No newline at end of file
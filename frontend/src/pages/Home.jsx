@@ -82,27 +82,21 @@ const Home = () => {
       
       // Fetch all data in parallel
       const [tasksRes, habitsRes, expensesRes, eventsRes] = await Promise.all([
-        api.get('/tasks'),
-        api.get('/habits'),
+        api.get(`/tasks/stats?today=${todayStr}`),
+        api.get('/habits?logs_days=7'),
         api.get('/expenses'),
         api.get(`/calendar?month=${today.getMonth() + 1}&year=${today.getFullYear()}`)
       ])
 
-      const tasks = tasksRes.data
+      const taskStats = tasksRes.data
       const habits = habitsRes.data
       const expenses = expensesRes.data
       const events = eventsRes.data || []
       
-      // Enhanced task stats
-      const completedTasks = tasks.filter(t => t.completed).length
-      const pendingTasks = tasks.filter(t => !t.completed).length
-      const overdueTasks = tasks.filter(t => {
-        if (t.completed) return false
-        if (!t.due_date) return false
-        const dueDate = new Date(t.due_date)
-        dueDate.setHours(0, 0, 0, 0)
-        return dueDate < today
-      }).length
+      // Task stats are aggregated server-side
+      const completedTasks = taskStats.completed
+      const pendingTasks = taskStats.pending
+      const overdueTasks = taskStats.overdue
 
       // Enhanced habit stats with weekly completion
       // Count habits that have been logged today
@@ -173,10 +167,8 @@ const Home = () => {
       // Build recent activities
       const activities = []
       
-      if (tasks.length > 0) {
-        const latestTask = [...tasks].sort((a, b) => 
-          new Date(b.updated_at || b.created_at) - new Date(a.updated_at || a.created_at)
-        )[0]
+      if (taskStats.latest_task) {
+        const latestTask = taskStats.latest_task
         activities.push({
           type: 'task',
           title: latestTask.title,
@@ -219,7 +211,7 @@ const Home = () => {
 
       setStats({
         tasks: {
-          total: tasks.length,
+          total: taskStats.total,
           completed: completedTasks,
           pending: pendingTasks,
           overdue: overdueTasks
@@ -15,15 +15,21 @@ import FolderIcon from '@mui/icons-material/Folder'
 import Notification from '../components/Notification.jsx'
 import { useNotification } from '../hooks/useNotification.js'
 
+// Tasks fetched per request; more are loaded with next_cursor
+const PAGE_SIZE = 50
+
 const Tasks = () => {
   console.log('Tasks component rendered')
   const [tasks, setTasks] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [counts, setCounts] = useState({ total: 0, completed: 0, pending: 0 })
   const [loading, setLoading] = useState(true)
   const [formData, setFormData] = useState({
     title: '', description: '', priority: 'medium', due_date: '', category: ''
   })
   const [editing, setEditing] = useState(null)
-  const [filter, setFilter] = useState('all')
+  // Open on pending tasks so completed ones are only fetched when asked for
+  const [filter, setFilter] = useState('pending')
   const [categoryFilter, setCategoryFilter] = useState('all')
   const [showModal, setShowModal] = useState(false)
   const [errors, setErrors] = useState({})
@@ -34,12 +40,23 @@ const Tasks = () => {
 
   useEffect(() => {
     fetchTasks()
-  }, [])
+  }, [filter, categoryFilter])
 
-  const fetchTasks = async () => {
+  // Fetch the first page (or the next one after `cursor`) of the tasks the
+  // filters select, plus the counts for the stat cards
+  const fetchTasks = async (cursor = null) => {
+    const params = { limit: PAGE_SIZE }
+    if (filter !== 'all') params.completed = filter === 'completed'
+    if (categoryFilter !== 'all') params.category = categoryFilter
+    if (cursor) params.cursor = cursor
     try {
-      const response = await api.get('/tasks')
-      setTasks(response.data)
+      const [response, statsResponse] = await Promise.all([
+        api.get('/tasks', { params }),
+        api.get('/tasks/stats')
+      ])
+      setTasks(previous => cursor ? [...previous, ...response.data.tasks] : response.data.tasks)
+      setNextCursor(response.data.next_cursor)
+      setCounts(statsResponse.data)
     } catch (error) {
       console.error('Error fetching tasks:', error)
       showNotification('Failed to fetch tasks', 'error')
@@ -197,8 +214,7 @@ const Tasks = () => {
 
   const handleClearCompleted = async () => {
     try {
-      const completedTaskIds = tasks.filter(t => t.completed).map(t => t.id)
-      await Promise.all(completedTaskIds.map(id => api.delete(`/tasks/${id}`)))
+      await api.post('/tasks/bulk', { operation: 'delete', filter: { completed: true } })
       showNotification('Completed tasks cleared', 'success')
       fetchTasks()
     } catch (error) {
@@ -217,9 +233,9 @@ const Tasks = () => {
     })
   }
 
-  const completedTasks = tasks.filter(t => t.completed).length
-  const pendingTasks = tasks.filter(t => !t.completed).length
-  const totalTasks = tasks.length
+  const completedTasks = counts.completed
+  const pendingTasks = counts.pending
+  const totalTasks = counts.total
 
   const getRelativeTime = (dateString) => {
     if (!dateString) return 'No date'
@@ -813,6 +829,15 @@ const Tasks = () => {
                   </div>
                 ))
               )}
+              {nextCursor && (
+                <button
+                  className="filter-btn"
+                  style={{...styles.filterBtn, alignSelf: 'center', marginTop: '12px'}}
+                  onClick={() => fetchTasks(nextCursor)}
+                >
+                  Load more
+                </button>
+              )}
             </div>
           </div>
 